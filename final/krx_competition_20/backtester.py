@@ -0,0 +1,380 @@
+# BACKTESTER
+import logging
+import datetime as dt
+
+import functools
+
+import numpy as np
+import pandas as pd
+
+from .trade_func import trade_func as _trade_func
+from .loader.backtest_loader import HISTORY_PRICE_LOADER
+from .loader.data_provider import DATA_PROVIDER
+
+BUYING_FEE = 0.001  # 매수 증권사 수수료
+SELLING_FEE = 0.001  # 매도 증권사 수수료
+SELLING_TAX = 0.002  # 매도 세금
+
+# 결과 데이터프레임의 {column : dtype}
+TOTAL_COLUMNS = {
+    "DATE": object,
+    "CASH": np.float64,
+    "STOCK_VALUE": np.float64,
+    "TOTAL_VALUE": np.float64,
+    "TRADE_VALUE": np.float64,
+}
+SYMBOL_COLUMNS = {
+    "DATE": object,
+    "PRICE": np.float64,
+    "QTY": np.int64,
+    "ORDER": np.int64,
+}
+
+
+class BACKTESTER:
+    """
+    BACKTESTER : trade_func를 거래일 단위로 재생하여 주문을 과거 종가로 체결하는 클래스
+    """
+
+    def __init__(
+        self,
+        start_date: dt.date,
+        end_date: dt.date,
+        CFG: dict = {
+            "initial_cash": 1_000_000_000.0,
+            "calendar_symbol": "005930",
+            "fast_path": True,
+        },
+        trade_func=None,
+        logger: logging.Logger = logging.getLogger("backtest"),
+        provider: DATA_PROVIDER = None,
+    ) -> None:
+        """
+        BACKTESTER의 생성자
+
+        :param datetime.date start_date: backtest 시작 날짜
+        :param datetime.date end_date: backtest 종료 날짜
+        :param dict CFG: 초기 투자금 / 거래일 기준 symbol / fast_path (종가 데이터 재사용) 파라미터
+        :param callable trade_func: trade_func(date, dict_df_result, dict_df_position, logger), None이면 provider를 사용하는 trade_func
+            (과거 날짜를 재생하므로 공시 데이터는 point_in_time으로 그 날짜에 사용 가능한 분기만 사용합니다)
+        :param logging.Logger logger: trade_func에 전달할 logger
+        :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+
+        :attr dict result_array_dict: {TOTAL / symbol : {column : 일별 결과 배열}} 입니다. (앞 result_n_dict개만 사용)
+        :attr dict result_n_dict: {TOTAL / symbol : 일별 결과 row 수} 입니다.
+        :attr dict dict_df_result: {TOTAL / symbol : 일별 결과 데이터프레임} 입니다. (result_array_dict의 view)
+        :attr dict dict_df_position: {symbol : [QTY, TRADE_PRICE] 데이터프레임} 입니다.
+        """
+        self.start_date = start_date
+        self.end_date = end_date
+        self.CFG = CFG
+        self.trade_func = trade_func or functools.partial(
+            _trade_func, provider=provider, CFG={"point_in_time": True}
+        )
+        self.logger = logger
+
+        self.history_price_loader = HISTORY_PRICE_LOADER(
+            start_date,
+            end_date,
+            {"fast_path": CFG["fast_path"], "window_days": 7},
+            provider,
+        )
+        self.result_array_dict = dict()
+        self.result_n_dict = dict()
+        self.dict_df_result = dict()
+        self.dict_df_position = dict()
+
+    @staticmethod
+    def split_orders(orders: list) -> tuple[list, list]:
+        """
+        주문을 매도 / 매수 주문으로 나누는 메서드 (매도 체결 후 매수 체결)
+
+        :param list orders: [(symbol, qty)] 주문
+        :return: (매도 주문, 매수 주문)
+        :rtype: tuple[list, list]
+        """
+        selling_orders = [(symbol, qty) for symbol, qty in orders if qty < 0]
+        buying_orders = [(symbol, qty) for symbol, qty in orders if qty > 0]
+        return selling_orders, buying_orders
+
+    @staticmethod
+    def fill_selling_orders(
+        selling_orders: list, close_dict: dict, cash: float, position_dict: dict
+    ) -> tuple[float, dict]:
+        """
+        매도 주문을 종가로 체결하는 메서드
+        보유 수량을 넘는 주문은 보유 수량까지만 체결합니다.
+
+        :param list selling_orders: [(symbol, qty)] 매도 주문
+        :param dict close_dict: {symbol : 종가}
+        :param float cash: 현재 cash
+        :param dict position_dict: {symbol : [QTY, TRADE_PRICE]}
+        :return: (체결 후 cash, {symbol : 체결 수량})
+        :rtype: tuple[float, dict]
+        """
+        fill_dict = dict()
+        for symbol, qty in selling_orders:
+            if symbol not in close_dict or symbol not in position_dict:
+                continue
+            _qty = min(-int(qty), position_dict[symbol][0])
+            if _qty <= 0:
+                continue
+            cash += _qty * close_dict[symbol] * (1 - SELLING_FEE - SELLING_TAX)
+            position_dict[symbol][0] -= _qty
+            if position_dict[symbol][0] == 0:
+                del position_dict[symbol]
+            fill_dict[symbol] = fill_dict.get(symbol, 0) - _qty
+        return cash, fill_dict
+
+    @staticmethod
+    def fill_buying_orders(
+        buying_orders: list, close_dict: dict, cash: float, position_dict: dict
+    ) -> tuple[float, dict]:
+        """
+        매수 주문을 종가로 체결하는 메서드
+        cash가 부족하면 살 수 있는 수량까지만 체결합니다.
+
+        :param list buying_orders: [(symbol, qty)] 매수 주문
+        :param dict close_dict: {symbol : 종가}
+        :param float cash: 현재 cash
+        :param dict position_dict: {symbol : [QTY, TRADE_PRICE]}
+        :return: (체결 후 cash, {symbol : 체결 수량})
+        :rtype: tuple[float, dict]
+        """
+        fill_dict = dict()
+        for symbol, qty in buying_orders:
+            if symbol not in close_dict:
+                continue
+            _close = close_dict[symbol]
+            _qty = min(int(qty), int(cash // (_close * (1 + BUYING_FEE))))
+            if _qty <= 0:
+                continue
+            cash -= _qty * _close * (1 + BUYING_FEE)
+
+            _held_qty, _trade_price = position_dict.get(symbol, [0, 0.0])
+            _new_qty = _held_qty + _qty
+            _new_trade_price = (_held_qty * _trade_price + _qty * _close) / _new_qty
+            position_dict[symbol] = [_new_qty, _new_trade_price]
+            fill_dict[symbol] = fill_dict.get(symbol, 0) + _qty
+        return cash, fill_dict
+
+    @staticmethod
+    def get_position_dict(dict_df_position: dict) -> dict:
+        """
+        dict_df_position을 {symbol : [QTY, TRADE_PRICE]}로 변환하는 메서드
+
+        :param dict dict_df_position: {symbol : [QTY, TRADE_PRICE] 데이터프레임}
+        :return: {symbol : [QTY, TRADE_PRICE]}
+        :rtype: dict
+        """
+        position_dict = {
+            symbol: [int(df["QTY"].values[0]), float(df["TRADE_PRICE"].values[0])]
+            for symbol, df in dict_df_position.items()
+        }
+        return position_dict
+
+    @staticmethod
+    def format_dict_df_position(position_dict: dict) -> dict:
+        """
+        {symbol : [QTY, TRADE_PRICE]}를 dict_df_position으로 변환하는 메서드
+
+        :param dict position_dict: {symbol : [QTY, TRADE_PRICE]}
+        :return: {symbol : [QTY, TRADE_PRICE] 데이터프레임}
+        :rtype: dict
+        """
+        dict_df_position = {
+            symbol: pd.DataFrame({"QTY": [qty], "TRADE_PRICE": [trade_price]})
+            for symbol, (qty, trade_price) in position_dict.items()
+        }
+        return dict_df_position
+
+    @staticmethod
+    def append_row(
+        result_array_dict: dict, result_n_dict: dict, key: str, row: tuple
+    ) -> None:
+        """
+        key의 결과 배열에 row 하나를 추가하는 메서드
+        배열이 가득 차면 2배 크기로 옮기므로 row 추가는 평균 O(1) 입니다.
+
+        :param dict result_array_dict: {TOTAL / symbol : {column : 일별 결과 배열}}
+        :param dict result_n_dict: {TOTAL / symbol : 일별 결과 row 수}
+        :param str key: TOTAL / symbol
+        :param tuple row: TOTAL_COLUMNS / SYMBOL_COLUMNS 순서의 값
+        """
+        columns = TOTAL_COLUMNS if key == "TOTAL" else SYMBOL_COLUMNS
+        n = result_n_dict.get(key, 0)
+        array_dict = result_array_dict.get(key)
+        if array_dict is None or n == len(array_dict["DATE"]):
+            _array_dict = {
+                column: np.empty(max(16, 2 * n), dtype=dtype)
+                for column, dtype in columns.items()
+            }
+            for column in columns if array_dict is not None else []:
+                _array_dict[column][:n] = array_dict[column]
+            array_dict = result_array_dict[key] = _array_dict
+
+        for column, value in zip(columns, row):
+            array_dict[column][n] = value
+        result_n_dict[key] = n + 1
+
+    @staticmethod
+    def append_result(
+        result_array_dict: dict,
+        result_n_dict: dict,
+        date: dt.date,
+        cash: float,
+        close_dict: dict,
+        position_dict: dict,
+        fill_dict: dict,
+    ) -> list:
+        """
+        당일 결과 row를 결과 배열에 추가하는 메서드
+        TOTAL : (DATE, CASH, STOCK_VALUE, TOTAL_VALUE, TRADE_VALUE)
+        symbol : (DATE, PRICE, QTY, ORDER) (보유 중이거나 당일 체결된 symbol)
+
+        :param dict result_array_dict: {TOTAL / symbol : {column : 일별 결과 배열}}
+        :param dict result_n_dict: {TOTAL / symbol : 일별 결과 row 수}
+        :param datetime.date date: 현재 날짜
+        :param float cash: 체결 후 cash
+        :param dict close_dict: {symbol : 종가}
+        :param dict position_dict: {symbol : [QTY, TRADE_PRICE]}
+        :param dict fill_dict: {symbol : 체결 수량}
+        :return: row가 추가된 key list
+        :rtype: list
+        """
+        keys = list()
+        stock_value = 0.0
+        for symbol in sorted(set(position_dict) | set(fill_dict)):
+            _qty = position_dict.get(symbol, [0])[0]
+            _close = close_dict.get(symbol)
+            if _close is None:
+                _close = result_array_dict[symbol]["PRICE"][result_n_dict[symbol] - 1]
+            stock_value += _qty * _close
+
+            BACKTESTER.append_row(
+                result_array_dict,
+                result_n_dict,
+                symbol,
+                (date, _close, _qty, fill_dict.get(symbol, 0)),
+            )
+            keys.append(symbol)
+
+        trade_value = sum(
+            abs(qty) * close_dict[symbol] for symbol, qty in fill_dict.items()
+        )
+        BACKTESTER.append_row(
+            result_array_dict,
+            result_n_dict,
+            "TOTAL",
+            (date, cash, stock_value, cash + stock_value, trade_value),
+        )
+        keys.append("TOTAL")
+        return keys
+
+    @staticmethod
+    def format_dict_df_result(
+        result_array_dict: dict, result_n_dict: dict, keys: list, dict_df_result: dict
+    ) -> dict:
+        """
+        row가 추가된 key의 결과 데이터프레임을 결과 배열의 view로 만드는 메서드 (key별 하루 한번, 복사 없음)
+        뒤에 추가되는 row는 view 밖에 쓰이므로 이미 만든 데이터프레임은 바뀌지 않습니다.
+
+        :param dict result_array_dict: {TOTAL / symbol : {column : 일별 결과 배열}}
+        :param dict result_n_dict: {TOTAL / symbol : 일별 결과 row 수}
+        :param list keys: row가 추가된 key list
+        :param dict dict_df_result: {TOTAL / symbol : 일별 결과 데이터프레임}
+        :return: keys의 결과 데이터프레임이 갱신된 dict_df_result
+        :rtype: dict
+        """
+        for key in keys:
+            n = result_n_dict[key]
+            dict_df_result[key] = pd.DataFrame(
+                {column: array[:n] for column, array in result_array_dict[key].items()},
+                copy=False,
+            )
+        return dict_df_result
+
+    def run_day(self, date: dt.date) -> None:
+        """
+        하루치 trade_func 호출 / 체결 / 결과 기록을 진행하는 메서드
+
+        :param datetime.date date: 현재 날짜
+        """
+        dict_df_result = self.dict_df_result
+        dict_df_position = self.dict_df_position
+
+        orders = self.trade_func(date, dict_df_result, dict_df_position, self.logger)
+        orders = [(symbol, int(qty)) for symbol, qty in orders if int(qty) != 0]
+        selling_orders, buying_orders = self.split_orders(orders)
+
+        position_dict = self.get_position_dict(dict_df_position)
+        close_dict = self.history_price_loader.load_close_dict(
+            sorted(set(position_dict) | {symbol for symbol, _ in orders}), date
+        )
+        cash = dict_df_result["TOTAL"]["CASH"].values[-1]
+
+        cash, selling_fill_dict = self.fill_selling_orders(
+            selling_orders, close_dict, cash, position_dict
+        )
+        cash, buying_fill_dict = self.fill_buying_orders(
+            buying_orders, close_dict, cash, position_dict
+        )
+        fill_dict = {**selling_fill_dict}
+        for symbol, qty in buying_fill_dict.items():
+            fill_dict[symbol] = fill_dict.get(symbol, 0) + qty
+
+        keys = self.append_result(
+            self.result_array_dict,
+            self.result_n_dict,
+            date,
+            cash,
+            close_dict,
+            position_dict,
+            fill_dict,
+        )
+        self.dict_df_result = self.format_dict_df_result(
+            self.result_array_dict, self.result_n_dict, keys, dict_df_result
+        )
+        self.dict_df_position = self.format_dict_df_position(position_dict)
+
+    # BACKTESTER PIPELINE
+    def __call__(self) -> pd.DataFrame:
+        """
+        BACKTESTER의 파이프라인을 제공하는 메서드
+
+        :return: 일별 TOTAL 결과 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        CFG = self.CFG
+
+        trading_dates = self.history_price_loader.load_trading_dates(
+            CFG["calendar_symbol"]
+        )
+        if not trading_dates:
+            return pd.DataFrame(columns=list(TOTAL_COLUMNS))
+
+        self.result_array_dict = dict()
+        self.result_n_dict = dict()
+        self.append_row(
+            self.result_array_dict,
+            self.result_n_dict,
+            "TOTAL",
+            (
+                trading_dates[0] - dt.timedelta(days=1),
+                CFG["initial_cash"],
+                0.0,
+                CFG["initial_cash"],
+                0.0,
+            ),
+        )
+        self.dict_df_result = self.format_dict_df_result(
+            self.result_array_dict, self.result_n_dict, ["TOTAL"], dict()
+        )
+        self.dict_df_position = dict()
+
+        for date in trading_dates:
+            self.run_day(date)
+            self.logger.info(
+                f"{date} : TOTAL_VALUE {self.dict_df_result['TOTAL']['TOTAL_VALUE'].values[-1]:,.0f}"
+            )
+        return self.dict_df_result["TOTAL"]
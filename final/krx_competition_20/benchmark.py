@@ -0,0 +1,476 @@
+# BENCHMARK
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from .trade_func import trade_func
+from .loader.data_provider import DATA_PROVIDER, LATENCY_PROVIDER
+from .loader.data_provider import LOCAL_PROVIDER, SYNTHETIC_DATA_GENERATOR
+from .loader.api_loader import SYMBOL_LOADER
+from .loader.cache_loader import clear_caches
+
+from .processor.sector_processor import SYMBOL_SECTOR_PROCESSOR
+from .processor.model_processor import PANEL_SCORE_PROCESSOR
+
+from .processor.order_processor import BUYING_ORDER_PROCESSOR, SELLING_ORDER_PROCESSOR
+from .processor.order_processor import merge_order
+
+STAGES = [
+    "SYMBOL_LOADER",
+    "SYMBOL_SECTOR_PROCESSOR",
+    "PANEL_SCORE_PROCESSOR",
+    "BUYING_ORDER_PROCESSOR",
+    "SELLING_ORDER_PROCESSOR",
+    "merge_order",
+    "trade_func",
+]
+# universe 크기와 무관하게 전체 universe로 한번만 측정하는 stage
+FULL_UNIVERSE_STAGES = ["SYMBOL_LOADER", "trade_func"]
+
+
+class BENCHMARK:
+    """
+    BENCHMARK : trade_func와 각 pipeline stage를 지연이 주입된 provider로 반복 실행하여
+    universe 크기별 wall time (p50 / p95) / api 호출 수 / 최대 메모리를 측정하는 클래스
+    """
+
+    def __init__(
+        self,
+        provider: DATA_PROVIDER,
+        date: dt.date,
+        CFG: dict = {
+            "universe_sizes": [250, 500, 1000, 2000, 3500],
+            "repeat": 5,
+            "stages": STAGES,
+            "latency": {
+                "symbol_stock": 0.2,
+                "daily_stock": 0.02,
+                "account_history": 0.02,
+                "symbol_sector_dict": 0.0,
+            },
+            "jitter": 0.5,
+            "cold_cache": True,
+            "trace_memory": True,
+            "position_ratio": 0.1,
+            "seed": 0,
+        },
+        logger: logging.Logger = logging.getLogger("benchmark"),
+    ) -> None:
+        """
+        BENCHMARK의 생성자
+
+        :param DATA_PROVIDER provider: 지연 없이 데이터를 제공하는 provider (LOCAL_PROVIDER)
+        :param datetime.date date: trade_func를 실행할 날짜
+        :param dict CFG: universe 크기 / 반복 수 / 측정 stage / api 지연 / cold_cache (반복마다 빈 cache)
+            / trace_memory (tracemalloc 측정) / 보유 position 비율 / seed 파라미터
+        :param logging.Logger logger: 진행 상황을 기록할 logger
+
+        :attr list results: stage / universe 크기별 측정 결과 입니다.
+        """
+        self.provider = provider
+        self.date = date
+        self.CFG = CFG
+        self.logger = logger
+        self.results = list()
+
+    def make_provider(self, cache_dir: str) -> LATENCY_PROVIDER:
+        """
+        측정 1회에 사용할 지연 provider를 만드는 메서드
+        cold_cache라면 매번 새 cache 경로를 사용하여 cache가 비어있는 첫 거래일을 재현합니다.
+
+        :param str cache_dir: benchmark의 cache 경로
+        :return: 지연 provider
+        :rtype: LATENCY_PROVIDER
+        """
+        CFG = self.CFG
+        if CFG["cold_cache"]:
+            cache_dir = tempfile.mkdtemp(dir=cache_dir)
+        latency_provider = LATENCY_PROVIDER(
+            self.provider,
+            {"latency": CFG["latency"], "jitter": CFG["jitter"], "seed": CFG["seed"]},
+            cache_dir,
+        )
+        return latency_provider
+
+    @staticmethod
+    def measure(func, provider: LATENCY_PROVIDER) -> tuple:
+        """
+        func를 1회 실행하여 wall time / api 호출 수를 측정하는 메서드
+
+        :param callable func: provider를 받아 stage를 실행하는 함수
+        :param LATENCY_PROVIDER provider: 지연 provider
+        :return: (결과, wall time(초), {메서드 이름 : 호출 수})
+        :rtype: tuple
+        """
+        provider.reset_call_count()
+        started_at = time.perf_counter()
+        result = func(provider)
+        seconds = time.perf_counter() - started_at
+        return result, seconds, provider.reset_call_count()
+
+    @staticmethod
+    def measure_memory(func, provider: LATENCY_PROVIDER) -> float:
+        """
+        func를 tracemalloc 아래에서 1회 실행하여 최대 메모리(MB)를 측정하는 메서드
+        tracemalloc은 실행을 느리게 하므로 wall time 측정과 분리합니다.
+
+        :param callable func: provider를 받아 stage를 실행하는 함수
+        :param LATENCY_PROVIDER provider: 지연 provider
+        :return: 최대 메모리 (MB)
+        :rtype: float
+        """
+        tracemalloc.start()
+        try:
+            func(provider)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak / 1024**2
+
+    @staticmethod
+    def summarize(
+        stage: str, universe_size: int, seconds_list: list, call_count_list: list
+    ) -> dict:
+        """
+        반복 측정 결과를 p50 / p95 / 평균 api 호출 수로 요약하는 메서드
+
+        :param str stage: stage 이름
+        :param int universe_size: universe 크기
+        :param list seconds_list: 반복별 wall time(초)
+        :param list call_count_list: 반복별 {메서드 이름 : 호출 수}
+        :return: 요약 딕셔너리
+        :rtype: dict
+        """
+        names = sorted({name for call_count in call_count_list for name in call_count})
+        api_calls = {
+            name: float(
+                np.mean([call_count.get(name, 0) for call_count in call_count_list])
+            )
+            for name in names
+        }
+        result = {
+            "stage": stage,
+            "universe_size": universe_size,
+            "repeat": len(seconds_list),
+            "p50_s": float(np.percentile(seconds_list, 50)),
+            "p95_s": float(np.percentile(seconds_list, 95)),
+            "mean_s": float(np.mean(seconds_list)),
+            "api_calls": api_calls,
+            "api_calls_total": float(sum(api_calls.values())),
+            "peak_memory_mb": None,
+        }
+        return result
+
+    def get_universe(self, universe_size: int) -> tuple[list, pd.DataFrame]:
+        """
+        universe_size개의 symbol을 seed로 sampling하는 메서드
+
+        :param int universe_size: universe 크기
+        :return: (symbols, [SYMBOL, SECTOR] 데이터프레임)
+        :rtype: tuple[list, pd.DataFrame]
+        """
+        symbol_sector_dict = self.provider.symbol_sector_dict()
+        symbols = sorted(symbol_sector_dict)
+        rng = np.random.default_rng(self.CFG["seed"])
+        symbols = sorted(
+            rng.choice(symbols, min(universe_size, len(symbols)), replace=False)
+        )
+        symbol_df = pd.DataFrame({"SYMBOL": symbols})
+        symbol_df["SECTOR"] = symbol_df["SYMBOL"].map(symbol_sector_dict)
+        return symbols, symbol_df
+
+    def get_status_df(self, score_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        score_df의 일부 symbol을 보유한 것으로 가정한 status_df를 만드는 메서드
+
+        :param pd.DataFrame score_df: [SYMBOL, SCORE, CLOSE] 데이터프레임
+        :return: [SYMBOL, CURRENT_QTY, CURRENT_PRICE, TRADE_PRICE] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        rng = np.random.default_rng(self.CFG["seed"])
+        position_n = max(2, int(len(score_df) * self.CFG["position_ratio"]))
+        position_df = score_df.sample(
+            min(position_n, len(score_df)), random_state=self.CFG["seed"]
+        )
+        status_df = pd.DataFrame(
+            {
+                "SYMBOL": position_df["SYMBOL"].values,
+                "CURRENT_QTY": rng.integers(1, 1_000, len(position_df)),
+                "CURRENT_PRICE": position_df["CLOSE"].values,
+                "TRADE_PRICE": position_df["CLOSE"].values
+                * rng.uniform(0.85, 1.15, len(position_df)),
+            }
+        )
+        return status_df
+
+    def get_stage_funcs(self, universe_size: int, cache_dir: str) -> dict:
+        """
+        universe_size의 입력으로 각 stage를 실행하는 함수들을 만드는 메서드
+        stage 입력은 측정 전에 미리 만들어 두어 앞 stage의 시간이 섞이지 않게 합니다.
+
+        :param int universe_size: universe 크기
+        :param str cache_dir: benchmark의 cache 경로
+        :return: {stage 이름 : provider를 받아 stage를 실행하는 함수}
+        :rtype: dict
+        """
+        date = self.date
+        symbols, symbol_df = self.get_universe(universe_size)
+
+        # 뒤 stage의 입력은 지연 없는 provider로 미리 만든다
+        setup_provider = LATENCY_PROVIDER(
+            self.provider, {"latency": dict(), "jitter": 0.0, "seed": 0}, cache_dir
+        )
+        score_df = PANEL_SCORE_PROCESSOR(
+            symbol_df.copy(), date, provider=setup_provider
+        )()
+        status_df = self.get_status_df(score_df)
+        invest_money = 750_000_000.0
+        selling_CFG = {"upper_limit": 8, "lower_limit": -3}
+        buying_orders = BUYING_ORDER_PROCESSOR(
+            score_df.copy(), invest_money, status_df, None
+        )()
+        selling_orders = SELLING_ORDER_PROCESSOR(status_df.copy(), selling_CFG)()
+        clear_caches()
+
+        dict_df_result = {
+            "TOTAL": pd.DataFrame({"DATE": [date], "CASH": [1_000_000_000.0]})
+        }
+        logger = self.logger
+
+        stage_funcs = {
+            "SYMBOL_LOADER": lambda provider: SYMBOL_LOADER(provider)(),
+            "SYMBOL_SECTOR_PROCESSOR": lambda provider: SYMBOL_SECTOR_PROCESSOR(
+                symbols, {"sector_symbol_n": 25, "sample_n": 20}, provider
+            )(),
+            "PANEL_SCORE_PROCESSOR": lambda provider: PANEL_SCORE_PROCESSOR(
+                symbol_df.copy(), date, provider=provider
+            )(),
+            "BUYING_ORDER_PROCESSOR": lambda provider: BUYING_ORDER_PROCESSOR(
+                score_df.copy(), invest_money, status_df, None
+            )(),
+            "SELLING_ORDER_PROCESSOR": lambda provider: SELLING_ORDER_PROCESSOR(
+                status_df.copy(), selling_CFG
+            )(),
+            "merge_order": lambda provider: merge_order(buying_orders, selling_orders),
+            "trade_func": lambda provider: trade_func(
+                date, dict_df_result, dict(), logger, provider=provider
+            ),
+        }
+        return stage_funcs
+
+    def run_stage(self, stage: str, func, universe_size: int, cache_dir: str) -> dict:
+        """
+        하나의 stage를 repeat번 측정하여 요약하는 메서드
+
+        :param str stage: stage 이름
+        :param callable func: provider를 받아 stage를 실행하는 함수
+        :param int universe_size: universe 크기
+        :param str cache_dir: benchmark의 cache 경로
+        :return: 요약 딕셔너리
+        :rtype: dict
+        """
+        CFG = self.CFG
+
+        seconds_list = list()
+        call_count_list = list()
+        for _ in range(CFG["repeat"]):
+            _, seconds, call_count = self.measure(func, self.make_provider(cache_dir))
+            # 측정마다 만든 provider의 cache / store가 lru_cache에 남지 않게 합니다.
+            clear_caches()
+            seconds_list.append(seconds)
+            call_count_list.append(call_count)
+
+        result = self.summarize(stage, universe_size, seconds_list, call_count_list)
+        if CFG["trace_memory"]:
+            result["peak_memory_mb"] = self.measure_memory(
+                func, self.make_provider(cache_dir)
+            )
+            clear_caches()
+        self.logger.info(
+            f"{stage} [{universe_size}] : p50 {result['p50_s']:.3f}s / p95 {result['p95_s']:.3f}s"
+            f" / api {result['api_calls_total']:.0f} / peak {result['peak_memory_mb']} MB"
+        )
+        return result
+
+    @staticmethod
+    def get_meta(CFG: dict, date: dt.date) -> dict:
+        """
+        결과 파일에 함께 기록할 실행 환경 정보를 만드는 메서드
+
+        :param dict CFG: benchmark 파라미터
+        :param datetime.date date: trade_func를 실행한 날짜
+        :return: 실행 환경 딕셔너리
+        :rtype: dict
+        """
+        try:
+            from importlib.metadata import version
+
+            package_version = version("krx_competition_20")
+        except Exception:
+            package_version = None
+        meta = {
+            "package_version": package_version,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "created_at": dt.datetime.now().isoformat(timespec="seconds"),
+            "date": date.isoformat(),
+            "CFG": CFG,
+        }
+        return meta
+
+    # BENCHMARK PIPELINE
+    def __call__(self, output_path: str = None) -> pd.DataFrame:
+        """
+        BENCHMARK의 파이프라인을 제공하는 메서드
+
+        :param str output_path: 결과 json 경로, None이면 저장하지 않습니다.
+        :return: stage / universe 크기별 결과 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        CFG = self.CFG
+        full_size = len(self.provider.symbol_sector_dict())
+
+        self.results = list()
+        cache_dir = tempfile.mkdtemp(prefix="krx20_benchmark_")
+        try:
+            universe_sizes = sorted(
+                {min(size, full_size) for size in CFG["universe_sizes"]}
+            )
+            for universe_size in universe_sizes:
+                stage_funcs = self.get_stage_funcs(universe_size, cache_dir)
+                for stage in CFG["stages"]:
+                    _universe_size = universe_size
+                    if stage in FULL_UNIVERSE_STAGES:
+                        if universe_size != universe_sizes[-1]:
+                            continue
+                        _universe_size = full_size
+                    self.results.append(
+                        self.run_stage(
+                            stage, stage_funcs[stage], _universe_size, cache_dir
+                        )
+                    )
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+        if output_path:
+            with open(output_path, "w") as f:
+                json.dump(
+                    {"meta": self.get_meta(CFG, self.date), "results": self.results},
+                    f,
+                    indent=2,
+                    ensure_ascii=False,
+                )
+        return pd.DataFrame(self.results)
+
+
+def compare_results(baseline_path: str, output_path: str) -> pd.DataFrame:
+    """
+    두 benchmark 결과 파일의 p50 / p95 / api 호출 수 / 최대 메모리를 비교하는 함수
+
+    :param str baseline_path: 기준 결과 json 경로
+    :param str output_path: 비교할 결과 json 경로
+    :return: stage / universe 크기별 [기준, 비교, 비율] 데이터프레임
+    :rtype: pd.DataFrame
+    """
+    columns = ["p50_s", "p95_s", "api_calls_total", "peak_memory_mb"]
+    df_list = list()
+    for path in [baseline_path, output_path]:
+        with open(path) as f:
+            df_list.append(
+                pd.DataFrame(json.load(f)["results"]).set_index(
+                    ["stage", "universe_size"]
+                )[columns]
+            )
+    compare_df = df_list[0].join(df_list[1], lsuffix="_BASE", rsuffix="_NEW")
+    for column in columns:
+        compare_df[f"{column}_RATIO"] = (
+            compare_df[f"{column}_NEW"] / compare_df[f"{column}_BASE"]
+        )
+    return compare_df.reset_index()
+
+
+def main(argv: list = None) -> None:
+    """
+    python -m krx_competition_20.benchmark 진입점
+    data_dir에 parquet 파일이 없으면 synthetic 데이터를 생성합니다.
+    """
+    parser = argparse.ArgumentParser(description="trade_func benchmark")
+    parser.add_argument("--data-dir", required=True)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--date", default=None, help="YYYY-MM-DD, 기본값은 마지막 거래일")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[250, 500, 1000, 2000, 3500]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES)
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--warm-cache", action="store_true")
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--symbol-n", type=int, default=3500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    if not os.path.exists(os.path.join(args.data_dir, "daily_stock.parquet")):
+        end_date = dt.date.today()
+        SYNTHETIC_DATA_GENERATOR(
+            end_date - dt.timedelta(days=365),
+            end_date,
+            {
+                "symbol_n": args.symbol_n,
+                "sector_n": 60,
+                "no_fundamental_ratio": 0.1,
+                "seed": args.seed,
+            },
+        )(args.data_dir)
+    provider = LOCAL_PROVIDER(args.data_dir)
+    if args.date:
+        date = dt.date.fromisoformat(args.date)
+    else:
+        date = provider.daily_stock_df["DATE"].max().date()
+
+    latency = {
+        "symbol_stock": 0.2 * args.latency_scale,
+        "daily_stock": 0.02 * args.latency_scale,
+        "account_history": 0.02 * args.latency_scale,
+        "symbol_sector_dict": 0.0,
+    }
+    benchmark = BENCHMARK(
+        provider,
+        date,
+        {
+            "universe_sizes": args.sizes,
+            "repeat": args.repeat,
+            "stages": args.stages,
+            "latency": latency,
+            "jitter": 0.5,
+            "cold_cache": not args.warm_cache,
+            "trace_memory": not args.no_memory,
+            "position_ratio": 0.1,
+            "seed": args.seed,
+        },
+    )
+    result_df = benchmark(args.output)
+    print(result_df.drop(columns="api_calls").to_string(index=False))
+
+    if args.baseline:
+        print(compare_results(args.baseline, args.output).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
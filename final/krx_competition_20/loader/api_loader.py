@@ -1,8 +1,23 @@
 import datetime as dt
 
+import numpy as np
 import pandas as pd
 
-import kquant as kq
+from .data_provider import DATA_PROVIDER, load_default_provider
+from .cache_loader import ACCOUNT_HISTORY_CACHE, load_account_history_cache
+from .cache_loader import DAILY_PRICE_STORE, load_daily_price_store
+from .cache_loader import SYMBOL_STOCK_CACHE, load_symbol_stock_cache
+from .cache_loader import POINT_IN_TIME_PANEL, get_available_dates
+from .concurrent_loader import CONCURRENT_FETCHER, DEADLINE
+
+ACCOUNT_CODE_DICT = {
+    "NETPROFIT": "122700",
+    "ASSETS": "111000",
+    "CURRENT_ASSETS": "111100",
+    "LIABILITIES": "113000",
+    "EQUITY": "115000",
+    "EBITDA": "123000",
+}
 
 
 class SYMBOL_LOADER:
@@ -10,74 +25,120 @@ class SYMBOL_LOADER:
     SYMBOL_LOADER : 거래가능한 주식 symbol을 필터-추출하는 클래스
     """
 
+    def __init__(
+        self,
+        provider: DATA_PROVIDER = None,
+        CFG: dict = {
+            "filters": None,
+        },
+        symbol_stock_cache: SYMBOL_STOCK_CACHE = None,
+    ) -> None:
+        """
+        SYMBOL_LOADER의 생성자
+
+        :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+        :param dict CFG: 적용할 SYMBOL_FILTER 이름 list(filters), None이면 등록된 filter를 모두 적용합니다.
+        :param SYMBOL_STOCK_CACHE symbol_stock_cache: 종목 목록 cache, None이면 provider별로 공유하는 cache를 사용합니다.
+        """
+        self.provider = provider or load_default_provider()
+        self.CFG = CFG
+        self.symbol_stock_cache = symbol_stock_cache or load_symbol_stock_cache(
+            self.provider
+        )
+
     @staticmethod
-    def load_symbols_df() -> pd.DataFrame:
+    def load_symbols_df(symbol_stock_cache: SYMBOL_STOCK_CACHE) -> pd.DataFrame:
         """
-        한국거래소 종목 목록 데이터프레임을 호출하는 메서드
+        한국거래소 종목 목록 데이터프레임을 호출하는 메서드 (TTL 동안 cache를 재사용합니다.)
 
+        :param SYMBOL_STOCK_CACHE symbol_stock_cache: 종목 목록 cache
         :return : 한국거래소 종목 목록 데이터프레임
         :rtype : pd.DataFrame
         """
-        symbols_df = kq.symbol_stock()
+        symbols_df = symbol_stock_cache.get()
         return symbols_df
 
     class SYMBOL_FILTER:
         """
         SYMBOl_FILTER : symbols를 filtering 하는 클래스
+        filter로 시작하는 메서드는 symbols_df와 같은 길이의 boolean mask를 반환하며, 등록된 filter는 한번에 AND 됩니다.
         """
 
+        @classmethod
+        def register(cls, name: str, func) -> None:
+            """
+            filter를 등록하는 메서드 (ex. 유동성 / 시가총액 filter)
+
+            :param str name: filter 이름 (filter로 시작)
+            :param callable func: symbols_df를 받아 boolean mask를 반환하는 함수
+            """
+            if not name.startswith("filter"):
+                raise ValueError(f"filter name must start with 'filter' : {name}")
+            setattr(cls, name, staticmethod(func))
+
+        @classmethod
+        def get_filter_names(cls) -> list:
+            """
+            등록된 filter 이름을 등록 순서로 반환하는 메서드
+
+            :return: filter 이름 list
+            :rtype: list
+            """
+            filter_names = [name for name in vars(cls) if name.startswith("filter")]
+            return filter_names
+
         @staticmethod
-        def filter__market(symbols_df: pd.DataFrame) -> pd.DataFrame:
+        def filter__market(symbols_df: pd.DataFrame) -> np.ndarray:
             """
             market에 대한 필터링을 진행하는 메서드
 
             :param pd.DataFrame : symbols_df : 한국거래소 종목 목록 데이터프레임
-            :return: MARKET이 [코스닥, 유가증권]에 속하는 데이터프레임
-            :rtype: pd.DataFrame
+            :return: MARKET이 [코스닥, 유가증권]에 속하는 row의 mask
+            :rtype: np.ndarray
             """
-            filtered_symbols_df = symbols_df[
-                (symbols_df["MARKET"].isin(["코스닥", "유가증권"]))
-            ].copy()
-            return filtered_symbols_df
+            mask = symbols_df["MARKET"].isin(["코스닥", "유가증권"]).to_numpy()
+            return mask
 
         @staticmethod
-        def filter__admin_issue(symbols_df: pd.DataFrame) -> pd.DataFrame:
+        def filter__admin_issue(symbols_df: pd.DataFrame) -> np.ndarray:
             """
             ADMIN_ISSUE에 대한 필터링을 진행하는 메서드
 
             :param pd.DataFrame : symbols_df : 한국거래소 종목 목록 데이터프레임
-            :return: ADMIN_ISSUE가 0인 데이터프레임
-            :rtype: pd.DataFrame
+            :return: ADMIN_ISSUE가 0인 row의 mask
+            :rtype: np.ndarray
             """
-            filtered_symbols_df = symbols_df[(symbols_df["ADMIN_ISSUE"] == 0)].copy()
-            return filtered_symbols_df
+            mask = symbols_df["ADMIN_ISSUE"].to_numpy() == 0
+            return mask
 
         @staticmethod
-        def filter_sec_type(symbols_df: pd.DataFrame) -> pd.DataFrame:
+        def filter_sec_type(symbols_df: pd.DataFrame) -> np.ndarray:
             """
             SEC_TYPE에 대한 필터링을 진행하는 메서드
 
             :param pd.DataFrame : symbols_df : 한국거래소 종목 목록 데이터프레임
-            :return: SEC_TYPE이 [ST, EF, EN]에 속하는 데이터프레임
-            :rtype: pd.DataFrame
+            :return: SEC_TYPE이 [ST, EF, EN]에 속하는 row의 mask
+            :rtype: np.ndarray
             """
-            filtered_symbols_df = symbols_df[
-                symbols_df["SEC_TYPE"].isin(["ST", "EF", "EN"])
-            ].copy()
-            return filtered_symbols_df
+            mask = symbols_df["SEC_TYPE"].isin(["ST", "EF", "EN"]).to_numpy()
+            return mask
 
     def filter_symbols_df(self, symbols_df: pd.DataFrame) -> pd.DataFrame:
         """
         symbol_df 에 대한 필터링을 진행하는 메서드
+        filter별 mask를 하나로 합친 뒤 한번만 indexing 합니다.
 
         :param pd.DataFrame : symbols_df : 한국거래소 종목 목록 데이터프레임
         :return: SYMBOL_FILTER의 메서드를 거친 데이터프레임
         :rtype: pd.DataFrame
         """
-        symbol_filter = self.SYMBOL_FILTER()
-        filtered_symbols_df = symbol_filter.filter__market(symbols_df)
-        filtered_symbols_df = symbol_filter.filter__admin_issue(filtered_symbols_df)
-        filtered_symbols_df = symbol_filter.filter_sec_type(filtered_symbols_df)
+        symbol_filter = self.SYMBOL_FILTER
+        filter_names = self.CFG["filters"] or symbol_filter.get_filter_names()
+
+        mask = np.ones(len(symbols_df), dtype=bool)
+        for filter_name in filter_names:
+            mask &= getattr(symbol_filter, filter_name)(symbols_df)
+        filtered_symbols_df = symbols_df[mask]
         return filtered_symbols_df
 
     @staticmethod
@@ -100,7 +161,7 @@ class SYMBOL_LOADER:
         :return: 필터를 거친 symbols
         :rtype: list
         """
-        symbols_df = self.load_symbols_df()
+        symbols_df = self.load_symbols_df(self.symbol_stock_cache)
         filtered_symbols_df = self.filter_symbols_df(symbols_df)
         symbols = self.get_symbols(filtered_symbols_df)
         return symbols
@@ -111,22 +172,34 @@ class FUNDAMENTAL_LOADER:
     FUNDAMENTAL_LOADER : fundamental_analysis를 위한 정보를 추출하는 클래스
     """
 
-    def __init__(self, symbol: str, date: dt.date) -> None:
+    def __init__(
+        self,
+        symbol: str,
+        date: dt.date,
+        account_cache: ACCOUNT_HISTORY_CACHE = None,
+        price_store: DAILY_PRICE_STORE = None,
+        provider: DATA_PROVIDER = None,
+        point_in_time: bool = False,
+    ) -> None:
         """
         FUNDAMENTAL_LOADER의 생성자
 
         :param str symbol: stock의 symbol 입니다.
         :param datetime.date date: 현재 날짜 입니다.
+        :param ACCOUNT_HISTORY_CACHE account_cache: 분기 공시 cache, None이면 기본 cache를 사용합니다.
+        :param DAILY_PRICE_STORE price_store: 일별 주가 store, None이면 기본 store를 사용합니다.
+        :param DATA_PROVIDER provider: 기본 cache / store의 데이터 provider
+        :param bool point_in_time: True이면 현재 날짜에 사용할 수 없는 (공시 시즌 마감 전의) YEARMONTH를 제외합니다. (backtest용)
+            live에서는 provider가 이미 공시한 분기만 반환하므로 False로 사용합니다.
 
-        :attr : pd.DataFrmae daily_stock_df : 현재 날짜 기준 가장 최근 stock데이터 입니다.
+        :attr : dict recent_price : 현재 날짜 기준 가장 최근 {DATE, CLOSE, MARKETCAP} 입니다.
         """
         self.symbol = symbol
         self.date = date
-        self.daily_stock_df = kq.daily_stock(
-            symbol,
-            start_date=date - dt.timedelta(days=7),
-            end_date=date,
-        )
+        self.account_cache = account_cache or load_account_history_cache(provider)
+        self.price_store = price_store or load_daily_price_store(provider)
+        self.point_in_time = point_in_time
+        self.recent_price = self.price_store.load_recent(symbol, date)
 
     def load_recent_close(self) -> float:
         """
@@ -134,8 +207,7 @@ class FUNDAMENTAL_LOADER:
         :return: 종가
         :rtype: float
         """
-        daily_stock_df = self.daily_stock_df
-        _close = daily_stock_df.sort_values("DATE").tail(1)["CLOSE"].values[0]
+        _close = self.recent_price["CLOSE"]
         return _close
 
     def load_recent_marketcap(self) -> float:
@@ -145,10 +217,26 @@ class FUNDAMENTAL_LOADER:
         :return: 시가총액
         :rtype: float
         """
-        daily_stock_df = self.daily_stock_df
-        _marketcap = daily_stock_df.sort_values("DATE").tail(1)["MARKETCAP"].values[0]
+        _marketcap = self.recent_price["MARKETCAP"]
         return float(_marketcap)
 
+    def load_account_history(self, account_code: str) -> pd.DataFrame:
+        """
+        cache를 거쳐 분기 공시 데이터를 읽어옵니다.
+        point_in_time이면 현재 날짜에 사용할 수 없는 (공시 시즌 마감 전의) YEARMONTH는 제외합니다. (get_available_dates)
+
+        :param str account_code: 계정 코드
+        :return: [YEARMONTH, VALUE] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        account_df = self.account_cache.load_account_history(
+            self.symbol, account_code, self.date
+        )
+        if self.point_in_time:
+            available_dates = get_available_dates(account_df["YEARMONTH"])
+            account_df = account_df[available_dates <= np.datetime64(self.date, "D")]
+        return account_df
+
     def load_recent_netprofit(self) -> float:
         """
         공시자료 중 가장 최근 당기순이익을 추출합니다.
@@ -156,10 +244,8 @@ class FUNDAMENTAL_LOADER:
         :return: 당기순이익
         :rtype: float
         """
-        netprofit_df = kq.account_history(
-            symbol=self.symbol, account_code="122700", period="q"
-        )
-        netprofit_df.sort_values("YEARMONTH", inplace=True)
+        netprofit_df = self.load_account_history("122700")
+        netprofit_df = netprofit_df.sort_values("YEARMONTH")
         _netprofit = netprofit_df.tail(1)["VALUE"].values[0] * 1000
         return float(_netprofit)
 
@@ -170,10 +256,8 @@ class FUNDAMENTAL_LOADER:
         :return: 총 자산
         :rtype: float
         """
-        assets_df = kq.account_history(
-            symbol=self.symbol, account_code="111000", period="q"
-        )
-        assets_df.sort_values("YEARMONTH", inplace=True)
+        assets_df = self.load_account_history("111000")
+        assets_df = assets_df.sort_values("YEARMONTH")
         _assets = assets_df.tail(1)["VALUE"].values[0] * 1000
         return float(_assets)
 
@@ -184,10 +268,8 @@ class FUNDAMENTAL_LOADER:
         :return: 유동 자산
         :rtype: float
         """
-        current_assets_df = kq.account_history(
-            symbol=self.symbol, account_code="111100", period="q"
-        )
-        current_assets_df.sort_values("YEARMONTH", inplace=True)
+        current_assets_df = self.load_account_history("111100")
+        current_assets_df = current_assets_df.sort_values("YEARMONTH")
         _current_assets = current_assets_df.tail(1)["VALUE"].values[0] * 1000
         return float(_current_assets)
 
@@ -198,10 +280,8 @@ class FUNDAMENTAL_LOADER:
         :return: 총 부채
         :rtype: float
         """
-        liabilities_df = kq.account_history(
-            symbol=self.symbol, account_code="113000", period="q"
-        )
-        liabilities_df.sort_values("YEARMONTH", inplace=True)
+        liabilities_df = self.load_account_history("113000")
+        liabilities_df = liabilities_df.sort_values("YEARMONTH")
         _liabilities = liabilities_df.tail(1)["VALUE"].values[0] * 1000
         return float(_liabilities)
 
@@ -212,10 +292,8 @@ class FUNDAMENTAL_LOADER:
         :return: 총 자본(총 자산 - 총 부채)
         :rtype: float
         """
-        equity_df = kq.account_history(
-            symbol=self.symbol, account_code="115000", period="q"
-        )
-        equity_df.sort_values("YEARMONTH", inplace=True)
+        equity_df = self.load_account_history("115000")
+        equity_df = equity_df.sort_values("YEARMONTH")
         _equity = equity_df.tail(1)["VALUE"].values[0] * 1000
         return float(_equity)
 
@@ -226,10 +304,8 @@ class FUNDAMENTAL_LOADER:
         :return: EBITDA
         :rtype: float
         """
-        ebitda_df = kq.account_history(
-            symbol=self.symbol, account_code="123000", period="q"
-        )
-        ebitda_df.sort_values("YEARMONTH", inplace=True)
+        ebitda_df = self.load_account_history("123000")
+        ebitda_df = ebitda_df.sort_values("YEARMONTH")
         _ebitda = ebitda_df.tail(1)["VALUE"].values[0] * 1000
         return float(_ebitda)
 
@@ -253,3 +329,246 @@ class FUNDAMENTAL_LOADER:
             "ASSETS": _assets,
             "EQUITY": _equity,
         }
+
+
+class BULK_FUNDAMENTAL_LOADER:
+    """
+    BULK_FUNDAMENTAL_LOADER : 여러 symbol의 fundamental 정보를 한번에 추출하는 클래스
+    """
+
+    def __init__(
+        self,
+        symbols: list,
+        date: dt.date,
+        accounts: list = ["NETPROFIT", "ASSETS", "EQUITY"],
+        CFG: dict = {
+            "max_workers": 8,
+            "timeout": 30,
+        },
+        account_cache: ACCOUNT_HISTORY_CACHE = None,
+        price_store: DAILY_PRICE_STORE = None,
+        provider: DATA_PROVIDER = None,
+        deadline: DEADLINE = None,
+        point_in_time_panel: POINT_IN_TIME_PANEL = None,
+    ) -> None:
+        """
+        BULK_FUNDAMENTAL_LOADER의 생성자
+
+        :param list symbols: fundamental 정보를 추출할 symbols
+        :param datetime.date date: 현재 날짜 입니다.
+        :param list accounts: 추출할 계정명 (ACCOUNT_CODE_DICT의 key)
+        :param dict CFG: 동시 호출 수(max_workers) / symbol별 timeout(초) 파라미터
+        :param ACCOUNT_HISTORY_CACHE account_cache: 분기 공시 cache, None이면 기본 cache를 사용합니다.
+        :param DAILY_PRICE_STORE price_store: 일별 주가 store, None이면 기본 store를 사용합니다.
+        :param DATA_PROVIDER provider: 기본 cache / store의 데이터 provider
+        :param DEADLINE deadline: 시간 예산, 임박하면 남은 호출을 취소하고 준비된 symbol만 반환합니다.
+        :param POINT_IN_TIME_PANEL point_in_time_panel: 공시 as-of panel, 있다면 공시 데이터는 symbol별로 호출하지 않고
+            panel에서 한번에 찾습니다. (backtest용)
+
+        :attr list failures: 호출에 실패한 [(symbol, exception)] 입니다.
+        """
+        self.symbols = symbols
+        self.date = date
+        self.accounts = accounts
+        self.CFG = CFG
+        self.account_cache = account_cache or load_account_history_cache(provider)
+        self.price_store = price_store or load_daily_price_store(provider)
+        self.deadline = deadline
+        self.point_in_time_panel = point_in_time_panel
+        self.failures = list()
+
+    @staticmethod
+    def load_symbol_data(
+        symbol: str,
+        date: dt.date,
+        account_codes: list,
+        account_cache: ACCOUNT_HISTORY_CACHE,
+        price_store: DAILY_PRICE_STORE,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        하나의 symbol에 필요한 주가 / 공시 데이터를 모두 호출하는 메서드
+        주가는 price_store, 공시 데이터는 account_cache를 거쳐 읽어옵니다.
+
+        :param str symbol: stock의 symbol 입니다.
+        :param datetime.date date: 현재 날짜 입니다.
+        :param list account_codes: 호출할 account_code들
+        :param ACCOUNT_HISTORY_CACHE account_cache: 분기 공시 cache
+        :param DAILY_PRICE_STORE price_store: 일별 주가 store
+        :return: (daily_stock_df, account_history_df)
+        :rtype: tuple[pd.DataFrame, pd.DataFrame]
+        """
+        daily_stock_df = pd.DataFrame([price_store.load_recent(symbol, date)])
+        daily_stock_df["SYMBOL"] = symbol
+
+        account_df_list = list()
+        for account_code in account_codes:
+            _account_df = account_cache.load_account_history(symbol, account_code, date)
+            _account_df["ACCOUNT_CODE"] = account_code
+            account_df_list.append(_account_df)
+        if account_df_list:
+            account_history_df = pd.concat(account_df_list)
+        else:
+            account_history_df = pd.DataFrame(
+                columns=["YEARMONTH", "VALUE", "ACCOUNT_CODE"]
+            )
+        account_history_df["SYMBOL"] = symbol
+        return daily_stock_df, account_history_df
+
+    def load_bulk_data(
+        self, symbols: list, date: dt.date, account_codes: list, CFG: dict
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        symbols 전체의 주가 / 공시 데이터를 동시에 호출하여 long format으로 모으는 메서드
+        호출에 실패한 symbol은 제외하고 self.failures에 기록합니다.
+
+        :param list symbols: fundamental 정보를 추출할 symbols
+        :param datetime.date date: 현재 날짜 입니다.
+        :param list account_codes: 호출할 account_code들
+        :param dict CFG: 동시 호출 수(max_workers) / symbol별 timeout(초) 파라미터
+        :return: (daily_stock_df, account_history_df)
+        :rtype: tuple[pd.DataFrame, pd.DataFrame]
+        """
+        concurrent_fetcher = CONCURRENT_FETCHER(
+            lambda symbol: self.load_symbol_data(
+                symbol, date, account_codes, self.account_cache, self.price_store
+            ),
+            CFG,
+            self.deadline,
+        )
+        results, self.failures = concurrent_fetcher(symbols)
+
+        daily_stock_df_list = list()
+        account_history_df_list = list()
+        for result in results:
+            if result is None:
+                continue
+            _daily_stock_df, _account_history_df = result
+            daily_stock_df_list.append(_daily_stock_df)
+            account_history_df_list.append(_account_history_df)
+
+        if not daily_stock_df_list:
+            daily_stock_df = pd.DataFrame(
+                columns=["DATE", "CLOSE", "MARKETCAP", "SYMBOL"]
+            )
+            account_history_df = pd.DataFrame(
+                columns=["YEARMONTH", "VALUE", "ACCOUNT_CODE", "SYMBOL"]
+            )
+            return daily_stock_df, account_history_df
+
+        daily_stock_df = pd.concat(daily_stock_df_list, ignore_index=True)
+        account_history_df = pd.concat(account_history_df_list, ignore_index=True)
+        return daily_stock_df, account_history_df
+
+    @staticmethod
+    def get_recent_price_df(daily_stock_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        symbol별 가장 최근 종가 / 시가총액을 한번의 정렬로 추출하는 메서드
+
+        :param pd.DataFrame daily_stock_df: long format 주가 데이터
+        :return: [SYMBOL, CLOSE, MARKETCAP] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        recent_price_df = (
+            daily_stock_df.sort_values(["SYMBOL", "DATE"])
+            .drop_duplicates("SYMBOL", keep="last")
+            .loc[:, ["SYMBOL", "CLOSE", "MARKETCAP"]]
+        )
+        recent_price_df["MARKETCAP"] = recent_price_df["MARKETCAP"].astype(float)
+        return recent_price_df
+
+    @staticmethod
+    def get_recent_account_df(
+        account_history_df: pd.DataFrame, accounts: list
+    ) -> pd.DataFrame:
+        """
+        symbol x account 별 가장 최근 공시값을 wide format으로 추출하는 메서드
+
+        :param pd.DataFrame account_history_df: long format 공시 데이터
+        :param list accounts: 추출할 계정명
+        :return: [SYMBOL, *accounts] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        code_account_dict = {
+            ACCOUNT_CODE_DICT[account]: account for account in accounts
+        }
+
+        recent_account_df = account_history_df.sort_values(
+            ["SYMBOL", "ACCOUNT_CODE", "YEARMONTH"]
+        ).drop_duplicates(["SYMBOL", "ACCOUNT_CODE"], keep="last")
+        recent_account_df = recent_account_df.pivot(
+            index="SYMBOL", columns="ACCOUNT_CODE", values="VALUE"
+        )
+        recent_account_df = recent_account_df.reindex(
+            columns=list(code_account_dict.keys())
+        ).rename(columns=code_account_dict)
+        recent_account_df = recent_account_df.astype(float) * 1000
+        recent_account_df.columns.name = None
+        return recent_account_df.reset_index()
+
+    @staticmethod
+    def get_point_in_time_account_df(
+        point_in_time_panel: POINT_IN_TIME_PANEL,
+        symbols: list,
+        accounts: list,
+        date: dt.date,
+    ) -> pd.DataFrame:
+        """
+        symbol x account 별 date 기준 가장 최근 공시값을 panel에서 한번에 찾아 wide format으로 추출하는 메서드
+
+        :param POINT_IN_TIME_PANEL point_in_time_panel: 공시 as-of panel
+        :param list symbols: 추출할 symbols
+        :param list accounts: 추출할 계정명
+        :param datetime.date date: 현재 날짜 입니다.
+        :return: [SYMBOL, *accounts] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        account_codes = [ACCOUNT_CODE_DICT[account] for account in accounts]
+        _, values = point_in_time_panel.as_of(symbols, account_codes, date)
+        recent_account_df = pd.DataFrame(values.T * 1000, columns=accounts)
+        recent_account_df.insert(0, "SYMBOL", symbols)
+        return recent_account_df
+
+    @staticmethod
+    def merge_fundamental_df(
+        recent_price_df: pd.DataFrame, recent_account_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        주가 / 공시 데이터를 symbol 기준으로 합치는 메서드
+        하나라도 값이 없는 symbol은 제외됩니다.
+
+        :param pd.DataFrame recent_price_df: [SYMBOL, CLOSE, MARKETCAP] 데이터프레임
+        :param pd.DataFrame recent_account_df: [SYMBOL, *accounts] 데이터프레임
+        :return: symbol x account wide 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        fundamental_df = recent_price_df.merge(recent_account_df, on="SYMBOL")
+        fundamental_df = fundamental_df.dropna().reset_index(drop=True)
+        return fundamental_df
+
+    # BULK_FUNDAMENTAL_LOADER PIPELINE
+    def __call__(self) -> pd.DataFrame:
+        """
+        BULK_FUNDAMENTAL_LOADER의 파이프라인을 제공하는 메서드
+
+        :return: [SYMBOL, CLOSE, MARKETCAP, *accounts] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        symbols = self.symbols
+        date = self.date
+        accounts = self.accounts
+        CFG = self.CFG
+        account_codes = [ACCOUNT_CODE_DICT[account] for account in accounts]
+
+        if self.point_in_time_panel is None:
+            daily_stock_df, account_history_df = self.load_bulk_data(
+                symbols, date, account_codes, CFG
+            )
+            recent_account_df = self.get_recent_account_df(account_history_df, accounts)
+        else:
+            daily_stock_df, _ = self.load_bulk_data(symbols, date, list(), CFG)
+            recent_account_df = self.get_point_in_time_account_df(
+                self.point_in_time_panel, symbols, accounts, date
+            )
+        recent_price_df = self.get_recent_price_df(daily_stock_df)
+        fundamental_df = self.merge_fundamental_df(recent_price_df, recent_account_df)
+        return fundamental_df
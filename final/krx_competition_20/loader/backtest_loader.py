@@ -0,0 +1,131 @@
+import datetime as dt
+
+import pandas as pd
+
+from .data_provider import DATA_PROVIDER, load_default_provider
+
+
+class HISTORY_PRICE_LOADER:
+    """
+    HISTORY_PRICE_LOADER : backtest 체결을 위한 과거 종가를 제공하는 클래스
+    """
+
+    def __init__(
+        self,
+        start_date: dt.date,
+        end_date: dt.date,
+        CFG: dict = {
+            "fast_path": True,
+            "window_days": 7,
+        },
+        provider: DATA_PROVIDER = None,
+    ) -> None:
+        """
+        HISTORY_PRICE_LOADER의 생성자
+
+        :param datetime.date start_date: backtest 시작 날짜
+        :param datetime.date end_date: backtest 종료 날짜
+        :param dict CFG: fast_path (symbol별 전체 기간 1회 호출 후 재사용) / window_days (fast_path가 아닐 때 호출 기간)
+        :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+
+        :attr dict close_series_dict: {symbol : DATE index의 CLOSE series} 입니다.
+        """
+        self.start_date = start_date
+        self.end_date = end_date
+        self.CFG = CFG
+        self.provider = provider or load_default_provider()
+        self.close_series_dict = dict()
+
+    @staticmethod
+    def format_close_series(daily_stock_df: pd.DataFrame) -> pd.Series:
+        """
+        daily_stock 데이터프레임을 DATE 순으로 정렬된 CLOSE series로 변환하는 메서드
+
+        :param pd.DataFrame daily_stock_df: [DATE, CLOSE]를 가진 데이터프레임
+        :return: DATE index의 CLOSE series
+        :rtype: pd.Series
+        """
+        close_series = pd.Series(
+            daily_stock_df["CLOSE"].astype(float).values,
+            index=pd.to_datetime(daily_stock_df["DATE"]).dt.date,
+        ).sort_index()
+        close_series = close_series[~close_series.index.duplicated(keep="last")]
+        return close_series
+
+    def load_trading_dates(self, calendar_symbol: str) -> list:
+        """
+        calendar_symbol의 거래일을 backtest 거래일로 반환하는 메서드
+
+        :param str calendar_symbol: 거래일 기준 symbol
+        :return: 거래일 list
+        :rtype: list
+        """
+        daily_stock_df = self.provider.daily_stock(
+            calendar_symbol, start_date=self.start_date, end_date=self.end_date
+        )
+        close_series = self.format_close_series(daily_stock_df)
+        if self.CFG["fast_path"]:
+            self.close_series_dict[calendar_symbol] = close_series
+        trading_dates = list(close_series.index)
+        return trading_dates
+
+    def load_close_series(self, symbol: str, date: dt.date) -> pd.Series:
+        """
+        symbol의 종가 series를 반환하는 메서드
+        fast_path에서는 전체 기간을 한번만 호출하여 재사용합니다.
+
+        :param str symbol: stock의 symbol 입니다.
+        :param datetime.date date: 현재 날짜 입니다.
+        :return: DATE index의 CLOSE series
+        :rtype: pd.Series
+        """
+        if not self.CFG["fast_path"]:
+            daily_stock_df = self.provider.daily_stock(
+                symbol,
+                start_date=date - dt.timedelta(days=self.CFG["window_days"]),
+                end_date=date,
+            )
+            return self.format_close_series(daily_stock_df)
+
+        if symbol not in self.close_series_dict:
+            daily_stock_df = self.provider.daily_stock(
+                symbol,
+                start_date=self.start_date - dt.timedelta(days=self.CFG["window_days"]),
+                end_date=self.end_date,
+            )
+            self.close_series_dict[symbol] = self.format_close_series(daily_stock_df)
+        return self.close_series_dict[symbol]
+
+    def load_close(self, symbol: str, date: dt.date) -> float:
+        """
+        date 기준 가장 최근 종가를 반환하는 메서드 (거래정지 등으로 당일 종가가 없으면 직전 종가)
+
+        :param str symbol: stock의 symbol 입니다.
+        :param datetime.date date: 현재 날짜 입니다.
+        :return: 종가, 데이터가 없으면 None
+        :rtype: float
+        """
+        close_series = self.load_close_series(symbol, date)
+        idx = close_series.index.searchsorted(date, side="right")
+        if idx == 0:
+            return None
+        return float(close_series.iloc[idx - 1])
+
+    def load_close_dict(self, symbols: list, date: dt.date) -> dict:
+        """
+        symbols의 date 기준 종가 딕셔너리를 반환하는 메서드
+
+        :param list symbols: stock의 symbol들 입니다.
+        :param datetime.date date: 현재 날짜 입니다.
+        :return: {symbol : 종가}, 데이터가 없는 symbol은 제외
+        :rtype: dict
+        """
+        close_dict = dict()
+        for symbol in symbols:
+            try:
+                _close = self.load_close(symbol, date)
+            except Exception:
+                continue
+            if _close is not None:
+                close_dict[symbol] = _close
+        return close_dict
@@ -0,0 +1,1150 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import datetime as dt
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .data_provider import DATA_PROVIDER, load_default_provider
+from .concurrent_loader import CONCURRENT_FETCHER
+
+# 분기 공시 시즌 ((시작 월, 일), (마감 월, 일), (공시 대상 YEARMONTH의 연도 offset, 월))
+# 사업보고서 : 1/1 ~ 3/31, 1분기 : 4/1 ~ 5/15, 반기 : 7/1 ~ 8/14, 3분기 : 10/1 ~ 11/14
+DISCLOSURE_SEASONS = [
+    ((1, 1), (3, 31), (-1, 12)),
+    ((4, 1), (5, 15), (0, 3)),
+    ((7, 1), (8, 14), (0, 6)),
+    ((10, 1), (11, 14), (0, 9)),
+]
+
+
+def is_disclosure_updated(fetched_at: dt.date, date: dt.date) -> bool:
+    """
+    fetched_at 이후 date까지 새로운 분기 공시가 나왔을 수 있는지 확인하는 함수
+
+    :param datetime.date fetched_at: 데이터를 호출한 날짜
+    :param datetime.date date: 현재 날짜
+    :return: (fetched_at, date] 구간이 공시 시즌과 겹치는지 여부
+    :rtype: bool
+    """
+    if date <= fetched_at:
+        return False
+    for year in range(fetched_at.year, date.year + 1):
+        for (start_m, start_d), (end_m, end_d), _ in DISCLOSURE_SEASONS:
+            season_start = dt.date(year, start_m, start_d)
+            season_end = dt.date(year, end_m, end_d)
+            if season_start <= date and fetched_at < season_end:
+                return True
+    return False
+
+
+def get_disclosure_yearmonth(date: dt.date) -> int:
+    """
+    date 기준 가장 최근에 시작한 공시 시즌의 공시 대상 YEARMONTH를 반환하는 함수
+
+    :param datetime.date date: 현재 날짜
+    :return: 공시 대상 YEARMONTH (ex. 202306)
+    :rtype: int
+    """
+    for (start_m, start_d), _, (year_offset, month) in reversed(DISCLOSURE_SEASONS):
+        if dt.date(date.year, start_m, start_d) <= date:
+            return (date.year + year_offset) * 100 + month
+    return (date.year - 1) * 100 + 9
+
+
+def get_available_dates(yearmonths) -> np.ndarray:
+    """
+    공시 YEARMONTH별로 공시 데이터를 사용할 수 있는 첫 날짜를 반환하는 함수
+    실제 공시일은 알 수 없으므로 공시 시즌 마감일 다음날부터 사용할 수 있는 것으로 봅니다. (ex. 202303 -> 2023-05-16)
+    분기 말이 아닌 YEARMONTH는 그 달이 속한 분기로 계산합니다.
+
+    :param yearmonths: 공시 YEARMONTH 배열 (int 또는 숫자 문자열)
+    :return: YEARMONTH와 같은 순서의 datetime64[D] 배열
+    :rtype: np.ndarray
+    """
+    years, months = np.divmod(np.asarray(yearmonths).astype(np.int64), 100)
+    quarter_months = (months + 2) // 3 * 3
+
+    available_dates = np.full(len(years), np.datetime64("NaT"), dtype="datetime64[D]")
+    for _, (end_m, end_d), (year_offset, month) in DISCLOSURE_SEASONS:
+        mask = quarter_months == month
+        season_years = (years[mask] - year_offset - 1970).astype("datetime64[Y]")
+        available_dates[mask] = (
+            season_years.astype("datetime64[M]") + (end_m - 1)
+        ).astype("datetime64[D]") + end_d
+    return available_dates
+
+
+class ACCOUNT_HISTORY_CACHE:
+    """
+    ACCOUNT_HISTORY_CACHE : (symbol, account_code, YEARMONTH) 단위로 분기 공시 데이터를 저장하는 sqlite cache 클래스
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        CFG: dict = {
+            "max_keys": 50_000,
+            "refresh_days": 1,
+            "flush_n": 1_000,
+        },
+        provider: DATA_PROVIDER = None,
+    ) -> None:
+        """
+        ACCOUNT_HISTORY_CACHE의 생성자
+
+        :param str path: sqlite 파일 경로, None이면 provider.cache_dir/account_history.sqlite
+        :param dict CFG: 최대 (symbol, account_code) 수(max_keys) / 공시 시즌 재호출 주기(refresh_days)
+            / LAST_ACCESS를 모아서 반영할 개수(flush_n)
+        :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+        """
+        self.provider = provider or load_default_provider()
+        self.path = path or os.path.join(
+            self.provider.cache_dir, "account_history.sqlite"
+        )
+        self.CFG = CFG
+        self.lock = threading.Lock()
+        self.access_dict = dict()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.create_tables(self.connection)
+
+    @staticmethod
+    def create_tables(connection: sqlite3.Connection) -> None:
+        """
+        cache table을 생성하는 메서드
+
+        :param sqlite3.Connection connection: sqlite connection
+        """
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS ACCOUNT_HISTORY (
+                SYMBOL TEXT,
+                ACCOUNT_CODE TEXT,
+                YEARMONTH,
+                VALUE,
+                PRIMARY KEY (SYMBOL, ACCOUNT_CODE, YEARMONTH)
+            );
+            CREATE TABLE IF NOT EXISTS ACCOUNT_KEY (
+                SYMBOL TEXT,
+                ACCOUNT_CODE TEXT,
+                FETCHED_AT TEXT,
+                MAX_YEARMONTH INTEGER,
+                LAST_ACCESS REAL,
+                PRIMARY KEY (SYMBOL, ACCOUNT_CODE)
+            );
+            """
+        )
+        connection.commit()
+
+    def is_fresh(self, fetched_at: str, max_yearmonth: int, date: dt.date) -> bool:
+        """
+        cache된 데이터를 그대로 사용해도 되는지 확인하는 메서드
+        refresh_days 이내에 호출했거나, 호출 이후 공시 시즌이 없었거나,
+        이미 공시 대상 분기의 데이터를 가지고 있다면 fresh 입니다.
+
+        :param str fetched_at: 데이터를 호출한 날짜 (isoformat)
+        :param int max_yearmonth: cache된 데이터의 가장 최근 YEARMONTH
+        :param datetime.date date: 현재 날짜
+        :return: fresh 여부
+        :rtype: bool
+        """
+        fetched_at = dt.date.fromisoformat(fetched_at)
+        if (date - fetched_at).days < self.CFG["refresh_days"]:
+            return True
+        if not is_disclosure_updated(fetched_at, date):
+            return True
+        return max_yearmonth >= get_disclosure_yearmonth(date)
+
+    def get(self, symbol: str, account_code: str, date: dt.date) -> pd.DataFrame:
+        """
+        cache된 공시 데이터를 반환하는 메서드
+
+        :param str symbol: stock의 symbol 입니다.
+        :param str account_code: 계정 코드
+        :param datetime.date date: 현재 날짜
+        :return: [YEARMONTH, VALUE] 데이터프레임, cache가 없거나 오래되었다면 None
+        :rtype: pd.DataFrame
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT FETCHED_AT, MAX_YEARMONTH FROM ACCOUNT_KEY WHERE SYMBOL = ? AND ACCOUNT_CODE = ?",
+                (symbol, account_code),
+            ).fetchone()
+            if row is None or not self.is_fresh(row[0], row[1], date):
+                return None
+
+            rows = self.connection.execute(
+                "SELECT YEARMONTH, VALUE FROM ACCOUNT_HISTORY WHERE SYMBOL = ? AND ACCOUNT_CODE = ?",
+                (symbol, account_code),
+            ).fetchall()
+            self.access_dict[(symbol, account_code)] = time.time()
+            if len(self.access_dict) >= self.CFG.get("flush_n", 1_000):
+                self.flush_access()
+                self.connection.commit()
+        account_df = pd.DataFrame(rows, columns=["YEARMONTH", "VALUE"])
+        return account_df
+
+    def put(
+        self,
+        symbol: str,
+        account_code: str,
+        account_df: pd.DataFrame,
+        date: dt.date,
+    ) -> None:
+        """
+        공시 데이터를 cache에 저장하는 메서드
+        빈 데이터도 저장하여 공시가 없는 symbol을 매일 재호출하지 않습니다.
+
+        :param str symbol: stock의 symbol 입니다.
+        :param str account_code: 계정 코드
+        :param pd.DataFrame account_df: [YEARMONTH, VALUE]를 가진 데이터프레임
+        :param datetime.date date: 현재 날짜
+        """
+        rows = [
+            (symbol, account_code, yearmonth, value)
+            for yearmonth, value in zip(
+                account_df["YEARMONTH"].tolist(), account_df["VALUE"].tolist()
+            )
+        ]
+        max_yearmonth = max([int(row[2]) for row in rows], default=0)
+        with self.lock:
+            self.connection.execute(
+                "DELETE FROM ACCOUNT_HISTORY WHERE SYMBOL = ? AND ACCOUNT_CODE = ?",
+                (symbol, account_code),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO ACCOUNT_HISTORY VALUES (?, ?, ?, ?)", rows
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO ACCOUNT_KEY VALUES (?, ?, ?, ?, ?)",
+                (symbol, account_code, date.isoformat(), max_yearmonth, time.time()),
+            )
+            self.flush_access()
+            self.evict()
+            self.connection.commit()
+
+    def flush_access(self) -> None:
+        """
+        get에서 모아둔 LAST_ACCESS를 한번에 반영하는 메서드
+        읽기마다 commit하지 않도록 lock 안에서 put / evict 직전에 호출합니다.
+        """
+        if not self.access_dict:
+            return
+        self.connection.executemany(
+            "UPDATE ACCOUNT_KEY SET LAST_ACCESS = ? WHERE SYMBOL = ? AND ACCOUNT_CODE = ?",
+            [
+                (last_access, symbol, account_code)
+                for (symbol, account_code), last_access in self.access_dict.items()
+            ],
+        )
+        self.access_dict = dict()
+
+    def evict(self) -> None:
+        """
+        (symbol, account_code) 수가 max_keys를 넘으면 가장 오래 사용하지 않은 key부터 제거하는 메서드 (LRU)
+        """
+        connection = self.connection
+        key_n = connection.execute("SELECT COUNT(*) FROM ACCOUNT_KEY").fetchone()[0]
+        overflow_n = key_n - self.CFG["max_keys"]
+        if overflow_n <= 0:
+            return
+
+        evict_keys = connection.execute(
+            "SELECT SYMBOL, ACCOUNT_CODE FROM ACCOUNT_KEY ORDER BY LAST_ACCESS LIMIT ?",
+            (overflow_n,),
+        ).fetchall()
+        connection.executemany(
+            "DELETE FROM ACCOUNT_HISTORY WHERE SYMBOL = ? AND ACCOUNT_CODE = ?",
+            evict_keys,
+        )
+        connection.executemany(
+            "DELETE FROM ACCOUNT_KEY WHERE SYMBOL = ? AND ACCOUNT_CODE = ?",
+            evict_keys,
+        )
+
+    def load_account_history(
+        self, symbol: str, account_code: str, date: dt.date
+    ) -> pd.DataFrame:
+        """
+        cache를 거쳐 분기 공시 데이터를 읽어오는 메서드 (read-through)
+
+        :param str symbol: stock의 symbol 입니다.
+        :param str account_code: 계정 코드
+        :param datetime.date date: 현재 날짜
+        :return: [YEARMONTH, VALUE] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        account_df = self.get(symbol, account_code, date)
+        if account_df is not None:
+            return account_df
+
+        account_df = self.provider.account_history(
+            symbol=symbol, account_code=account_code, period="q"
+        )
+        account_df = account_df.loc[:, ["YEARMONTH", "VALUE"]]
+        self.put(symbol, account_code, account_df, date)
+        return account_df
+
+
+def load_account_history_cache(provider: DATA_PROVIDER = None) -> ACCOUNT_HISTORY_CACHE:
+    """
+    provider별로 하나의 ACCOUNT_HISTORY_CACHE를 공유하여 반환하는 함수
+
+    :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+    :return: ACCOUNT_HISTORY_CACHE
+    :rtype: ACCOUNT_HISTORY_CACHE
+    """
+    return _load_account_history_cache(provider or load_default_provider())
+
+
+@lru_cache(maxsize=None)
+def _load_account_history_cache(provider: DATA_PROVIDER) -> ACCOUNT_HISTORY_CACHE:
+    return ACCOUNT_HISTORY_CACHE(provider=provider)
+
+
+class DAILY_PRICE_STORE:
+    """
+    DAILY_PRICE_STORE : symbol별 일별 주가를 누적 저장하고, 마지막 저장일 이후의 데이터만 호출하는 sqlite store 클래스
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        CFG: dict = {
+            "window_days": 7,
+        },
+        provider: DATA_PROVIDER = None,
+    ) -> None:
+        """
+        DAILY_PRICE_STORE의 생성자
+
+        :param str path: sqlite 파일 경로, None이면 provider.cache_dir/daily_stock.sqlite
+        :param dict CFG: 처음 호출하는 symbol의 호출 기간(window_days)
+        :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+
+        :attr dict recent_index: {symbol : [FETCHED_TO, DATE, CLOSE, MARKETCAP]} 최근 주가 index 입니다.
+        :attr dict range_dict: {symbol : [(START, END)]} 호출한 날짜 구간 (겹치거나 이어진 구간은 합칩니다.) 입니다.
+        """
+        self.provider = provider or load_default_provider()
+        self.path = path or os.path.join(self.provider.cache_dir, "daily_stock.sqlite")
+        self.CFG = CFG
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.create_tables(self.connection)
+        self.recent_index = self.load_recent_index(self.connection)
+        self.range_dict = self.load_range_dict(self.connection)
+
+    @staticmethod
+    def create_tables(connection: sqlite3.Connection) -> None:
+        """
+        store table을 생성하는 메서드
+
+        :param sqlite3.Connection connection: sqlite connection
+        """
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS DAILY_STOCK (
+                SYMBOL TEXT,
+                DATE TEXT,
+                CLOSE REAL,
+                MARKETCAP REAL,
+                PRIMARY KEY (SYMBOL, DATE)
+            );
+            CREATE TABLE IF NOT EXISTS PRICE_KEY (
+                SYMBOL TEXT PRIMARY KEY,
+                FETCHED_TO TEXT
+            );
+            CREATE TABLE IF NOT EXISTS PRICE_RANGE (
+                SYMBOL TEXT,
+                START TEXT,
+                END TEXT,
+                PRIMARY KEY (SYMBOL, START)
+            );
+            """
+        )
+        connection.commit()
+
+    @staticmethod
+    def load_recent_index(connection: sqlite3.Connection) -> dict:
+        """
+        저장된 데이터에서 symbol별 최근 주가 index를 만드는 메서드
+
+        :param sqlite3.Connection connection: sqlite connection
+        :return: {symbol : [FETCHED_TO, DATE, CLOSE, MARKETCAP]}
+        :rtype: dict
+        """
+        rows = connection.execute(
+            """
+            SELECT PRICE_KEY.SYMBOL, FETCHED_TO, MAX(DATE), CLOSE, MARKETCAP
+            FROM PRICE_KEY LEFT JOIN DAILY_STOCK ON PRICE_KEY.SYMBOL = DAILY_STOCK.SYMBOL
+            GROUP BY PRICE_KEY.SYMBOL
+            """
+        ).fetchall()
+        recent_index = {row[0]: list(row[1:]) for row in rows}
+        return recent_index
+
+    @staticmethod
+    def load_range_dict(connection: sqlite3.Connection) -> dict:
+        """
+        저장된 호출 구간으로 symbol별 구간 list를 만드는 메서드
+
+        :param sqlite3.Connection connection: sqlite connection
+        :return: {symbol : [(START, END)]} START 순으로 정렬된 구간
+        :rtype: dict
+        """
+        rows = connection.execute(
+            "SELECT SYMBOL, START, END FROM PRICE_RANGE ORDER BY SYMBOL, START"
+        ).fetchall()
+        range_dict = dict()
+        for symbol, start, end in rows:
+            range_dict.setdefault(symbol, list()).append((start, end))
+        return range_dict
+
+    @staticmethod
+    def merge_ranges(ranges: list, start_date: dt.date, end_date: dt.date) -> list:
+        """
+        구간 list에 [start_date, end_date]를 추가하고 겹치거나 이어진 구간을 합치는 메서드
+
+        :param list ranges: [(START, END)] isoformat 구간
+        :param datetime.date start_date: 추가할 구간의 시작 날짜
+        :param datetime.date end_date: 추가할 구간의 종료 날짜
+        :return: [(START, END)] START 순으로 정렬되고 합쳐진 구간
+        :rtype: list
+        """
+        merged = list()
+        new_range = (start_date.isoformat(), end_date.isoformat())
+        for start, end in sorted(ranges + [new_range]):
+            if merged:
+                last_start, last_end = merged[-1]
+                next_day = dt.date.fromisoformat(last_end) + dt.timedelta(days=1)
+                if start <= next_day.isoformat():
+                    merged[-1] = (last_start, max(last_end, end))
+                    continue
+            merged.append((start, end))
+        return merged
+
+    def add_range(self, symbol: str, start_date: dt.date, end_date: dt.date) -> None:
+        """
+        호출한 구간을 기록하는 메서드 (lock 안에서 호출하고, commit은 호출한 쪽에서 합니다.)
+
+        :param str symbol: stock의 symbol 입니다.
+        :param datetime.date start_date: 호출 시작 날짜
+        :param datetime.date end_date: 호출 종료 날짜
+        """
+        ranges = self.merge_ranges(
+            self.range_dict.get(symbol, list()), start_date, end_date
+        )
+        self.connection.execute("DELETE FROM PRICE_RANGE WHERE SYMBOL = ?", (symbol,))
+        self.connection.executemany(
+            "INSERT INTO PRICE_RANGE VALUES (?, ?, ?)",
+            [(symbol, start, end) for start, end in ranges],
+        )
+        self.range_dict[symbol] = ranges
+
+    def is_covered(self, symbol: str, start_date: dt.date, end_date: dt.date) -> bool:
+        """
+        [start_date, end_date] 전체를 이미 호출했는지 확인하는 메서드
+
+        :param str symbol: stock의 symbol 입니다.
+        :param datetime.date start_date: 시작 날짜
+        :param datetime.date end_date: 종료 날짜
+        :return: 호출한 구간 하나가 [start_date, end_date]를 모두 포함하는지 여부
+        :rtype: bool
+        """
+        start, end = start_date.isoformat(), end_date.isoformat()
+        return any(
+            _start <= start and end <= _end
+            for _start, _end in self.range_dict.get(symbol, list())
+        )
+
+    @staticmethod
+    def format_rows(symbol: str, daily_stock_df: pd.DataFrame) -> list:
+        """
+        daily_stock 데이터프레임을 sqlite row로 변환하는 메서드
+
+        :param str symbol: stock의 symbol 입니다.
+        :param pd.DataFrame daily_stock_df: [DATE, CLOSE, MARKETCAP]를 가진 데이터프레임
+        :return: [(SYMBOL, DATE, CLOSE, MARKETCAP)] DATE 순으로 정렬된 list
+        :rtype: list
+        """
+        dates = pd.to_datetime(daily_stock_df["DATE"]).dt.strftime("%Y-%m-%d")
+        rows = sorted(
+            zip(
+                [symbol] * len(daily_stock_df),
+                dates.tolist(),
+                daily_stock_df["CLOSE"].astype(float).tolist(),
+                daily_stock_df["MARKETCAP"].astype(float).tolist(),
+            ),
+            key=lambda row: row[1],
+        )
+        return rows
+
+    def append(self, symbol: str, start_date: dt.date, date: dt.date) -> None:
+        """
+        [start_date, date] 구간의 주가를 호출하여 저장하는 메서드
+
+        :param str symbol: stock의 symbol 입니다.
+        :param datetime.date start_date: 호출 시작 날짜
+        :param datetime.date date: 현재 날짜
+        """
+        daily_stock_df = self.provider.daily_stock(
+            symbol, start_date=start_date, end_date=date
+        )
+        rows = self.format_rows(symbol, daily_stock_df)
+
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO DAILY_STOCK VALUES (?, ?, ?, ?)", rows
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO PRICE_KEY VALUES (?, ?)",
+                (symbol, date.isoformat()),
+            )
+            self.add_range(symbol, start_date, date)
+            self.connection.commit()
+
+            recent = self.recent_index.get(symbol, [None, None, None, None])
+            recent[0] = date.isoformat()
+            if rows and (recent[1] is None or rows[-1][1] >= recent[1]):
+                recent[1:] = rows[-1][1:]
+            self.recent_index[symbol] = recent
+
+    def update(self, symbol: str, date: dt.date) -> None:
+        """
+        마지막 저장일 이후 date까지의 주가만 호출하여 저장하는 메서드
+
+        :param str symbol: stock의 symbol 입니다.
+        :param datetime.date date: 현재 날짜
+        """
+        recent = self.recent_index.get(symbol)
+        if recent is None:
+            start_date = date - dt.timedelta(days=self.CFG["window_days"])
+        elif recent[0] >= date.isoformat():
+            return
+        else:
+            start_date = dt.date.fromisoformat(recent[0]) + dt.timedelta(days=1)
+        self.append(symbol, start_date, date)
+
+    def load_past(self, symbol: str, date: dt.date) -> list:
+        """
+        마지막 저장일보다 과거인 date 기준의 최근 주가를 읽어오는 메서드 (backtest)
+        [date - window_days, date] 구간을 모두 호출한 적이 없다면 구간을 호출하여 저장한 뒤 읽습니다.
+        (다른 날짜에 호출한 row만으로는 그 사이 거래일이 빠져 있을 수 있습니다.)
+
+        :param str symbol: stock의 symbol 입니다.
+        :param datetime.date date: 현재 날짜
+        :return: [DATE, CLOSE, MARKETCAP], 구간에 데이터가 없다면 [None, None, None]
+        :rtype: list
+        """
+        start_date = date - dt.timedelta(days=self.CFG["window_days"])
+        with self.lock:
+            is_covered = self.is_covered(symbol, start_date, date)
+        if not is_covered:
+            daily_stock_df = self.provider.daily_stock(
+                symbol, start_date=start_date, end_date=date
+            )
+            rows = self.format_rows(symbol, daily_stock_df)
+            with self.lock:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO DAILY_STOCK VALUES (?, ?, ?, ?)", rows
+                )
+                self.add_range(symbol, start_date, date)
+                self.connection.commit()
+
+        query = """
+            SELECT DATE, CLOSE, MARKETCAP FROM DAILY_STOCK
+            WHERE SYMBOL = ? AND DATE BETWEEN ? AND ?
+            ORDER BY DATE DESC LIMIT 1
+        """
+        params = (symbol, start_date.isoformat(), date.isoformat())
+        with self.lock:
+            row = self.connection.execute(query, params).fetchone()
+        return list(row) if row is not None else [None, None, None]
+
+    def load_recent(self, symbol: str, date: dt.date) -> dict:
+        """
+        date 기준 가장 최근 종가 / 시가총액을 반환하는 메서드
+        [date - window_days, date] 구간에 저장된 데이터가 없다면 (거래정지 / 상장폐지) IndexError를 발생시킵니다.
+
+        :param str symbol: stock의 symbol 입니다.
+        :param datetime.date date: 현재 날짜
+        :return: {DATE, CLOSE, MARKETCAP}
+        :rtype: dict
+        """
+        recent = self.recent_index.get(symbol)
+        if recent is not None and recent[0] > date.isoformat():
+            _date, _close, _marketcap = self.load_past(symbol, date)
+        else:
+            self.update(symbol, date)
+            _, _date, _close, _marketcap = self.recent_index[symbol]
+        start_date = date - dt.timedelta(days=self.CFG["window_days"])
+        if _date is None or _date < start_date.isoformat():
+            raise IndexError(f"no daily_stock : {symbol}")
+        return {"DATE": _date, "CLOSE": _close, "MARKETCAP": _marketcap}
+
+
+def load_daily_price_store(provider: DATA_PROVIDER = None) -> DAILY_PRICE_STORE:
+    """
+    provider별로 하나의 DAILY_PRICE_STORE를 공유하여 반환하는 함수
+
+    :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+    :return: DAILY_PRICE_STORE
+    :rtype: DAILY_PRICE_STORE
+    """
+    return _load_daily_price_store(provider or load_default_provider())
+
+
+@lru_cache(maxsize=None)
+def _load_daily_price_store(provider: DATA_PROVIDER) -> DAILY_PRICE_STORE:
+    return DAILY_PRICE_STORE(provider=provider)
+
+
+class SYMBOL_STOCK_CACHE:
+    """
+    SYMBOL_STOCK_CACHE : 한국거래소 종목 목록을 TTL 동안 메모리 / parquet 파일로 재사용하는 cache 클래스
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        CFG: dict = {
+            "ttl": 24 * 60 * 60,
+        },
+        provider: DATA_PROVIDER = None,
+    ) -> None:
+        """
+        SYMBOL_STOCK_CACHE의 생성자
+
+        :param str path: parquet 파일 경로, None이면 provider.cache_dir/symbol_stock.parquet
+        :param dict CFG: 재사용 기간 (초, ttl), 날짜가 바뀌면 ttl 안이어도 다시 호출합니다.
+        :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+
+        :attr pd.DataFrame symbols_df: 메모리에 가진 종목 목록 입니다. (수정하지 않고 사용합니다.)
+        """
+        self.provider = provider or load_default_provider()
+        self.path = path or os.path.join(
+            self.provider.cache_dir, "symbol_stock.parquet"
+        )
+        self.CFG = CFG
+        self.lock = threading.Lock()
+        self.symbols_df = None
+        self.fetched_at = None
+
+    def is_fresh(self, fetched_at: float, now: float) -> bool:
+        """
+        fetched_at에 호출한 종목 목록을 now에 재사용할 수 있는지 확인하는 메서드
+
+        :param float fetched_at: 호출 시각 (timestamp)
+        :param float now: 현재 시각 (timestamp)
+        :return: ttl 안이면서 같은 날짜인지 여부
+        :rtype: bool
+        """
+        if now - fetched_at >= self.CFG["ttl"]:
+            return False
+        return dt.date.fromtimestamp(fetched_at) == dt.date.fromtimestamp(now)
+
+    def load_file(self, now: float) -> bool:
+        """
+        parquet 파일이 재사용 가능하다면 메모리로 읽는 메서드
+
+        :param float now: 현재 시각 (timestamp)
+        :return: 읽었는지 여부
+        :rtype: bool
+        """
+        if not os.path.exists(self.path):
+            return False
+        fetched_at = os.path.getmtime(self.path)
+        if not self.is_fresh(fetched_at, now):
+            return False
+        self.symbols_df = pd.read_parquet(self.path)
+        self.fetched_at = fetched_at
+        return True
+
+    def save_file(self, symbols_df: pd.DataFrame) -> None:
+        """
+        종목 목록을 parquet 파일로 저장하는 메서드 (임시 파일에 쓴 뒤 교체합니다.)
+
+        :param pd.DataFrame symbols_df: 종목 목록 데이터프레임
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        symbols_df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+
+    def get(self) -> pd.DataFrame:
+        """
+        종목 목록을 반환하는 메서드
+        메모리 -> parquet 파일 -> provider 순서로 재사용 가능한 데이터를 찾습니다.
+
+        :return: 한국거래소 종목 목록 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        with self.lock:
+            now = time.time()
+            if self.symbols_df is not None and self.is_fresh(self.fetched_at, now):
+                return self.symbols_df
+            if self.load_file(now):
+                return self.symbols_df
+
+            symbols_df = self.provider.symbol_stock().reset_index(drop=True)
+            self.save_file(symbols_df)
+            self.symbols_df = symbols_df
+            self.fetched_at = now
+            return self.symbols_df
+
+
+def load_symbol_stock_cache(provider: DATA_PROVIDER = None) -> SYMBOL_STOCK_CACHE:
+    """
+    provider별로 하나의 SYMBOL_STOCK_CACHE를 공유하여 반환하는 함수
+
+    :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+    :return: SYMBOL_STOCK_CACHE
+    :rtype: SYMBOL_STOCK_CACHE
+    """
+    return _load_symbol_stock_cache(provider or load_default_provider())
+
+
+@lru_cache(maxsize=None)
+def _load_symbol_stock_cache(provider: DATA_PROVIDER) -> SYMBOL_STOCK_CACHE:
+    return SYMBOL_STOCK_CACHE(provider=provider)
+
+
+class SECTOR_INDEX:
+    """
+    SECTOR_INDEX : symbol -> sector mapping을 정수 sector code / sector별 symbol 수 / offset 배열로 미리 만들어
+    memory-map으로 읽는 index 클래스
+
+    sector_order(symbol 위치)는 sector code 순, 같은 sector 안에서는 symbol 순으로 정렬되어 있어
+    sector c의 symbol은 sector_order[offsets[c] : offsets[c + 1]] 입니다.
+    """
+
+    FILE_NAMES = [
+        "symbols",
+        "sectors",
+        "sector_codes",
+        "sector_order",
+        "counts",
+        "offsets",
+    ]
+    META_NAME = "meta.json"
+
+    def __init__(self, path: str) -> None:
+        """
+        SECTOR_INDEX의 생성자 (build로 만든 .npy 파일들을 memory-map으로 읽습니다.)
+
+        :param str path: index 경로 (.npy 파일들이 있는 directory)
+
+        :attr np.ndarray symbols: 정렬된 symbol 배열 입니다.
+        :attr np.ndarray sectors: 정렬된 sector 배열 입니다. (sector code = 위치)
+        :attr np.ndarray sector_codes: symbols와 같은 순서의 sector code 입니다.
+        :attr np.ndarray sector_order: sector 순으로 정렬된 symbol 위치 입니다.
+        :attr np.ndarray counts: sector별 symbol 수 입니다.
+        :attr np.ndarray offsets: sector별 sector_order 시작 위치 입니다. (길이 sector 수 + 1)
+        """
+        self.path = path
+        for file_name in self.FILE_NAMES:
+            array = np.load(os.path.join(path, f"{file_name}.npy"), mmap_mode="r")
+            setattr(self, file_name, array)
+
+    @staticmethod
+    def build(symbol_sector_dict: dict, path: str) -> None:
+        """
+        symbol:sector_code 딕셔너리로 index 파일들을 만드는 메서드 (임시 directory에 쓴 뒤 교체합니다.)
+
+        :param dict symbol_sector_dict: symbol-sector_code 딕셔너리 (sector가 없는 symbol은 제외합니다.)
+        :param str path: index 경로
+        """
+        symbol_sector_dict = SECTOR_INDEX.filter_mapping(symbol_sector_dict)
+        symbols = np.array(sorted(symbol_sector_dict), dtype=str)
+        sectors, sector_codes = np.unique(
+            np.array([symbol_sector_dict[symbol] for symbol in symbols.tolist()]),
+            return_inverse=True,
+        )
+        sector_codes = sector_codes.astype(np.int32)
+        sector_order = np.argsort(sector_codes, kind="stable").astype(np.int32)
+        counts = np.bincount(sector_codes, minlength=len(sectors)).astype(np.int32)
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(tmp_path, exist_ok=True)
+        arrays = [symbols, sectors, sector_codes, sector_order, counts, offsets]
+        for file_name, array in zip(SECTOR_INDEX.FILE_NAMES, arrays):
+            np.save(os.path.join(tmp_path, f"{file_name}.npy"), array)
+        meta = {"mapping_hash": SECTOR_INDEX.get_mapping_hash(symbol_sector_dict)}
+        with open(os.path.join(tmp_path, SECTOR_INDEX.META_NAME), "w") as f:
+            json.dump(meta, f)
+        if os.path.isdir(path):
+            for file_name in os.listdir(path):
+                os.remove(os.path.join(path, file_name))
+            os.rmdir(path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def filter_mapping(symbol_sector_dict: dict) -> dict:
+        """
+        sector가 없는 (None / nan) symbol을 제외하는 메서드
+
+        :param dict symbol_sector_dict: symbol-sector_code 딕셔너리
+        :return: sector가 있는 symbol-sector_code 딕셔너리
+        :rtype: dict
+        """
+        return {
+            symbol: sector
+            for symbol, sector in symbol_sector_dict.items()
+            if sector is not None and sector == sector
+        }
+
+    @staticmethod
+    def get_mapping_hash(symbol_sector_dict: dict) -> str:
+        """
+        symbol:sector_code 딕셔너리의 hash를 구하는 메서드 (index가 만들어진 mapping인지 확인하는 용도)
+
+        :param dict symbol_sector_dict: symbol-sector_code 딕셔너리
+        :return: symbol 순으로 정렬한 (symbol, sector) 쌍의 sha1 hex
+        :rtype: str
+        """
+        items = sorted(
+            (str(symbol), str(sector))
+            for symbol, sector in SECTOR_INDEX.filter_mapping(
+                symbol_sector_dict
+            ).items()
+        )
+        return hashlib.sha1(json.dumps(items).encode()).hexdigest()
+
+    @staticmethod
+    def is_fresh(path: str, mapping_hash: str) -> bool:
+        """
+        path의 index가 mapping_hash의 mapping으로 만들어졌는지 확인하는 메서드
+
+        :param str path: index 경로
+        :param str mapping_hash: 현재 mapping의 hash
+        :return: index를 다시 만들 필요가 없는지 여부
+        :rtype: bool
+        """
+        meta_path = os.path.join(path, SECTOR_INDEX.META_NAME)
+        if not os.path.isfile(meta_path):
+            return False
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return meta.get("mapping_hash") == mapping_hash
+
+    def get_positions(self, symbols: list) -> np.ndarray:
+        """
+        symbols의 index 위치를 찾는 메서드
+
+        :param list symbols: symbol들
+        :return: symbols와 같은 순서의 위치, index에 없다면 -1
+        :rtype: np.ndarray
+        """
+        query = np.asarray(symbols, dtype=str)
+        positions = np.searchsorted(self.symbols, query)
+        positions[positions == len(self.symbols)] = 0
+        found = len(self.symbols) > 0 and self.symbols[positions] == query
+        return np.where(found, positions, -1)
+
+    def get_member_mask(self, symbols: list) -> np.ndarray:
+        """
+        symbols에 속하는지를 index 위치별로 표시하는 메서드
+
+        :param list symbols: symbol들
+        :return: index 위치별 boolean mask
+        :rtype: np.ndarray
+        """
+        positions = self.get_positions(symbols)
+        member_mask = np.zeros(len(self.symbols), dtype=bool)
+        member_mask[positions[positions >= 0]] = True
+        return member_mask
+
+    def get_member_counts(self, member_mask: np.ndarray) -> np.ndarray:
+        """
+        sector별로 member_mask에 속하는 symbol 수를 세는 메서드
+
+        :param np.ndarray member_mask: index 위치별 boolean mask
+        :return: sector별 symbol 수
+        :rtype: np.ndarray
+        """
+        return np.bincount(self.sector_codes[member_mask], minlength=len(self.sectors))
+
+
+def load_sector_index(provider: DATA_PROVIDER = None) -> SECTOR_INDEX:
+    """
+    provider별로 하나의 SECTOR_INDEX를 공유하여 반환하는 함수
+    provider.cache_dir/sector_index가 없다면 provider.symbol_sector_dict()로 build 합니다.
+    (meta.json의 mapping hash가 현재 mapping과 다르다면 다시 build 합니다.)
+
+    :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+    :return: SECTOR_INDEX
+    :rtype: SECTOR_INDEX
+    """
+    return _load_sector_index(provider or load_default_provider())
+
+
+@lru_cache(maxsize=None)
+def _load_sector_index(provider: DATA_PROVIDER) -> SECTOR_INDEX:
+    path = os.path.join(provider.cache_dir, "sector_index")
+    symbol_sector_dict = provider.symbol_sector_dict()
+    mapping_hash = SECTOR_INDEX.get_mapping_hash(symbol_sector_dict)
+    if not SECTOR_INDEX.is_fresh(path, mapping_hash):
+        os.makedirs(provider.cache_dir, exist_ok=True)
+        SECTOR_INDEX.build(symbol_sector_dict, path)
+    return SECTOR_INDEX(path)
+
+
+class POINT_IN_TIME_PANEL:
+    """
+    POINT_IN_TIME_PANEL : 모든 symbol의 전체 분기 공시 이력을 (account_code, symbol, 사용 가능 날짜) 순으로 한번 정렬하여
+    memory-map으로 읽는 index 클래스
+
+    keys는 (account_code 위치 * symbol 수 + symbol 위치) * KEY_DAYS + 사용 가능 날짜(1970-01-01부터의 일수) 이므로,
+    date 기준 가장 최근 공시값은 searchsorted(keys, key * KEY_DAYS + date, side="right") - 1 위치의 값입니다.
+    """
+
+    FILE_NAMES = ["symbols", "account_codes", "keys", "yearmonths", "values"]
+    META_NAME = "meta.json"
+    KEY_DAYS = 1 << 20
+
+    def __init__(self, path: str) -> None:
+        """
+        POINT_IN_TIME_PANEL의 생성자 (build로 만든 .npy 파일들을 memory-map으로 읽습니다.)
+
+        :param str path: panel 경로 (.npy 파일들이 있는 directory)
+
+        :attr np.ndarray symbols: 정렬된 symbol 배열 입니다.
+        :attr np.ndarray account_codes: 정렬된 account_code 배열 입니다.
+        :attr np.ndarray keys: 정렬된 (account_code, symbol, 사용 가능 날짜) key 입니다.
+        :attr np.ndarray yearmonths: keys와 같은 순서의 공시 YEARMONTH 입니다.
+        :attr np.ndarray values: keys와 같은 순서의 공시값 입니다.
+        """
+        self.path = path
+        for file_name in self.FILE_NAMES:
+            array = np.load(os.path.join(path, f"{file_name}.npy"), mmap_mode="r")
+            setattr(self, file_name, array)
+
+    @staticmethod
+    def build(
+        account_history_df: pd.DataFrame,
+        path: str,
+        account_codes: list,
+        built_at: dt.date = None,
+    ) -> None:
+        """
+        전체 공시 이력으로 panel 파일들을 만드는 메서드 (임시 directory에 쓴 뒤 교체합니다.)
+        같은 날짜부터 사용 가능한 공시가 여러개라면 YEARMONTH가 큰 값이 as-of 값이 되도록 정렬합니다.
+        요청한 account_codes와 build 날짜는 meta.json에 기록하여 is_fresh에서 확인합니다.
+
+        :param pd.DataFrame account_history_df: [SYMBOL, ACCOUNT_CODE, YEARMONTH, VALUE] 데이터프레임
+        :param str path: panel 경로
+        :param list account_codes: 공시 이력을 호출한 account_code들 (공시가 없는 account_code도 포함합니다.)
+        :param datetime.date built_at: build 날짜, None이면 오늘 날짜를 사용합니다.
+        """
+        meta = {
+            "account_codes": sorted(set(map(str, account_codes))),
+            "built_at": (built_at or dt.date.today()).isoformat(),
+        }
+        account_history_df = account_history_df.dropna(subset=["YEARMONTH"])
+        symbols, symbol_positions = np.unique(
+            account_history_df["SYMBOL"].to_numpy().astype(str), return_inverse=True
+        )
+        account_codes, account_positions = np.unique(
+            account_history_df["ACCOUNT_CODE"].to_numpy().astype(str),
+            return_inverse=True,
+        )
+        yearmonths = account_history_df["YEARMONTH"].to_numpy().astype(np.int64)
+        values = account_history_df["VALUE"].to_numpy().astype(np.float64)
+
+        days = get_available_dates(yearmonths).astype(np.int64)
+        keys = (
+            account_positions.astype(np.int64) * len(symbols) + symbol_positions
+        ) * POINT_IN_TIME_PANEL.KEY_DAYS + days
+        order = np.lexsort((yearmonths, keys))
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(tmp_path, exist_ok=True)
+        arrays = [symbols, account_codes, keys[order], yearmonths[order], values[order]]
+        for file_name, array in zip(POINT_IN_TIME_PANEL.FILE_NAMES, arrays):
+            np.save(os.path.join(tmp_path, f"{file_name}.npy"), array)
+        with open(os.path.join(tmp_path, POINT_IN_TIME_PANEL.META_NAME), "w") as f:
+            json.dump(meta, f)
+        # 다른 cache_dir의 panel을 link한 경우 link만 지웁니다.
+        if os.path.islink(path):
+            os.remove(path)
+        elif os.path.isdir(path):
+            for file_name in os.listdir(path):
+                os.remove(os.path.join(path, file_name))
+            os.rmdir(path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def is_fresh(path: str, account_codes: list, date: dt.date) -> bool:
+        """
+        path의 panel을 그대로 써도 되는지 확인하는 메서드
+        meta.json이 없거나, 요청한 account_code가 panel에 없거나, build 이후 공시 시즌이 지났다면 False 입니다.
+
+        :param str path: panel 경로
+        :param list account_codes: 요청한 account_code들
+        :param datetime.date date: 현재 날짜
+        :return: panel을 다시 만들 필요가 없는지 여부
+        :rtype: bool
+        """
+        meta_path = os.path.join(path, POINT_IN_TIME_PANEL.META_NAME)
+        if not os.path.isfile(meta_path):
+            return False
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if not set(map(str, account_codes)) <= set(meta["account_codes"]):
+            return False
+        built_at = dt.date.fromisoformat(meta["built_at"])
+        return not is_disclosure_updated(built_at, date)
+
+    @staticmethod
+    def get_positions(array: np.ndarray, query: list) -> np.ndarray:
+        """
+        정렬된 array에서 query의 위치를 찾는 메서드
+
+        :param np.ndarray array: 정렬된 배열
+        :param list query: 찾을 값들
+        :return: query와 같은 순서의 위치, array에 없다면 -1
+        :rtype: np.ndarray
+        """
+        query = np.asarray(query, dtype=str)
+        positions = np.searchsorted(array, query)
+        positions[positions == len(array)] = 0
+        found = len(array) > 0 and array[positions] == query
+        return np.where(found, positions, -1)
+
+    def as_of(
+        self, symbols: list, account_codes: list, date: dt.date
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        date 기준 사용 가능한 가장 최근 공시값을 (account_code, symbol) 전체에 대해 한번의 searchsorted로 찾는 메서드
+
+        :param list symbols: symbol들
+        :param list account_codes: account_code들
+        :param datetime.date date: 현재 날짜
+        :return: (YEARMONTH, VALUE) 배열, shape (account_code 수, symbol 수), 공시가 없다면 (0, nan)
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        symbol_positions = self.get_positions(self.symbols, symbols)
+        account_positions = self.get_positions(self.account_codes, account_codes)
+        keys = (
+            account_positions[:, np.newaxis].astype(np.int64) * len(self.symbols)
+            + symbol_positions[np.newaxis, :]
+        )
+        day = np.datetime64(date, "D").astype(np.int64)
+
+        idx = np.searchsorted(self.keys, keys * self.KEY_DAYS + day, side="right") - 1
+        found = (
+            (account_positions[:, np.newaxis] >= 0)
+            & (symbol_positions[np.newaxis, :] >= 0)
+            & (idx >= 0)
+        )
+        idx = np.where(found, idx, 0)
+        found &= self.keys[idx] // self.KEY_DAYS == keys
+
+        yearmonths = np.where(found, self.yearmonths[idx], 0)
+        values = np.where(found, self.values[idx], np.nan)
+        return yearmonths, values
+
+
+def load_account_history_df(
+    account_codes: list, provider: DATA_PROVIDER = None
+) -> pd.DataFrame:
+    """
+    모든 symbol의 전체 공시 이력을 동시 호출로 읽어오는 함수 (POINT_IN_TIME_PANEL.build용)
+    호출에 실패한 (symbol, account_code)는 제외합니다.
+
+    :param list account_codes: 호출할 account_code들
+    :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+    :return: [SYMBOL, ACCOUNT_CODE, YEARMONTH, VALUE] 데이터프레임
+    :rtype: pd.DataFrame
+    """
+    provider = provider or load_default_provider()
+    symbols = sorted(set(provider.symbol_stock()["SYMBOL"]))
+    items = [
+        (symbol, account_code) for account_code in account_codes for symbol in symbols
+    ]
+    concurrent_fetcher = CONCURRENT_FETCHER(
+        lambda item: provider.account_history(
+            symbol=item[0], account_code=item[1], period="q"
+        )
+    )
+    results, _ = concurrent_fetcher(items)
+
+    fetched = [
+        (item, account_df)
+        for item, account_df in zip(items, results)
+        if account_df is not None and not account_df.empty
+    ]
+    lengths = [len(account_df) for _, account_df in fetched]
+    account_history_df = pd.DataFrame(
+        {
+            "SYMBOL": np.repeat([item[0] for item, _ in fetched], lengths),
+            "ACCOUNT_CODE": np.repeat([item[1] for item, _ in fetched], lengths),
+            "YEARMONTH": np.concatenate(
+                [account_df["YEARMONTH"].to_numpy() for _, account_df in fetched]
+                or [np.empty(0, dtype=np.int64)]
+            ),
+            "VALUE": np.concatenate(
+                [account_df["VALUE"].to_numpy() for _, account_df in fetched]
+                or [np.empty(0, dtype=np.float64)]
+            ),
+        }
+    )
+    return account_history_df
+
+
+def load_point_in_time_panel(
+    account_codes: list, provider: DATA_PROVIDER = None
+) -> POINT_IN_TIME_PANEL:
+    """
+    provider별로 하나의 POINT_IN_TIME_PANEL을 공유하여 반환하는 함수
+    provider.cache_dir/point_in_time_panel이 없다면 account_codes의 전체 공시 이력으로 build 합니다.
+    (build 이후 공시 시즌이 지났거나 panel에 없는 account_code를 요청하면 다시 build 합니다.)
+
+    :param list account_codes: panel에 넣을 account_code들
+    :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+    :return: POINT_IN_TIME_PANEL
+    :rtype: POINT_IN_TIME_PANEL
+    """
+    return _load_point_in_time_panel(
+        provider or load_default_provider(), tuple(sorted(account_codes))
+    )
+
+
+@lru_cache(maxsize=None)
+def _load_point_in_time_panel(
+    provider: DATA_PROVIDER, account_codes: tuple
+) -> POINT_IN_TIME_PANEL:
+    path = os.path.join(provider.cache_dir, "point_in_time_panel")
+    if not POINT_IN_TIME_PANEL.is_fresh(path, account_codes, dt.date.today()):
+        os.makedirs(provider.cache_dir, exist_ok=True)
+        POINT_IN_TIME_PANEL.build(
+            load_account_history_df(list(account_codes), provider),
+            path,
+            account_codes,
+        )
+    return POINT_IN_TIME_PANEL(path)
+
+
+def clear_caches() -> None:
+    """
+    provider별로 공유하는 cache / store / index를 모두 버리는 함수
+    provider를 더 쓰지 않을 때 호출하면 provider와 sqlite connection / memory-map이 함께 해제됩니다. (benchmark 반복 등)
+    """
+    for load_func in [
+        _load_account_history_cache,
+        _load_daily_price_store,
+        _load_symbol_stock_cache,
+        _load_sector_index,
+        _load_point_in_time_panel,
+    ]:
+        load_func.cache_clear()
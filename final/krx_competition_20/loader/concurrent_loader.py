@@ -0,0 +1,206 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class DEADLINE_EXCEEDED(TimeoutError):
+    """
+    DEADLINE_EXCEEDED : 시간 예산이 거의 소진되어 취소된 호출의 예외 클래스
+    """
+
+
+class DEADLINE:
+    """
+    DEADLINE : trade_func의 시간 예산과 api 호출 latency (EWMA)를 추적하는 클래스
+    """
+
+    def __init__(
+        self,
+        budget: float,
+        CFG: dict = {
+            "alpha": 0.2,
+            "latency_n": 2.0,
+            "reserve": 30.0,
+        },
+    ) -> None:
+        """
+        DEADLINE의 생성자, 생성 시점부터 시간을 잽니다.
+
+        :param float budget: 시간 예산(초)
+        :param dict CFG: latency EWMA 가중치(alpha) / 남겨둘 latency 배수(latency_n)
+            / 호출 이후 단계(score / 주문 생성)를 위해 남겨둘 시간(reserve, 초)
+
+        :attr float latency: 호출 1회의 latency EWMA (초), 측정 전에는 None 입니다.
+        """
+        self.budget = budget
+        self.CFG = CFG
+        self.started_at = time.monotonic()
+        self.latency = None
+
+    def get_elapsed(self) -> float:
+        """
+        시작 후 지난 시간(초)을 반환하는 메서드
+        """
+        return time.monotonic() - self.started_at
+
+    def get_remaining(self) -> float:
+        """
+        남은 시간 예산(초)을 반환하는 메서드
+        """
+        return self.budget - self.get_elapsed()
+
+    def update_latency(self, seconds: float) -> None:
+        """
+        호출 1회의 latency로 EWMA를 갱신하는 메서드
+
+        :param float seconds: 호출 1회의 latency (초)
+        """
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            alpha = self.CFG["alpha"]
+            self.latency = alpha * seconds + (1 - alpha) * self.latency
+
+    def is_near(self) -> bool:
+        """
+        남은 시간이 reserve + latency_n번의 호출 시간 이하인지 확인하는 메서드
+        True라면 남은 호출을 취소하고 준비된 결과로 진행해야 합니다.
+
+        :return: 시간 예산 소진 임박 여부
+        :rtype: bool
+        """
+        CFG = self.CFG
+        latency = self.latency or 0.0
+        return self.get_remaining() <= CFG["reserve"] + CFG["latency_n"] * latency
+
+
+class CONCURRENT_FETCHER:
+    """
+    CONCURRENT_FETCHER : api 호출 함수를 bounded thread pool로 동시에 실행하는 클래스
+    """
+
+    def __init__(
+        self,
+        func,
+        CFG: dict = {
+            "max_workers": 8,
+            "timeout": 30,
+        },
+        deadline: DEADLINE = None,
+    ) -> None:
+        """
+        CONCURRENT_FETCHER의 생성자
+
+        :param callable func: item 하나를 받아 결과를 반환하는 호출 함수
+        :param dict CFG: 동시 실행 수(max_workers) / item별 timeout(초) 파라미터
+            (timeout은 결과를 기다리는 시간입니다. python thread는 중단할 수 없으므로
+            timeout을 넘긴 호출은 background에서 끝까지 실행되고 결과만 버려집니다.)
+        :param DEADLINE deadline: 시간 예산, None이면 모든 item을 기다립니다.
+        """
+        self.func = func
+        self.CFG = CFG
+        self.deadline = deadline
+
+    @staticmethod
+    def submit_items(
+        executor: ThreadPoolExecutor, func, items: list, started_at: dict
+    ) -> dict:
+        """
+        item들을 executor에 제출하는 메서드
+
+        :param ThreadPoolExecutor executor: 실행기
+        :param callable func: 호출 함수
+        :param list items: 호출할 item들
+        :param dict started_at: {item index : 실행 시작 시각}을 기록할 딕셔너리
+        :return: {future : item index} 딕셔너리
+        :rtype: dict
+        """
+
+        def run(idx, item):
+            started_at[idx] = time.monotonic()
+            return func(item)
+
+        future_idx_dict = {
+            executor.submit(run, idx, item): idx for idx, item in enumerate(items)
+        }
+        return future_idx_dict
+
+    @staticmethod
+    def collect_results(
+        future_idx_dict: dict,
+        items: list,
+        started_at: dict,
+        timeout: float,
+        deadline: DEADLINE = None,
+    ) -> tuple[list, list]:
+        """
+        실행 결과를 입력 순서대로 모으는 메서드
+        실행 시작 후 timeout을 넘긴 item은 더 기다리지 않고 실패로 기록합니다. (실행 중인 호출은 중단되지 않습니다.)
+        deadline이 임박하면 아직 시작하지 않은 item을 취소하고, 남은 item을 모두 DEADLINE_EXCEEDED로 기록합니다.
+
+        :param dict future_idx_dict: {future : item index} 딕셔너리
+        :param list items: 호출할 item들
+        :param dict started_at: {item index : 실행 시작 시각} 딕셔너리
+        :param float timeout: item별 timeout(초)
+        :param DEADLINE deadline: 시간 예산, None이면 모든 item을 기다립니다.
+        :return: (입력 순서의 결과 list (실패는 None), [(item, exception)] list)
+        :rtype: tuple[list, list]
+        """
+        results = [None] * len(items)
+        failures = list()
+
+        pending = set(future_idx_dict)
+        while pending:
+            done, pending = wait(
+                pending, timeout=min(timeout, 0.1), return_when=FIRST_COMPLETED
+            )
+            now = time.monotonic()
+            for future in done:
+                idx = future_idx_dict[future]
+                try:
+                    results[idx] = future.result()
+                except Exception as e:
+                    failures.append((idx, e))
+                if deadline is not None and idx in started_at:
+                    deadline.update_latency(now - started_at[idx])
+
+            if deadline is not None and pending and deadline.is_near():
+                for future in pending:
+                    # 시작 전인 호출만 취소되고, 실행 중인 호출은 결과만 버립니다.
+                    future.cancel()
+                    failures.append(
+                        (future_idx_dict[future], DEADLINE_EXCEEDED("deadline"))
+                    )
+                pending = set()
+
+            for future in list(pending):
+                idx = future_idx_dict[future]
+                if idx in started_at and now - started_at[idx] > timeout:
+                    pending.remove(future)
+                    failures.append((idx, TimeoutError(f"timeout {timeout}s")))
+
+        failures = [(items[idx], e) for idx, e in sorted(failures, key=lambda x: x[0])]
+        return results, failures
+
+    # CONCURRENT_FETCHER PIPELINE
+    def __call__(self, items: list) -> tuple[list, list]:
+        """
+        CONCURRENT_FETCHER의 파이프라인을 제공하는 메서드
+
+        :param list items: 호출할 item들
+        :return: (입력 순서의 결과 list (실패는 None), [(item, exception)] list)
+        :rtype: tuple[list, list]
+        """
+        func = self.func
+        CFG = self.CFG
+
+        started_at = dict()
+        executor = ThreadPoolExecutor(max_workers=CFG["max_workers"])
+        try:
+            future_idx_dict = self.submit_items(executor, func, items, started_at)
+            results, failures = self.collect_results(
+                future_idx_dict, items, started_at, CFG["timeout"], self.deadline
+            )
+        finally:
+            # 시작 전인 호출은 취소하고, timeout / deadline으로 버린 실행 중인 호출은 기다리지 않습니다.
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results, failures
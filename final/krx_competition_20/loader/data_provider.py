@@ -0,0 +1,680 @@
+import os
+import time
+import random
+import shutil
+import threading
+import datetime as dt
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "KRX20_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".krx_competition_20")
+)
+
+
+class DATA_PROVIDER:
+    """
+    DATA_PROVIDER : kquant api와 같은 signiture의 데이터를 제공하는 interface 클래스
+
+    :attr str cache_dir: 이 provider의 데이터를 cache할 경로 입니다.
+    """
+
+    cache_dir = DEFAULT_CACHE_DIR
+
+    def symbol_stock(self) -> pd.DataFrame:
+        """
+        한국거래소 종목 목록 데이터프레임을 반환하는 메서드 (kq.symbol_stock)
+
+        :return: [SYMBOL, NAME, MARKET, SEC_TYPE, ADMIN_ISSUE, ...] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        raise NotImplementedError
+
+    def daily_stock(
+        self, symbol: str, start_date: dt.date, end_date: dt.date
+    ) -> pd.DataFrame:
+        """
+        [start_date, end_date] 구간의 일별 주가 데이터프레임을 반환하는 메서드 (kq.daily_stock)
+
+        :param str symbol: stock의 symbol 입니다.
+        :param datetime.date start_date: 시작 날짜
+        :param datetime.date end_date: 종료 날짜
+        :return: [DATE, OPEN, HIGH, LOW, CLOSE, VOLUME, MARKETCAP] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        raise NotImplementedError
+
+    def account_history(
+        self, symbol: str, account_code: str, period: str = "q"
+    ) -> pd.DataFrame:
+        """
+        계정의 공시 이력 데이터프레임을 반환하는 메서드 (kq.account_history)
+
+        :param str symbol: stock의 symbol 입니다.
+        :param str account_code: 계정 코드
+        :param str period: 공시 주기
+        :return: [YEARMONTH, VALUE] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        raise NotImplementedError
+
+    def symbol_sector_dict(self) -> dict:
+        """
+        symbol:sector_code 딕셔너리를 반환하는 메서드
+
+        :return: symbol-sector_code 딕셔너리
+        :rtype: dict
+        """
+        raise NotImplementedError
+
+
+class KQUANT_PROVIDER(DATA_PROVIDER):
+    """
+    KQUANT_PROVIDER : kquant api를 그대로 호출하는 provider 클래스
+    """
+
+    def __init__(self) -> None:
+        """
+        KQUANT_PROVIDER의 생성자
+        kquant는 대회 환경에만 존재하므로 provider를 만들 때 import 합니다.
+        """
+        import kquant as kq
+
+        self.kq = kq
+
+    def symbol_stock(self) -> pd.DataFrame:
+        return self.kq.symbol_stock()
+
+    def daily_stock(
+        self, symbol: str, start_date: dt.date, end_date: dt.date
+    ) -> pd.DataFrame:
+        return self.kq.daily_stock(symbol, start_date=start_date, end_date=end_date)
+
+    def account_history(
+        self, symbol: str, account_code: str, period: str = "q"
+    ) -> pd.DataFrame:
+        return self.kq.account_history(
+            symbol=symbol, account_code=account_code, period=period
+        )
+
+    def symbol_sector_dict(self) -> dict:
+        from ..processor.data.symbol_sector_dict import get_symbol_sector_dict
+
+        return get_symbol_sector_dict()
+
+
+class LOCAL_PROVIDER(DATA_PROVIDER):
+    """
+    LOCAL_PROVIDER : local parquet 파일을 memory-map으로 읽어 kquant api와 같은 데이터를 제공하는 provider 클래스
+
+    data_dir 구성
+        symbol_stock.parquet : kq.symbol_stock 결과
+        daily_stock.parquet : [SYMBOL, DATE, OPEN, HIGH, LOW, CLOSE, VOLUME, MARKETCAP]
+        account_history.parquet : [SYMBOL, ACCOUNT_CODE, YEARMONTH, VALUE]
+        symbol_sector.parquet : [SYMBOL, SECTOR]
+    """
+
+    def __init__(self, data_dir: str) -> None:
+        """
+        LOCAL_PROVIDER의 생성자
+
+        :param str data_dir: parquet 파일 경로
+        """
+        self.data_dir = data_dir
+        self.cache_dir = os.path.join(data_dir, "cache")
+
+        self.symbols_df = self.read_parquet(data_dir, "symbol_stock")
+        self.daily_stock_df = self.read_parquet(data_dir, "daily_stock").sort_values(
+            ["SYMBOL", "DATE"], kind="stable", ignore_index=True
+        )
+        self.account_history_df = self.read_parquet(
+            data_dir, "account_history"
+        ).sort_values(["SYMBOL", "ACCOUNT_CODE", "YEARMONTH"], ignore_index=True)
+        self.symbol_sector_df = self.read_parquet(data_dir, "symbol_sector")
+
+        self.daily_stock_offset_dict = self.get_offset_dict(
+            self.daily_stock_df, ["SYMBOL"]
+        )
+        self.account_history_offset_dict = self.get_offset_dict(
+            self.account_history_df, ["SYMBOL", "ACCOUNT_CODE"]
+        )
+        self.dates = self.daily_stock_df["DATE"].values.astype("datetime64[D]")
+
+    @staticmethod
+    def read_parquet(data_dir: str, name: str) -> pd.DataFrame:
+        """
+        parquet 파일을 memory-map으로 읽는 메서드
+
+        :param str data_dir: parquet 파일 경로
+        :param str name: 파일 이름
+        :return: 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        df = pd.read_parquet(os.path.join(data_dir, f"{name}.parquet"), memory_map=True)
+        return df
+
+    @staticmethod
+    def get_offset_dict(df: pd.DataFrame, key_columns: list) -> dict:
+        """
+        key_columns로 정렬된 데이터프레임의 {key : (start, end)} offset index를 만드는 메서드
+
+        :param pd.DataFrame df: key_columns로 정렬된 데이터프레임
+        :param list key_columns: key column들
+        :return: {key : (start, end)}
+        :rtype: dict
+        """
+        if df.empty:
+            return dict()
+        key_change = np.zeros(len(df), dtype=bool)
+        key_change[0] = True
+        for key_column in key_columns:
+            values = df[key_column].values
+            key_change[1:] |= values[1:] != values[:-1]
+        starts = np.flatnonzero(key_change)
+        ends = np.append(starts[1:], len(df))
+
+        key_df = df.iloc[starts][key_columns]
+        if len(key_columns) > 1:
+            keys = list(key_df.itertuples(index=False, name=None))
+        else:
+            keys = key_df[key_columns[0]].tolist()
+        offset_dict = dict(zip(keys, zip(starts.tolist(), ends.tolist())))
+        return offset_dict
+
+    def symbol_stock(self) -> pd.DataFrame:
+        return self.symbols_df.copy()
+
+    def daily_stock(
+        self, symbol: str, start_date: dt.date, end_date: dt.date
+    ) -> pd.DataFrame:
+        start, end = self.daily_stock_offset_dict.get(symbol, (0, 0))
+        dates = self.dates[start:end]
+        start_idx = start + np.searchsorted(dates, np.datetime64(start_date, "D"))
+        end_idx = start + np.searchsorted(
+            dates, np.datetime64(end_date, "D"), side="right"
+        )
+        daily_stock_df = self.daily_stock_df.iloc[start_idx:end_idx]
+        return daily_stock_df.drop(columns="SYMBOL").reset_index(drop=True)
+
+    def account_history(
+        self, symbol: str, account_code: str, period: str = "q"
+    ) -> pd.DataFrame:
+        start, end = self.account_history_offset_dict.get(
+            (symbol, account_code), (0, 0)
+        )
+        account_df = self.account_history_df.iloc[start:end]
+        return account_df.loc[:, ["YEARMONTH", "VALUE"]].reset_index(drop=True)
+
+    def symbol_sector_dict(self) -> dict:
+        return self.symbol_sector_df.set_index("SYMBOL")["SECTOR"].to_dict()
+
+
+class LATENCY_PROVIDER(DATA_PROVIDER):
+    """
+    LATENCY_PROVIDER : provider 호출에 api 지연을 주입하고 호출 수를 세는 wrapper 클래스 (benchmark용)
+    """
+
+    def __init__(
+        self,
+        provider: DATA_PROVIDER,
+        CFG: dict = {
+            "latency": {
+                "symbol_stock": 0.2,
+                "daily_stock": 0.02,
+                "account_history": 0.02,
+                "symbol_sector_dict": 0.0,
+            },
+            "jitter": 0.5,
+            "seed": 0,
+        },
+        cache_dir: str = None,
+    ) -> None:
+        """
+        LATENCY_PROVIDER의 생성자
+
+        :param DATA_PROVIDER provider: 실제 데이터를 제공하는 provider
+        :param dict CFG: 메서드별 지연(초) / 지연의 ±비율(jitter) / seed
+        :param str cache_dir: cache 경로, None이면 provider.cache_dir를 사용합니다.
+
+        :attr dict call_count: {메서드 이름 : 호출 수} 입니다.
+        """
+        self.provider = provider
+        self.CFG = CFG
+        self.cache_dir = cache_dir or provider.cache_dir
+        self.rng = random.Random(CFG["seed"])
+        self.lock = threading.Lock()
+        self.call_count = dict()
+
+    def wait(self, name: str) -> None:
+        """
+        호출 수를 기록하고 name의 지연만큼 대기하는 메서드
+
+        :param str name: 호출한 메서드 이름
+        """
+        with self.lock:
+            self.call_count[name] = self.call_count.get(name, 0) + 1
+            jitter = self.rng.uniform(-1, 1) * self.CFG["jitter"]
+        latency = self.CFG["latency"].get(name, 0.0) * (1 + jitter)
+        if latency > 0:
+            time.sleep(latency)
+
+    def reset_call_count(self) -> dict:
+        """
+        지금까지의 호출 수를 반환하고 초기화하는 메서드
+
+        :return: {메서드 이름 : 호출 수}
+        :rtype: dict
+        """
+        with self.lock:
+            call_count, self.call_count = self.call_count, dict()
+        return call_count
+
+    def symbol_stock(self) -> pd.DataFrame:
+        self.wait("symbol_stock")
+        return self.provider.symbol_stock()
+
+    def daily_stock(
+        self, symbol: str, start_date: dt.date, end_date: dt.date
+    ) -> pd.DataFrame:
+        self.wait("daily_stock")
+        return self.provider.daily_stock(symbol, start_date, end_date)
+
+    def account_history(
+        self, symbol: str, account_code: str, period: str = "q"
+    ) -> pd.DataFrame:
+        self.wait("account_history")
+        return self.provider.account_history(symbol, account_code, period)
+
+    def symbol_sector_dict(self) -> dict:
+        self.wait("symbol_sector_dict")
+        return self.provider.symbol_sector_dict()
+
+
+class PANEL_PROVIDER(DATA_PROVIDER):
+    """
+    PANEL_PROVIDER : 주가 / 공시 panel을 column별 .npy 파일로 저장하고 memory-map (읽기 전용)으로 제공하는 provider 클래스
+    여러 process가 같은 panel_dir을 열면 OS page cache를 공유하므로 process별 복사본이 생기지 않습니다. (parameter_search용)
+
+    panel_dir 구성
+        symbol_stock.parquet / symbol_sector.parquet : 작은 데이터는 parquet 그대로
+        daily_stock.{KEY, START, END, column}.npy : SYMBOL별 [START, END) offset과 column 배열
+        account_history.{SYMBOL, ACCOUNT_CODE, START, END, column}.npy : (SYMBOL, ACCOUNT_CODE)별 offset과 column 배열
+    """
+
+    DAILY_STOCK_COLUMNS = [
+        "DATE",
+        "OPEN",
+        "HIGH",
+        "LOW",
+        "CLOSE",
+        "VOLUME",
+        "MARKETCAP",
+    ]
+    ACCOUNT_HISTORY_COLUMNS = ["YEARMONTH", "VALUE"]
+
+    def __init__(self, panel_dir: str, cache_dir: str = None) -> None:
+        """
+        PANEL_PROVIDER의 생성자
+
+        :param str panel_dir: PANEL_PROVIDER.build로 만든 panel 경로
+        :param str cache_dir: cache 경로, None이면 panel_dir/cache (process마다 다른 경로를 주면 sqlite cache를 나눠 씁니다.)
+        """
+        self.panel_dir = panel_dir
+        self.cache_dir = cache_dir or os.path.join(panel_dir, "cache")
+
+        self.symbols_df = pd.read_parquet(
+            os.path.join(panel_dir, "symbol_stock.parquet")
+        )
+        self.symbol_sector_df = pd.read_parquet(
+            os.path.join(panel_dir, "symbol_sector.parquet")
+        )
+
+        self.daily_stock_dict = self.load_arrays(
+            panel_dir, "daily_stock", ["KEY", "START", "END"] + self.DAILY_STOCK_COLUMNS
+        )
+        self.account_history_dict = self.load_arrays(
+            panel_dir,
+            "account_history",
+            ["SYMBOL", "ACCOUNT_CODE", "START", "END"] + self.ACCOUNT_HISTORY_COLUMNS,
+        )
+
+        daily_stock_dict = self.daily_stock_dict
+        self.daily_stock_offset_dict = dict(
+            zip(
+                daily_stock_dict["KEY"].tolist(),
+                zip(
+                    daily_stock_dict["START"].tolist(), daily_stock_dict["END"].tolist()
+                ),
+            )
+        )
+        account_history_dict = self.account_history_dict
+        self.account_history_offset_dict = dict(
+            zip(
+                zip(
+                    account_history_dict["SYMBOL"].tolist(),
+                    account_history_dict["ACCOUNT_CODE"].tolist(),
+                ),
+                zip(
+                    account_history_dict["START"].tolist(),
+                    account_history_dict["END"].tolist(),
+                ),
+            )
+        )
+        self.dates = daily_stock_dict["DATE"]
+
+    @staticmethod
+    def load_arrays(panel_dir: str, name: str, columns: list) -> dict:
+        """
+        name의 column별 .npy 파일을 memory-map으로 여는 메서드
+
+        :param str panel_dir: panel 경로
+        :param str name: daily_stock / account_history
+        :param list columns: column들
+        :return: {column : 읽기 전용 memmap 배열}
+        :rtype: dict
+        """
+        arrays = {
+            column: np.load(
+                os.path.join(panel_dir, f"{name}.{column}.npy"), mmap_mode="r"
+            )
+            for column in columns
+        }
+        return arrays
+
+    @staticmethod
+    def build(provider: LOCAL_PROVIDER, panel_dir: str) -> None:
+        """
+        LOCAL_PROVIDER의 데이터로 panel을 만드는 메서드 (임시 경로에 쓴 뒤 교체합니다.)
+        이전 panel_dir은 cache와 함께 지웁니다.
+
+        :param LOCAL_PROVIDER provider: 정렬된 데이터프레임과 offset index를 가진 provider
+        :param str panel_dir: panel 경로
+        """
+        arrays = dict()
+        daily_stock_offset_dict = provider.daily_stock_offset_dict
+        arrays["daily_stock.KEY"] = np.array(list(daily_stock_offset_dict), dtype=str)
+        arrays["daily_stock.START"] = np.array(
+            [start for start, _ in daily_stock_offset_dict.values()], dtype=np.int64
+        )
+        arrays["daily_stock.END"] = np.array(
+            [end for _, end in daily_stock_offset_dict.values()], dtype=np.int64
+        )
+        for column in PANEL_PROVIDER.DAILY_STOCK_COLUMNS:
+            arrays[f"daily_stock.{column}"] = provider.daily_stock_df[column].to_numpy()
+
+        account_history_offset_dict = provider.account_history_offset_dict
+        arrays["account_history.SYMBOL"] = np.array(
+            [symbol for symbol, _ in account_history_offset_dict], dtype=str
+        )
+        arrays["account_history.ACCOUNT_CODE"] = np.array(
+            [account_code for _, account_code in account_history_offset_dict], dtype=str
+        )
+        arrays["account_history.START"] = np.array(
+            [start for start, _ in account_history_offset_dict.values()], dtype=np.int64
+        )
+        arrays["account_history.END"] = np.array(
+            [end for _, end in account_history_offset_dict.values()], dtype=np.int64
+        )
+        for column in PANEL_PROVIDER.ACCOUNT_HISTORY_COLUMNS:
+            arrays[f"account_history.{column}"] = provider.account_history_df[
+                column
+            ].to_numpy()
+
+        tmp_path = f"{panel_dir}.{os.getpid()}.tmp"
+        os.makedirs(tmp_path, exist_ok=True)
+        for file_name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{file_name}.npy"), array)
+        provider.symbols_df.to_parquet(os.path.join(tmp_path, "symbol_stock.parquet"))
+        provider.symbol_sector_df.to_parquet(
+            os.path.join(tmp_path, "symbol_sector.parquet")
+        )
+        if os.path.isdir(panel_dir):
+            shutil.rmtree(panel_dir)
+        os.replace(tmp_path, panel_dir)
+
+    def symbol_stock(self) -> pd.DataFrame:
+        return self.symbols_df.copy()
+
+    def daily_stock(
+        self, symbol: str, start_date: dt.date, end_date: dt.date
+    ) -> pd.DataFrame:
+        start, end = self.daily_stock_offset_dict.get(symbol, (0, 0))
+        dates = self.dates[start:end]
+        start_idx = start + np.searchsorted(
+            dates, np.datetime64(start_date, "D").astype(dates.dtype)
+        )
+        end_idx = start + np.searchsorted(
+            dates, np.datetime64(end_date, "D").astype(dates.dtype), side="right"
+        )
+        daily_stock_df = pd.DataFrame(
+            {
+                column: np.array(self.daily_stock_dict[column][start_idx:end_idx])
+                for column in self.DAILY_STOCK_COLUMNS
+            }
+        )
+        return daily_stock_df
+
+    def account_history(
+        self, symbol: str, account_code: str, period: str = "q"
+    ) -> pd.DataFrame:
+        start, end = self.account_history_offset_dict.get(
+            (symbol, account_code), (0, 0)
+        )
+        account_df = pd.DataFrame(
+            {
+                column: np.array(self.account_history_dict[column][start:end])
+                for column in self.ACCOUNT_HISTORY_COLUMNS
+            }
+        )
+        return account_df
+
+    def symbol_sector_dict(self) -> dict:
+        return self.symbol_sector_df.set_index("SYMBOL")["SECTOR"].to_dict()
+
+
+class SYNTHETIC_DATA_GENERATOR:
+    """
+    SYNTHETIC_DATA_GENERATOR : LOCAL_PROVIDER용 synthetic 한국거래소 데이터를 생성하는 클래스
+    """
+
+    def __init__(
+        self,
+        start_date: dt.date,
+        end_date: dt.date,
+        CFG: dict = {
+            "symbol_n": 3500,
+            "sector_n": 60,
+            "no_fundamental_ratio": 0.1,
+            "seed": 0,
+        },
+    ) -> None:
+        """
+        SYNTHETIC_DATA_GENERATOR의 생성자
+
+        :param datetime.date start_date: 주가 시작 날짜
+        :param datetime.date end_date: 주가 종료 날짜
+        :param dict CFG: symbol 수 / sector 수 / 공시가 없는 symbol 비율 / seed
+        """
+        self.start_date = start_date
+        self.end_date = end_date
+        self.CFG = CFG
+
+    @staticmethod
+    def generate_symbols_df(rng: np.random.Generator, symbol_n: int) -> pd.DataFrame:
+        """
+        종목 목록 데이터프레임을 생성하는 메서드
+
+        :param np.random.Generator rng: 난수 생성기
+        :param int symbol_n: symbol 수
+        :return: 종목 목록 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        symbols = [f"{idx:06d}" for idx in range(symbol_n)]
+        symbols_df = pd.DataFrame(
+            {
+                "SYMBOL": symbols,
+                "NAME": [f"SYNTHETIC_{symbol}" for symbol in symbols],
+                "MARKET": rng.choice(
+                    ["유가증권", "코스닥", "코넥스"], symbol_n, p=[0.3, 0.6, 0.1]
+                ),
+                "SEC_TYPE": rng.choice(
+                    ["ST", "EF", "EN", "BC"], symbol_n, p=[0.8, 0.1, 0.05, 0.05]
+                ),
+                "ADMIN_ISSUE": rng.choice([0, 1], symbol_n, p=[0.95, 0.05]),
+            }
+        )
+        return symbols_df
+
+    @staticmethod
+    def generate_symbol_sector_df(
+        rng: np.random.Generator, symbols: list, sector_n: int
+    ) -> pd.DataFrame:
+        """
+        symbol-sector 데이터프레임을 생성하는 메서드 (sector 크기는 skewed)
+
+        :param np.random.Generator rng: 난수 생성기
+        :param list symbols: symbol들
+        :param int sector_n: sector 수
+        :return: [SYMBOL, SECTOR] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        sector_weight = rng.pareto(1.5, sector_n) + 1
+        sector_weight = sector_weight / sector_weight.sum()
+        sectors = rng.choice(
+            [f"G{idx:03d}" for idx in range(sector_n)], len(symbols), p=sector_weight
+        )
+        symbol_sector_df = pd.DataFrame({"SYMBOL": symbols, "SECTOR": sectors})
+        return symbol_sector_df
+
+    @staticmethod
+    def generate_daily_stock_df(
+        rng: np.random.Generator, symbols: list, dates: pd.DatetimeIndex
+    ) -> pd.DataFrame:
+        """
+        기하 브라운 운동으로 일별 주가 데이터프레임을 생성하는 메서드
+
+        :param np.random.Generator rng: 난수 생성기
+        :param list symbols: symbol들
+        :param pd.DatetimeIndex dates: 거래일
+        :return: [SYMBOL, DATE, OPEN, HIGH, LOW, CLOSE, VOLUME, MARKETCAP] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        symbol_n, date_n = len(symbols), len(dates)
+        init_close = np.exp(rng.uniform(np.log(1_000), np.log(500_000), symbol_n))
+        returns = rng.normal(0.0003, 0.025, (symbol_n, date_n))
+        close = np.round(init_close[:, None] * np.exp(np.cumsum(returns, axis=1)))
+        open_ = np.round(close * np.exp(rng.normal(0, 0.01, close.shape)))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, close.shape)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, close.shape)))
+        shares = np.exp(rng.uniform(np.log(1e6), np.log(5e8), symbol_n)).astype(int)
+
+        daily_stock_df = pd.DataFrame(
+            {
+                "SYMBOL": np.repeat(symbols, date_n),
+                "DATE": np.tile(dates.values, symbol_n),
+                "OPEN": open_.ravel(),
+                "HIGH": np.round(high).ravel(),
+                "LOW": np.round(low).ravel(),
+                "CLOSE": close.ravel(),
+                "VOLUME": rng.integers(1_000, 1_000_000, symbol_n * date_n),
+                "MARKETCAP": (close * shares[:, None]).ravel(),
+            }
+        )
+        return daily_stock_df
+
+    @staticmethod
+    def generate_account_history_df(
+        rng: np.random.Generator,
+        symbols: list,
+        yearmonths: list,
+        no_fundamental_ratio: float,
+    ) -> pd.DataFrame:
+        """
+        분기 공시 데이터프레임을 생성하는 메서드 (VALUE 단위 : 천원)
+
+        :param np.random.Generator rng: 난수 생성기
+        :param list symbols: symbol들
+        :param list yearmonths: 공시 YEARMONTH들
+        :param float no_fundamental_ratio: 공시가 없는 symbol 비율
+        :return: [SYMBOL, ACCOUNT_CODE, YEARMONTH, VALUE] 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        from .api_loader import ACCOUNT_CODE_DICT
+
+        symbols = np.array(symbols)
+        symbols = symbols[rng.random(len(symbols)) >= no_fundamental_ratio]
+        symbol_n, yearmonth_n = len(symbols), len(yearmonths)
+
+        assets = np.exp(rng.uniform(np.log(1e7), np.log(1e10), symbol_n))[:, None]
+        assets = assets * np.exp(
+            np.cumsum(rng.normal(0, 0.03, (symbol_n, yearmonth_n)), axis=1)
+        )
+        liabilities = assets * rng.uniform(0.1, 1.1, (symbol_n, 1))
+        account_value_dict = {
+            "ASSETS": assets,
+            "CURRENT_ASSETS": assets * rng.uniform(0.2, 0.7, (symbol_n, 1)),
+            "LIABILITIES": liabilities,
+            "EQUITY": assets - liabilities,
+            "NETPROFIT": assets * rng.normal(0.01, 0.02, (symbol_n, yearmonth_n)),
+            "EBITDA": assets * rng.normal(0.02, 0.02, (symbol_n, yearmonth_n)),
+        }
+
+        account_history_df_list = list()
+        for account, value in account_value_dict.items():
+            account_history_df_list.append(
+                pd.DataFrame(
+                    {
+                        "SYMBOL": np.repeat(symbols, yearmonth_n),
+                        "ACCOUNT_CODE": ACCOUNT_CODE_DICT[account],
+                        "YEARMONTH": np.tile(yearmonths, symbol_n),
+                        "VALUE": np.round(value).ravel(),
+                    }
+                )
+            )
+        account_history_df = pd.concat(account_history_df_list, ignore_index=True)
+        return account_history_df
+
+    def __call__(self, data_dir: str) -> None:
+        """
+        SYNTHETIC_DATA_GENERATOR의 파이프라인을 제공하는 메서드
+        data_dir에 LOCAL_PROVIDER가 읽는 parquet 파일들을 생성합니다.
+
+        :param str data_dir: parquet 파일 경로
+        """
+        CFG = self.CFG
+        rng = np.random.default_rng(CFG["seed"])
+
+        dates = pd.bdate_range(self.start_date, self.end_date)
+        yearmonths = [
+            year * 100 + month
+            for year in range(self.start_date.year - 3, self.end_date.year + 1)
+            for month in (3, 6, 9, 12)
+            if year * 100 + month <= self.end_date.year * 100 + self.end_date.month
+        ]
+
+        symbols_df = self.generate_symbols_df(rng, CFG["symbol_n"])
+        symbols = symbols_df["SYMBOL"].tolist()
+        symbol_sector_df = self.generate_symbol_sector_df(rng, symbols, CFG["sector_n"])
+        daily_stock_df = self.generate_daily_stock_df(rng, symbols, dates)
+        account_history_df = self.generate_account_history_df(
+            rng, symbols, yearmonths, CFG["no_fundamental_ratio"]
+        )
+
+        os.makedirs(data_dir, exist_ok=True)
+        symbols_df.to_parquet(os.path.join(data_dir, "symbol_stock.parquet"))
+        symbol_sector_df.to_parquet(os.path.join(data_dir, "symbol_sector.parquet"))
+        daily_stock_df.to_parquet(os.path.join(data_dir, "daily_stock.parquet"))
+        account_history_df.to_parquet(os.path.join(data_dir, "account_history.parquet"))
+
+
+@lru_cache(maxsize=None)
+def load_default_provider() -> DATA_PROVIDER:
+    """
+    기본 provider (KQUANT_PROVIDER)를 공유하여 반환하는 함수
+
+    :return: KQUANT_PROVIDER
+    :rtype: DATA_PROVIDER
+    """
+    return KQUANT_PROVIDER()
@@ -1,5 +1,7 @@
 import json
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 
 
@@ -23,6 +25,7 @@ class STATUS_LOADER:
     def get_current_cash(self) -> float:
         """
         현재 보유 cash를 반환하는 메서드
+        TOTAL을 정렬하지 않고 DATE가 가장 최근인 row의 CASH를 가져옵니다.
 
         :return : 현재 보유 cash
         :rtype: float
@@ -30,48 +33,445 @@ class STATUS_LOADER:
         _dict_df_result = self.dict_df_result
         try:
             _df_result_total = _dict_df_result["TOTAL"]
-            _current_cash = (
-                _df_result_total.sort_values("DATE").tail(1)["CASH"].values[0]
-            )
+            _current_cash = _df_result_total["CASH"].values[
+                _df_result_total["DATE"].values.argmax()
+            ]
             return _current_cash
-        except:
+        except (KeyError, ValueError):
             return 1_000_000_000.0
 
+    @staticmethod
+    def get_current_price_series(dict_df_result: dict, symbols: list) -> pd.Series:
+        """
+        symbols의 결과 데이터를 한번에 이어 붙여 symbol별 DATE가 가장 최근인 PRICE를 가져오는 메서드
+        symbol별 정렬 없이 DATE / PRICE 배열을 한번 이어 붙인 뒤 한번의 groupby로 찾습니다.
+
+        :param dict dict_df_result: dict_df_result 입니다.
+        :param list symbols: [DATE, PRICE]를 가진 결과 데이터프레임이 있는 symbol들
+        :return: SYMBOL index의 현재 가격 series
+        :rtype: pd.Series
+        """
+        date_list = [dict_df_result[symbol]["DATE"].values for symbol in symbols]
+        price_list = [dict_df_result[symbol]["PRICE"].values for symbol in symbols]
+        result_df = pd.DataFrame(
+            {
+                "SYMBOL": np.repeat(symbols, [len(dates) for dates in date_list]),
+                "DATE": np.concatenate(date_list),
+                "PRICE": np.concatenate(price_list),
+            }
+        )
+        last_idx = result_df.groupby("SYMBOL", sort=False)["DATE"].idxmax()
+        current_price_series = pd.Series(
+            result_df["PRICE"].values[last_idx.values], index=last_idx.index
+        )
+        return current_price_series
+
+    @staticmethod
+    def get_status_symbols(dict_df_result: dict, dict_df_position: dict) -> list:
+        """
+        결과 [DATE, PRICE] / position [QTY, TRADE_PRICE] 데이터가 모두 있는 보유 symbol을 반환하는 메서드
+
+        :param dict dict_df_result: dict_df_result 입니다.
+        :param dict dict_df_position: dict_df_position 입니다.
+        :return: 정렬된 보유 symbol list
+        :rtype: list
+        """
+
+        def has_rows(df, columns):
+            return len(df) > 0 and set(columns) <= set(df.columns)
+
+        status_symbols = [
+            symbol
+            for symbol in sorted(dict_df_position.keys())
+            if symbol in dict_df_result
+            and has_rows(dict_df_position[symbol], ["QTY", "TRADE_PRICE"])
+            and has_rows(dict_df_result[symbol], ["DATE", "PRICE"])
+        ]
+        return status_symbols
+
     def get_status_df(self) -> pd.DataFrame:
         """
         현재 보유 position 관련 정보를 반환하는 메서드
+        결과 / position 데이터가 없는 symbol은 제외합니다.
 
         :return: 보유한 symbol, 갯수, 구매가격, 현재 가격을 데이터프레임 형태로 가져옵니다.
         :rtype: pd.DataFrame
         """
-        current_symbol_list = list()
         _dict_df_result = self.dict_df_result
         _dict_df_position = self.dict_df_position
+        columns = ["SYMBOL", "CURRENT_QTY", "CURRENT_PRICE", "TRADE_PRICE"]
 
-        _total_symbols = sorted(_dict_df_position.keys())
+        _total_symbols = self.get_status_symbols(_dict_df_result, _dict_df_position)
+        if not _total_symbols:
+            return pd.DataFrame(columns=columns)
 
-        for _symbol in _total_symbols:
-            try:
-                _symbol_result_df = _dict_df_result[_symbol]
-                _symbol_position_df = _dict_df_position[_symbol]
+        current_price_series = self.get_current_price_series(
+            _dict_df_result, _total_symbols
+        )
+        status_df = pd.DataFrame(
+            {
+                "SYMBOL": _total_symbols,
+                "CURRENT_QTY": [
+                    _dict_df_position[_symbol]["QTY"].values[0]
+                    for _symbol in _total_symbols
+                ],
+                "CURRENT_PRICE": current_price_series.loc[_total_symbols].values,
+                "TRADE_PRICE": [
+                    _dict_df_position[_symbol]["TRADE_PRICE"].values[0]
+                    for _symbol in _total_symbols
+                ],
+            },
+            columns=columns,
+        )
+        return status_df
 
-                _current_price = (
-                    _symbol_result_df.sort_values("DATE").tail(1)["PRICE"].values[0]
-                )
-                _trade_price = _symbol_position_df["TRADE_PRICE"].values[0]
-                _current_qty = _symbol_position_df["QTY"].values[0]
-
-                current_symbol_list.append(
-                    {
-                        "SYMBOL": _symbol,
-                        "CURRENT_QTY": _current_qty,
-                        "CURRENT_PRICE": _current_price,
-                        "TRADE_PRICE": _trade_price,
-                    }
+
+class PORTFOLIO_LEDGER:
+    """
+    PORTFOLIO_LEDGER : trade_func 호출 사이에 position / 평균 매수가 / cash / 최근 가격 / 진입 후 최고가 / 보유 기간을 유지하며
+    당일 새로 추가된 결과 row와 체결(ORDER)만 반영하는 상태 정보 클래스
+    """
+
+    def __init__(
+        self,
+        CFG: dict = {
+            "initial_cash": 1_000_000_000.0,
+            "rtol": 1e-6,
+        },
+    ) -> None:
+        """
+        PORTFOLIO_LEDGER의 생성자
+
+        :param dict CFG: 결과가 없을 때의 cash(initial_cash) / position 검증 허용 오차(rtol)
+
+        :attr int rebuild_n: 결과 데이터가 append-only가 아니어서 전체를 다시 만든 횟수 입니다.
+        :attr int resync_n: 체결로 갱신한 position이 입력과 달라 position을 입력으로 맞춘 횟수 입니다.
+            (같은 날 매도 / 매수가 ORDER 하나로 합쳐지면 평균 매수가를 delta로 복원할 수 없습니다.)
+        """
+        self.CFG = CFG
+        self.rebuild_n = 0
+        self.resync_n = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        ledger를 빈 상태로 초기화하는 메서드
+        """
+        self.seen_n_dict = dict()  # {TOTAL / symbol : 반영한 row 수}
+        self.boundary_date_dict = dict()  # {TOTAL / symbol : 마지막으로 반영한 row의 DATE}
+        self.last_date_dict = dict()  # {symbol : 최근 가격의 DATE}
+        self.last_price_dict = dict()  # {symbol : 최근 가격}
+        self.position_dict = dict()  # {symbol : [QTY, TRADE_PRICE]}
+        self.max_price_dict = dict()  # {symbol : 진입 후 최고가}
+        self.hold_days_dict = dict()  # {symbol : 진입 후 결과 row 수 (거래일)}
+        self.cash = self.CFG["initial_cash"]
+        self.cash_date = None
+        self.changed_symbols = set()  # 당일 결과 row가 추가된 symbol
+
+    @staticmethod
+    def load_position_dict(dict_df_position: dict, symbols: list = None) -> dict:
+        """
+        dict_df_position을 {symbol : [QTY, TRADE_PRICE]}로 변환하는 메서드
+
+        :param dict dict_df_position: dict_df_position 입니다.
+        :param list symbols: 변환할 symbol들, None이면 전체를 변환합니다.
+        :return: {symbol : [QTY, TRADE_PRICE]}
+        :rtype: dict
+        """
+        if symbols is None:
+            symbols = dict_df_position.keys()
+        position_dict = dict()
+        for symbol in symbols:
+            df = dict_df_position.get(symbol)
+            if df is None or len(df) == 0:
+                continue
+            if {"QTY", "TRADE_PRICE"} <= set(df.columns):
+                position_dict[symbol] = [
+                    df["QTY"].values[0],
+                    df["TRADE_PRICE"].values[0],
+                ]
+        return position_dict
+
+    def is_consistent_history(self, key: str, dates: np.ndarray) -> bool:
+        """
+        key의 결과가 지난번 반영한 row 뒤에 row만 추가된 데이터인지 확인하는 메서드
+
+        :param str key: TOTAL / symbol
+        :param np.ndarray dates: key 결과 데이터프레임의 DATE
+        :return: append-only 여부
+        :rtype: bool
+        """
+        seen_n = self.seen_n_dict.get(key, 0)
+        if len(dates) < seen_n:
+            return False
+        if seen_n and dates[seen_n - 1] != self.boundary_date_dict[key]:
+            return False
+        return True
+
+    def apply_total_rows(self, dates: np.ndarray, cashes: np.ndarray) -> None:
+        """
+        새로 추가된 TOTAL row로 cash를 갱신하는 메서드
+
+        :param np.ndarray dates: 새로 추가된 row의 DATE
+        :param np.ndarray cashes: 새로 추가된 row의 CASH
+        """
+        idx = dates.argmax()
+        if self.cash_date is None or dates[idx] >= self.cash_date:
+            self.cash_date = dates[idx]
+            self.cash = cashes[idx]
+
+    def apply_fill(self, symbol: str, qty: int, price: float) -> None:
+        """
+        체결 하나를 position에 반영하는 메서드 (매수는 평균 매수가 갱신, 매도는 수량만 감소)
+
+        :param str symbol: stock의 symbol 입니다.
+        :param int qty: 체결 수량 (매도는 음수)
+        :param float price: 체결 가격
+        """
+        held_qty, trade_price = self.position_dict.get(symbol, [0, 0.0])
+        new_qty = held_qty + qty
+        if new_qty <= 0:
+            self.position_dict.pop(symbol, None)
+            return
+        if qty > 0:
+            trade_price = (held_qty * trade_price + qty * price) / new_qty
+        self.position_dict[symbol] = [new_qty, trade_price]
+
+    def apply_result_rows(
+        self,
+        symbol: str,
+        dates: np.ndarray,
+        prices: np.ndarray,
+        orders: np.ndarray = None,
+    ) -> None:
+        """
+        새로 추가된 symbol의 결과 row로 최근 가격과 체결을 반영하는 메서드
+
+        :param str symbol: stock의 symbol 입니다.
+        :param np.ndarray dates: 새로 추가된 row의 DATE
+        :param np.ndarray prices: 새로 추가된 row의 PRICE
+        :param np.ndarray orders: 새로 추가된 row의 ORDER (체결 수량), 없다면 None
+        """
+        idx = dates.argmax()
+        if (
+            symbol not in self.last_date_dict
+            or dates[idx] >= self.last_date_dict[symbol]
+        ):
+            self.last_date_dict[symbol] = dates[idx]
+            self.last_price_dict[symbol] = prices[idx]
+
+        entry_idx = None
+        if orders is not None:
+            for row_idx in np.flatnonzero(orders):
+                if symbol not in self.position_dict and orders[row_idx] > 0:
+                    entry_idx = row_idx
+                self.apply_fill(symbol, orders[row_idx], prices[row_idx])
+        self.apply_holding(symbol, prices, entry_idx)
+
+    def apply_holding(
+        self, symbol: str, prices: np.ndarray, entry_idx: int = None
+    ) -> None:
+        """
+        새로 추가된 row로 진입 후 최고가 / 보유 기간을 갱신하는 메서드
+
+        :param str symbol: stock의 symbol 입니다.
+        :param np.ndarray prices: 새로 추가된 row의 PRICE
+        :param int entry_idx: 새로 진입한 row의 위치, 진입이 없다면 None
+        """
+        if symbol not in self.position_dict:
+            self.max_price_dict.pop(symbol, None)
+            self.hold_days_dict.pop(symbol, None)
+            return
+        if entry_idx is None and symbol in self.max_price_dict:
+            self.max_price_dict[symbol] = max(self.max_price_dict[symbol], prices.max())
+            self.hold_days_dict[symbol] += len(prices)
+            return
+        entry_idx = entry_idx or 0
+        self.max_price_dict[symbol] = prices[entry_idx:].max()
+        self.hold_days_dict[symbol] = len(prices) - entry_idx - 1
+
+    @staticmethod
+    def get_entry_idx(df: pd.DataFrame) -> int:
+        """
+        결과 데이터프레임에서 현재 position에 마지막으로 진입한 row의 위치를 찾는 메서드
+        [QTY, ORDER]가 없다면 첫번째 row로 봅니다.
+
+        :param pd.DataFrame df: symbol의 결과 데이터프레임
+        :return: 진입 row의 위치
+        :rtype: int
+        """
+        if not {"QTY", "ORDER"} <= set(df.columns):
+            return 0
+        qty = df["QTY"].values
+        entry_idxs = np.flatnonzero((qty - df["ORDER"].values <= 0) & (qty > 0))
+        return entry_idxs[-1] if len(entry_idxs) else 0
+
+    def sync_position(self, dict_df_position: dict) -> bool:
+        """
+        delta로 갱신한 position을 입력 position과 비교해 다른 symbol만 입력으로 맞추는 메서드
+        보유 symbol 구성은 매번 비교하고 (다르면 전체를 다시 가져옵니다),
+        수량 / 평균 매수가는 당일 결과 row가 추가된 symbol만 비교합니다. (결과 row가 없는 symbol은 체결도 없습니다.)
+
+        :param dict dict_df_position: dict_df_position 입니다.
+        :return: 입력으로 맞춘 symbol이 있는지 여부
+        :rtype: bool
+        """
+        if dict_df_position.keys() != self.position_dict.keys():
+            self.position_dict = self.load_position_dict(dict_df_position)
+            for holding_dict in [self.max_price_dict, self.hold_days_dict]:
+                for symbol in holding_dict.keys() - self.position_dict.keys():
+                    del holding_dict[symbol]
+            return True
+
+        synced = False
+        position_dict = self.load_position_dict(
+            dict_df_position, sorted(self.changed_symbols & dict_df_position.keys())
+        )
+        for symbol, (qty, trade_price) in position_dict.items():
+            ledger_qty, ledger_trade_price = self.position_dict[symbol]
+            if qty != ledger_qty or not np.isclose(
+                trade_price, ledger_trade_price, rtol=self.CFG["rtol"]
+            ):
+                self.position_dict[symbol] = [qty, trade_price]
+                synced = True
+        return synced
+
+    def rebuild(self, dict_df_result: dict, dict_df_position: dict) -> None:
+        """
+        전체 dict_df_result / dict_df_position으로 ledger를 다시 만드는 메서드
+
+        :param dict dict_df_result: dict_df_result 입니다.
+        :param dict dict_df_position: dict_df_position 입니다.
+        """
+        self.reset()
+        self.rebuild_n += 1
+
+        for key, df in dict_df_result.items():
+            if len(df) > 0 and "DATE" in df.columns:
+                self.seen_n_dict[key] = len(df)
+                self.boundary_date_dict[key] = df["DATE"].values[-1]
+
+        status_loader = STATUS_LOADER(dict_df_result, dict_df_position)
+        self.cash = status_loader.get_current_cash()
+        if "TOTAL" in self.seen_n_dict:
+            self.cash_date = dict_df_result["TOTAL"]["DATE"].values.max()
+
+        symbols = [
+            key
+            for key, df in dict_df_result.items()
+            if key != "TOTAL" and len(df) > 0 and {"DATE", "PRICE"} <= set(df.columns)
+        ]
+        if symbols:
+            current_price_series = status_loader.get_current_price_series(
+                dict_df_result, symbols
+            )
+            self.last_price_dict = current_price_series.to_dict()
+            self.last_date_dict = {
+                symbol: dict_df_result[symbol]["DATE"].values.max()
+                for symbol in symbols
+            }
+        self.position_dict = self.load_position_dict(dict_df_position)
+
+        for symbol in self.position_dict.keys() & set(symbols):
+            df = dict_df_result[symbol]
+            entry_idx = self.get_entry_idx(df)
+            self.max_price_dict[symbol] = df["PRICE"].values[entry_idx:].max()
+            self.hold_days_dict[symbol] = len(df) - entry_idx - 1
+
+    def update(self, dict_df_result: dict, dict_df_position: dict):
+        """
+        당일 입력을 ledger에 반영하는 메서드
+        row 수가 늘어난 결과만 새 row / 체결을 반영하고 (row 수가 같다면 변경이 없다고 봅니다),
+        결과가 append-only가 아니라면 전체를 다시 만듭니다.
+        체결로 갱신한 position이 입력 position과 다르다면 다른 symbol만 입력으로 맞춥니다.
+
+        :param dict dict_df_result: dict_df_result 입니다.
+        :param dict dict_df_position: dict_df_position 입니다.
+        :return: 갱신된 ledger (self)
+        :rtype: PORTFOLIO_LEDGER
+        """
+        if not self.seen_n_dict.keys() <= dict_df_result.keys():
+            self.rebuild(dict_df_result, dict_df_position)
+            return self
+
+        self.changed_symbols = set()
+        for key, df in dict_df_result.items():
+            seen_n = self.seen_n_dict.get(key, 0)
+            if len(df) == seen_n or "DATE" not in df.columns:
+                continue
+            dates = df["DATE"].values
+            if not self.is_consistent_history(key, dates):
+                self.rebuild(dict_df_result, dict_df_position)
+                return self
+            self.seen_n_dict[key] = len(dates)
+            self.boundary_date_dict[key] = dates[-1]
+
+            if key == "TOTAL":
+                if "CASH" in df.columns:
+                    self.apply_total_rows(dates[seen_n:], df["CASH"].values[seen_n:])
+            elif "PRICE" in df.columns:
+                self.changed_symbols.add(key)
+                self.apply_result_rows(
+                    key,
+                    dates[seen_n:],
+                    df["PRICE"].values[seen_n:],
+                    df["ORDER"].values[seen_n:] if "ORDER" in df.columns else None,
                 )
-            except:
-                pass
-        return pd.DataFrame(
-            current_symbol_list,
-            columns=["SYMBOL", "CURRENT_QTY", "CURRENT_PRICE", "TRADE_PRICE"],
+
+        if self.sync_position(dict_df_position):
+            self.resync_n += 1
+        return self
+
+    def get_current_cash(self) -> float:
+        """
+        현재 보유 cash를 반환하는 메서드
+
+        :return: 현재 보유 cash
+        :rtype: float
+        """
+        return self.cash
+
+    def get_status_df(self) -> pd.DataFrame:
+        """
+        현재 보유 position 관련 정보를 반환하는 메서드 (STATUS_LOADER.get_status_df에 MAX_PRICE / HOLD_DAYS 추가)
+        진입 후 최고가 / 보유 기간을 모르는 symbol은 현재 가격 / 0으로 채웁니다.
+
+        :return: 보유한 symbol, 갯수, 구매가격, 현재 가격, 진입 후 최고가, 보유 기간을 데이터프레임 형태로 가져옵니다.
+        :rtype: pd.DataFrame
+        """
+        symbols = sorted(
+            symbol for symbol in self.position_dict if symbol in self.last_price_dict
         )
+        status_df = pd.DataFrame(
+            {
+                "SYMBOL": symbols,
+                "CURRENT_QTY": [self.position_dict[symbol][0] for symbol in symbols],
+                "CURRENT_PRICE": [self.last_price_dict[symbol] for symbol in symbols],
+                "TRADE_PRICE": [self.position_dict[symbol][1] for symbol in symbols],
+                "MAX_PRICE": [
+                    self.max_price_dict.get(symbol, self.last_price_dict[symbol])
+                    for symbol in symbols
+                ],
+                "HOLD_DAYS": [self.hold_days_dict.get(symbol, 0) for symbol in symbols],
+            },
+            columns=[
+                "SYMBOL",
+                "CURRENT_QTY",
+                "CURRENT_PRICE",
+                "TRADE_PRICE",
+                "MAX_PRICE",
+                "HOLD_DAYS",
+            ],
+        )
+        return status_df
+
+
+@lru_cache(maxsize=None)
+def load_portfolio_ledger() -> PORTFOLIO_LEDGER:
+    """
+    trade_func 호출 사이에 공유하는 기본 PORTFOLIO_LEDGER를 반환하는 함수
+
+    :return: PORTFOLIO_LEDGER
+    :rtype: PORTFOLIO_LEDGER
+    """
+    return PORTFOLIO_LEDGER()
@@ -0,0 +1,417 @@
+# PARAMETER_SEARCH
+import os
+import time
+import shutil
+import logging
+import argparse
+import itertools
+import functools
+import multiprocessing
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from .trade_func import trade_func, TRADE_FUNC_CFG
+from .backtester import BACKTESTER
+from .profiler import PIPELINE_PROFILER
+from .loader.static_loader import PORTFOLIO_LEDGER
+from .loader.data_provider import LOCAL_PROVIDER, PANEL_PROVIDER
+from .loader.api_loader import ACCOUNT_CODE_DICT
+from .loader.cache_loader import POINT_IN_TIME_PANEL, load_account_history_df
+
+PARAM_GRID = {
+    "cash_percentage": [0.5, 0.75],
+    "buying_order_n": [None, 10],
+    "upper_limit": [5, 8, 12],
+    "lower_limit": [-2, -3, -5],
+    "pbr_ratio": [1],
+    "per_ratio": [0, 0.3, 1],
+    "sector_symbol_n": [25],
+    "sample_n": [10, 20],
+}
+METRIC_COLUMNS = ["RETURN", "MAX_DRAWDOWN", "TURNOVER", "DAYS", "SECONDS"]
+
+
+def run_backtest(
+    panel_dir: str,
+    cache_dir: str,
+    point_in_time_path: str,
+    start_date: dt.date,
+    end_date: dt.date,
+    backtest_CFG: dict,
+    trade_CFG: dict,
+) -> dict:
+    """
+    process pool worker에서 backtest 1회를 실행하고 지표를 계산하는 함수
+    sqlite cache (DAILY_PRICE_STORE / ACCOUNT_HISTORY_CACHE)는 이전 run의 호출 이력에 따라 결과가 달라질 수 있으므로
+    run마다 빈 cache_dir에서 시작하고 끝나면 지웁니다. (worker process도 run마다 새로 만듭니다.)
+    POINT_IN_TIME_PANEL은 호출 이력과 무관하므로 search에서 한번 만든 panel을 cache_dir에 link하여 같이 씁니다.
+
+    :param str panel_dir: PANEL_PROVIDER 경로
+    :param str cache_dir: run의 cache 경로
+    :param str point_in_time_path: search에서 만든 POINT_IN_TIME_PANEL 경로
+    :param datetime.date start_date: backtest 시작 날짜
+    :param datetime.date end_date: backtest 종료 날짜
+    :param dict backtest_CFG: BACKTESTER 파라미터
+    :param dict trade_CFG: trade_func 파라미터 (seed 포함)
+    :return: {RETURN, MAX_DRAWDOWN, TURNOVER, DAYS, SECONDS}
+    :rtype: dict
+    """
+    started_at = time.perf_counter()
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(cache_dir)
+    os.symlink(
+        os.path.abspath(point_in_time_path),
+        os.path.join(cache_dir, "point_in_time_panel"),
+    )
+    provider = PANEL_PROVIDER(panel_dir, cache_dir)
+    logger = logging.getLogger("parameter_search.run")
+    _trade_func = functools.partial(
+        trade_func,
+        provider=provider,
+        profiler=PIPELINE_PROFILER(logger),
+        ledger=PORTFOLIO_LEDGER(
+            {"initial_cash": backtest_CFG["initial_cash"], "rtol": 1e-6}
+        ),
+        CFG=trade_CFG,
+    )
+    backtester = BACKTESTER(
+        start_date, end_date, backtest_CFG, _trade_func, logger, provider
+    )
+    try:
+        total_df = backtester()
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    metrics = PARAMETER_SEARCH.get_metrics(total_df)
+    metrics["SECONDS"] = time.perf_counter() - started_at
+    return metrics
+
+
+class PARAMETER_SEARCH:
+    """
+    PARAMETER_SEARCH : trade_func CFG 조합 (grid / random search)별 backtest를 process pool에서 실행하여
+    수익률 / 최대 낙폭 / 회전율 순위표를 만드는 클래스
+    """
+
+    def __init__(
+        self,
+        panel_dir: str,
+        start_date: dt.date,
+        end_date: dt.date,
+        param_grid: dict = PARAM_GRID,
+        CFG: dict = {
+            "search": "grid",
+            "n_iter": 20,
+            "seed": 0,
+            "max_workers": None,
+            "initial_cash": 1_000_000_000.0,
+            "calendar_symbol": None,
+            "sort_by": "RETURN",
+            "cache_dir": None,
+        },
+        logger: logging.Logger = logging.getLogger("parameter_search"),
+    ) -> None:
+        """
+        PARAMETER_SEARCH의 생성자
+
+        :param str panel_dir: PANEL_PROVIDER.build로 만든 panel 경로
+        :param datetime.date start_date: backtest 시작 날짜
+        :param datetime.date end_date: backtest 종료 날짜
+        :param dict param_grid: {TRADE_FUNC_CFG key : 후보 값 list}
+        :param dict CFG: search (grid / random) / random search 횟수(n_iter) / seed (run별 seed의 기준)
+            / 동시 process 수(max_workers, None이면 os.cpu_count()) / 초기 투자금
+            / 거래일 기준 symbol (None이면 panel에서 [start_date, end_date] 거래일이 가장 많은 symbol)
+            / 순위 기준 column(sort_by) / cache 경로 (None이면 panel_dir/cache)
+        :param logging.Logger logger: 진행 상황을 기록할 logger
+        """
+        unknown_keys = set(param_grid) - set(TRADE_FUNC_CFG)
+        if unknown_keys:
+            raise KeyError(f"unknown trade_func CFG keys : {sorted(unknown_keys)}")
+        self.panel_dir = panel_dir
+        self.start_date = start_date
+        self.end_date = end_date
+        self.param_grid = param_grid
+        self.CFG = CFG
+        self.logger = logger
+
+    @staticmethod
+    def get_grid_params(param_grid: dict) -> list:
+        """
+        param_grid의 모든 조합을 만드는 메서드
+
+        :param dict param_grid: {key : 후보 값 list}
+        :return: [{key : 값}]
+        :rtype: list
+        """
+        keys = list(param_grid)
+        return [
+            dict(zip(keys, values))
+            for values in itertools.product(*param_grid.values())
+        ]
+
+    @staticmethod
+    def get_random_params(param_grid: dict, n_iter: int, seed: int) -> list:
+        """
+        param_grid의 조합 중 n_iter개를 중복 없이 뽑는 메서드
+
+        :param dict param_grid: {key : 후보 값 list}
+        :param int n_iter: 뽑을 조합 수
+        :param int seed: seed
+        :return: [{key : 값}]
+        :rtype: list
+        """
+        grid_params = PARAMETER_SEARCH.get_grid_params(param_grid)
+        rng = np.random.default_rng(seed)
+        idx = rng.choice(len(grid_params), min(n_iter, len(grid_params)), replace=False)
+        return [grid_params[i] for i in sorted(idx)]
+
+    @staticmethod
+    def get_run_seed(seed: int, run: int) -> int:
+        """
+        search seed와 run 번호로 run별 seed를 만드는 메서드 (같은 search는 항상 같은 seed)
+
+        :param int seed: search seed
+        :param int run: run 번호
+        :return: run seed
+        :rtype: int
+        """
+        return int(np.random.SeedSequence([seed, run]).generate_state(1)[0])
+
+    @staticmethod
+    def get_metrics(total_df: pd.DataFrame) -> dict:
+        """
+        일별 TOTAL 결과로 수익률 / 최대 낙폭 / 회전율을 계산하는 메서드
+        RETURN : 마지막 TOTAL_VALUE / 초기 TOTAL_VALUE - 1
+        MAX_DRAWDOWN : min(TOTAL_VALUE / 이전 최고 TOTAL_VALUE - 1)
+        TURNOVER : TRADE_VALUE 합 / 평균 TOTAL_VALUE
+
+        :param pd.DataFrame total_df: [DATE, CASH, STOCK_VALUE, TOTAL_VALUE, TRADE_VALUE] 데이터프레임
+        :return: {RETURN, MAX_DRAWDOWN, TURNOVER, DAYS}
+        :rtype: dict
+        """
+        total_values = total_df["TOTAL_VALUE"].to_numpy(dtype=np.float64)
+        if len(total_values) < 2:
+            return {
+                "RETURN": np.nan,
+                "MAX_DRAWDOWN": np.nan,
+                "TURNOVER": np.nan,
+                "DAYS": 0,
+            }
+        drawdowns = total_values / np.maximum.accumulate(total_values) - 1
+        return {
+            "RETURN": total_values[-1] / total_values[0] - 1,
+            "MAX_DRAWDOWN": drawdowns.min(),
+            "TURNOVER": total_df["TRADE_VALUE"].sum() / total_values.mean(),
+            "DAYS": len(total_values) - 1,
+        }
+
+    def get_runs(self) -> list:
+        """
+        search 방식에 따라 run별 {RUN, SEED, CFG key : 값}을 만드는 메서드
+
+        :return: [{RUN, SEED, key : 값}]
+        :rtype: list
+        """
+        CFG = self.CFG
+        if CFG["search"] == "grid":
+            params_list = self.get_grid_params(self.param_grid)
+        elif CFG["search"] == "random":
+            params_list = self.get_random_params(
+                self.param_grid, CFG["n_iter"], CFG["seed"]
+            )
+        else:
+            raise ValueError(f"unknown search : {CFG['search']}")
+
+        runs = [
+            {"RUN": run, "SEED": self.get_run_seed(CFG["seed"], run), **params}
+            for run, params in enumerate(params_list)
+        ]
+        return runs
+
+    def format_result_df(self, results: list) -> pd.DataFrame:
+        """
+        run별 결과를 sort_by 순위표로 만드는 메서드 (MAX_DRAWDOWN은 0에 가까울수록 높은 순위)
+
+        :param list results: [{RUN, SEED, key : 값, RETURN, MAX_DRAWDOWN, TURNOVER, DAYS, SECONDS, ERROR}]
+        :return: RANK 순으로 정렬된 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        result_df = pd.DataFrame(results)
+        result_df = result_df.sort_values(
+            [self.CFG["sort_by"], "RUN"], ascending=[False, True], na_position="last"
+        ).reset_index(drop=True)
+        result_df.insert(0, "RANK", np.arange(1, len(result_df) + 1))
+        return result_df
+
+    @staticmethod
+    def build_point_in_time_panel(panel_dir: str, cache_dir: str) -> str:
+        """
+        run들이 같이 쓸 POINT_IN_TIME_PANEL을 panel의 전체 공시 이력으로 만드는 메서드
+
+        :param str panel_dir: PANEL_PROVIDER 경로
+        :param str cache_dir: search의 cache 경로
+        :return: POINT_IN_TIME_PANEL 경로
+        :rtype: str
+        """
+        point_in_time_path = os.path.join(cache_dir, "point_in_time_panel")
+        provider = PANEL_PROVIDER(panel_dir, cache_dir)
+        account_history_df = load_account_history_df(
+            list(ACCOUNT_CODE_DICT.values()), provider
+        )
+        POINT_IN_TIME_PANEL.build(
+            account_history_df, point_in_time_path, list(ACCOUNT_CODE_DICT.values())
+        )
+        return point_in_time_path
+
+    @staticmethod
+    def get_calendar_symbol(
+        panel_dir: str, calendar_symbol: str, start_date: dt.date, end_date: dt.date
+    ) -> str:
+        """
+        backtest 거래일 기준 symbol을 panel의 DATE 축으로 정하는 메서드
+        calendar_symbol이 None이면 [start_date, end_date] 거래일이 가장 많은 symbol을 반환합니다.
+
+        :param str panel_dir: PANEL_PROVIDER 경로
+        :param str calendar_symbol: 거래일 기준 symbol, None이면 panel에서 고릅니다.
+        :param datetime.date start_date: backtest 시작 날짜
+        :param datetime.date end_date: backtest 종료 날짜
+        :return: 거래일 기준 symbol
+        :rtype: str
+        """
+        provider = PANEL_PROVIDER(panel_dir)
+        dates = provider.dates
+        in_range = (dates >= np.datetime64(start_date, "D").astype(dates.dtype)) & (
+            dates <= np.datetime64(end_date, "D").astype(dates.dtype)
+        )
+        in_range_cumsum = np.concatenate([[0], np.cumsum(in_range)])
+        daily_stock_dict = provider.daily_stock_dict
+        day_counts = (
+            in_range_cumsum[daily_stock_dict["END"]]
+            - in_range_cumsum[daily_stock_dict["START"]]
+        )
+        day_count_dict = dict(zip(daily_stock_dict["KEY"].tolist(), day_counts))
+
+        if calendar_symbol is None and len(day_counts):
+            calendar_symbol = daily_stock_dict["KEY"][np.argmax(day_counts)]
+        if not day_count_dict.get(calendar_symbol, 0):
+            raise ValueError(
+                f"calendar_symbol {calendar_symbol} has no daily_stock rows in [{start_date}, {end_date}]"
+            )
+        return str(calendar_symbol)
+
+    # PARAMETER_SEARCH PIPELINE
+    def __call__(self, output_path: str = None) -> pd.DataFrame:
+        """
+        PARAMETER_SEARCH의 파이프라인을 제공하는 메서드
+        실패한 run은 ERROR에 기록하고 나머지 run을 계속 진행합니다.
+
+        :param str output_path: 순위표 csv 경로, None이면 저장하지 않습니다.
+        :return: 순위표 데이터프레임
+        :rtype: pd.DataFrame
+        """
+        CFG = self.CFG
+        runs = self.get_runs()
+        cache_dir = CFG["cache_dir"] or os.path.join(self.panel_dir, "cache")
+        backtest_CFG = {
+            "initial_cash": CFG["initial_cash"],
+            "calendar_symbol": self.get_calendar_symbol(
+                self.panel_dir, CFG["calendar_symbol"], self.start_date, self.end_date
+            ),
+            "fast_path": True,
+        }
+        point_in_time_path = self.build_point_in_time_panel(self.panel_dir, cache_dir)
+
+        results = list()
+        # maxtasksperchild=1 : run마다 새 process (lru_cache된 cache / store를 run끼리 공유하지 않습니다.)
+        with multiprocessing.Pool(CFG["max_workers"], maxtasksperchild=1) as pool:
+            async_results = [
+                pool.apply_async(
+                    run_backtest,
+                    (
+                        self.panel_dir,
+                        os.path.join(cache_dir, f"run_{run['RUN']}"),
+                        point_in_time_path,
+                        self.start_date,
+                        self.end_date,
+                        backtest_CFG,
+                        {
+                            "seed": run["SEED"],
+                            "point_in_time": True,
+                            **{key: run[key] for key in self.param_grid},
+                        },
+                    ),
+                )
+                for run in runs
+            ]
+            for run, async_result in zip(runs, async_results):
+                result = {**run}
+                try:
+                    result.update(async_result.get())
+                    result["ERROR"] = None
+                except Exception as e:
+                    result.update({column: np.nan for column in METRIC_COLUMNS})
+                    result["ERROR"] = repr(e)
+                    self.logger.warning(f"run {run['RUN']} failed : {e!r}")
+                results.append(result)
+                self.logger.info(
+                    f"run {run['RUN'] + 1} / {len(runs)} : RETURN {result['RETURN']:.4f}"
+                    f" / MAX_DRAWDOWN {result['MAX_DRAWDOWN']:.4f}"
+                )
+
+        result_df = self.format_result_df(results)
+        if output_path:
+            result_df.to_csv(output_path, index=False)
+        return result_df
+
+
+def main(argv: list = None) -> None:
+    """
+    python -m krx_competition_20.parameter_search 진입점
+    panel_dir이 없으면 data_dir의 LOCAL_PROVIDER로 panel을 만듭니다.
+    """
+    parser = argparse.ArgumentParser(description="trade_func parameter search")
+    parser.add_argument("--data-dir", required=True)
+    parser.add_argument("--panel-dir", default=None, help="기본값은 data_dir/panel")
+    parser.add_argument("--start-date", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--end-date", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--output", default="parameter_search.csv")
+    parser.add_argument("--search", default="grid", choices=["grid", "random"])
+    parser.add_argument("--n-iter", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument(
+        "--calendar-symbol", default=None, help="기본값은 panel에서 거래일이 가장 많은 symbol"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    logging.getLogger("parameter_search.run").setLevel(logging.WARNING)
+
+    panel_dir = args.panel_dir or os.path.join(args.data_dir, "panel")
+    if not os.path.isdir(panel_dir):
+        PANEL_PROVIDER.build(LOCAL_PROVIDER(args.data_dir), panel_dir)
+
+    parameter_search = PARAMETER_SEARCH(
+        panel_dir,
+        dt.date.fromisoformat(args.start_date),
+        dt.date.fromisoformat(args.end_date),
+        PARAM_GRID,
+        {
+            "search": args.search,
+            "n_iter": args.n_iter,
+            "seed": args.seed,
+            "max_workers": args.max_workers,
+            "initial_cash": 1_000_000_000.0,
+            "calendar_symbol": args.calendar_symbol,
+            "sort_by": "RETURN",
+            "cache_dir": None,
+        },
+    )
+    result_df = parameter_search(args.output)
+    print(result_df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
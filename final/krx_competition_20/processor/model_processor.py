@@ -4,7 +4,10 @@ import datetime
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
 
-from ..loader.api_loader import FUNDAMENTAL_LOADER
+from ..loader.api_loader import BULK_FUNDAMENTAL_LOADER, ACCOUNT_CODE_DICT
+from ..loader.cache_loader import load_point_in_time_panel
+from ..loader.data_provider import DATA_PROVIDER
+from ..loader.concurrent_loader import DEADLINE
 
 
 class PBR_PROCESSOR:
@@ -149,7 +152,13 @@ class SCORE_PROCESSOR:
         self,
         symbols: list,
         date: datetime.date,
-        CFG: dict = {"pbr_ratio": 1, "per_ratio": 0.3},
+        CFG: dict = {
+            "pbr_ratio": 1,
+            "per_ratio": 0.3,
+            "max_workers": 8,
+            "timeout": 30,
+        },
+        provider: DATA_PROVIDER = None,
     ) -> None:
         """
         SCORE_PROCESSOR의 생성자
@@ -157,31 +166,55 @@ class SCORE_PROCESSOR:
         :param list symbols: score 확인할 symbols
         :param datetime.date date: 매매일 날짜
         :param dict  CFG: score_processor 파라미터
+        :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+
+        :attr list failures: fundamental 호출에 실패한 [(symbol, exception)] 입니다.
         """
         self.symbols = symbols
         self.date = date
         self.CFG = CFG
+        self.provider = provider
+        self.failures = list()
 
     @staticmethod
-    def load_fundamental_df(symbols: list, date: datetime.date) -> pd.DataFrame:
+    def load_fundamental_df(
+        symbols: list,
+        date: datetime.date,
+        CFG: dict,
+        provider: DATA_PROVIDER = None,
+        deadline: DEADLINE = None,
+    ) -> tuple[pd.DataFrame, list]:
         """
-        기본적 분석을 위한 fundamental_df를 load하는 메서드
+        기본적 분석을 위한 fundamental_df를 동시 호출로 load하는 메서드
 
         :param list symbols: score 확인할 symbols
         :param datetime.date date: 매매일 날짜
-        :return: 기본적 분석을 위한 데이터
-        :rtype: pd.DataFrame
-        """
-        fundamental_data_list = list()
-        for symbol in symbols:
-            try:
-                _fundamental_loader = FUNDAMENTAL_LOADER(symbol, date)
-                _fundamental_data = _fundamental_loader()
-                fundamental_data_list.append(_fundamental_data)
-            except:
-                pass
-        fundamental_df = pd.DataFrame(fundamental_data_list)
-        return fundamental_df
+        :param dict CFG: 동시 호출 수(max_workers, 없으면 8) / symbol별 timeout(초, 없으면 30) 파라미터
+            / point_in_time (True이면 공시 데이터를 POINT_IN_TIME_PANEL에서 찾습니다, 없으면 False)
+        :param DATA_PROVIDER provider: 데이터 provider
+        :param DEADLINE deadline: 시간 예산, None이면 모든 symbol을 기다립니다.
+        :return: (기본적 분석을 위한 데이터, 호출에 실패한 [(symbol, exception)])
+        :rtype: tuple[pd.DataFrame, list]
+        """
+        if CFG.get("point_in_time", False):
+            point_in_time_panel = load_point_in_time_panel(
+                list(ACCOUNT_CODE_DICT.values()), provider
+            )
+        else:
+            point_in_time_panel = None
+        bulk_fundamental_loader = BULK_FUNDAMENTAL_LOADER(
+            symbols,
+            date,
+            CFG={
+                "max_workers": CFG.get("max_workers", 8),
+                "timeout": CFG.get("timeout", 30),
+            },
+            provider=provider,
+            deadline=deadline,
+            point_in_time_panel=point_in_time_panel,
+        )
+        fundamental_df = bulk_fundamental_loader()
+        return fundamental_df, bulk_fundamental_loader.failures
 
     @staticmethod
     def get_symbol_close_dict(fundamental_df: pd.DataFrame) -> dict:
@@ -264,7 +297,9 @@ class SCORE_PROCESSOR:
         date = self.date
         CFG = self.CFG
 
-        fundamental_df = self.load_fundamental_df(symbols, date)
+        fundamental_df, self.failures = self.load_fundamental_df(
+            symbols, date, CFG, self.provider
+        )
         symbol_close_dict = self.get_symbol_close_dict(fundamental_df)
 
         pbr_score_df = self.get_pbr_score_df(fundamental_df)
@@ -274,3 +309,198 @@ class SCORE_PROCESSOR:
             symbol_close_dict, pbr_score_df, per_score_df, CFG
         )
         return score_df
+
+
+class PANEL_SCORE_PROCESSOR:
+    """
+    PANEL_SCORE_PROCESSOR : 전체 sector의 fundamental 데이터를 한번에 SCORE 데이터로 정제하는 클래스
+    """
+
+    def __init__(
+        self,
+        symbol_df: pd.DataFrame,
+        date: datetime.date,
+        CFG: dict = {
+            "pbr_ratio": 1,
+            "per_ratio": 0.3,
+            "max_workers": 8,
+            "timeout": 30,
+        },
+        provider: DATA_PROVIDER = None,
+        fundamental_df: pd.DataFrame = None,
+        deadline: DEADLINE = None,
+    ) -> None:
+        """
+        PANEL_SCORE_PROCESSOR의 생성자
+
+        :param pd.DataFrame symbol_df: [SYMBOL, SECTOR]를 가진 데이터프레임
+        :param datetime.date date: 매매일 날짜
+        :param dict CFG: score_processor 파라미터
+        :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+        :param pd.DataFrame fundamental_df: 이미 호출한 fundamental 데이터, None이면 symbol_df의 symbol들을 호출합니다.
+        :param DEADLINE deadline: 시간 예산, 임박하면 준비된 symbol만으로 score를 계산합니다.
+
+        :attr list failures: fundamental 호출에 실패한 [(symbol, exception)] 입니다.
+        """
+        self.symbol_df = symbol_df
+        self.date = date
+        self.CFG = CFG
+        self.provider = provider
+        self.fundamental_df = fundamental_df
+        self.deadline = deadline
+        self.failures = list()
+
+    # SCORE_PROCESSOR와 같은 fundamental 호출 단계 (self로 호출하여 profiler가 감쌀 수 있도록 합니다)
+    load_fundamental_df = staticmethod(SCORE_PROCESSOR.load_fundamental_df)
+
+    @staticmethod
+    def append_sector(
+        fundamental_df: pd.DataFrame, symbol_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        fundamental_df에 sector를 추가하는 메서드
+
+        :param pd.DataFrame fundamental_df: 기본적 분석 관련 데이터
+        :param pd.DataFrame symbol_df: [SYMBOL, SECTOR]를 가진 데이터프레임
+        :return: SECTOR가 추가된 fundamental_df
+        :rtype: pd.DataFrame
+        """
+        symbol_sector_dict = symbol_df.set_index("SYMBOL")["SECTOR"].to_dict()
+        fundamental_df["SECTOR"] = fundamental_df["SYMBOL"].map(symbol_sector_dict)
+        return fundamental_df
+
+    @staticmethod
+    def append_ratio(fundamental_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        PBR / PER을 추가하는 메서드
+
+        :param pd.DataFrame fundamental_df: 기본적 분석 관련 데이터
+        :return: PBR / PER이 추가된 fundamental_df
+        :rtype: pd.DataFrame
+        """
+        fundamental_df["PBR"] = fundamental_df["MARKETCAP"] / fundamental_df["EQUITY"]
+        fundamental_df["PER"] = (
+            fundamental_df["MARKETCAP"] / fundamental_df["NETPROFIT"]
+        )
+        return fundamental_df
+
+    @staticmethod
+    def append_sector_score(
+        fundamental_df: pd.DataFrame, ratio_column: str, score_column: str
+    ) -> pd.DataFrame:
+        """
+        sector별로, 양수인 ratio의 합 / ratio 를 SCORE로 주는 메서드
+        (PBR_PROCESSOR / PER_PROCESSOR의 filter_negative + append_score)
+        음수인 ratio의 SCORE는 NaN 입니다.
+
+        :param pd.DataFrame fundamental_df: SECTOR, ratio를 가진 데이터프레임
+        :param str ratio_column: ratio column (PBR / PER)
+        :param str score_column: score column (PBR_SCORE / PER_SCORE)
+        :return: SCORE가 추가된 fundamental_df
+        :rtype: pd.DataFrame
+        """
+        positive_ratio = fundamental_df[ratio_column].where(
+            fundamental_df[ratio_column] > 0
+        )
+        sector_ratio_sum = positive_ratio.groupby(fundamental_df["SECTOR"]).transform(
+            "sum"
+        )
+        fundamental_df[score_column] = sector_ratio_sum / positive_ratio
+        return fundamental_df
+
+    @staticmethod
+    def filter_negative_score(fundamental_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        PBR / PER 중 하나라도 음수인 데이터를 제거하는 메서드 (pbr_score_df, per_score_df의 merge)
+
+        :param pd.DataFrame fundamental_df: PBR_SCORE / PER_SCORE를 가진 데이터프레임
+        :return: 필터링 된 fundamental_df
+        :rtype: pd.DataFrame
+        """
+        fundamental_df = fundamental_df.dropna(subset=["PBR_SCORE", "PER_SCORE"])
+        return fundamental_df
+
+    @staticmethod
+    def scale_sector_score(fundamental_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        sector별로 PBR_SCORE / PER_SCORE를 min-max scaling 하는 메서드
+        (max == min 인 sector는 MinMaxScaler와 같이 0 입니다.)
+
+        :param pd.DataFrame fundamental_df: PBR_SCORE / PER_SCORE를 가진 데이터프레임
+        :return: scaling 된 fundamental_df
+        :rtype: pd.DataFrame
+        """
+        score_columns = ["PBR_SCORE", "PER_SCORE"]
+        sector_groupby = fundamental_df.groupby("SECTOR")[score_columns]
+        sector_min = sector_groupby.transform("min")
+        sector_range = sector_groupby.transform("max") - sector_min
+        sector_range = sector_range.where(sector_range != 0, 1)
+
+        fundamental_df = fundamental_df.copy()
+        fundamental_df[score_columns] = (
+            fundamental_df[score_columns] - sector_min
+        ) / sector_range
+        return fundamental_df
+
+    @staticmethod
+    def format_score_df(fundamental_df: pd.DataFrame, CFG: dict) -> pd.DataFrame:
+        """
+        score_df를 반환하는 메서드
+
+        :param pd.DataFrame fundamental_df: scaling 된 PBR_SCORE / PER_SCORE를 가진 데이터프레임
+        :param dict CFG: pbr, per의 weight 파라미터를 위한 딕셔너리
+        :return: 총합(pbr,per) 데이터, sector 순으로 정렬
+        :rtype: pd.DataFrame
+        """
+        score_df = fundamental_df.sort_values("SECTOR", kind="stable").loc[
+            :, ["SYMBOL", "PBR_SCORE", "PER_SCORE", "CLOSE"]
+        ]
+        score_df["SCORE"] = (
+            score_df["PBR_SCORE"] * CFG["pbr_ratio"]
+            + score_df["PER_SCORE"] * CFG["per_ratio"]
+        )
+        score_df = score_df.loc[
+            :, ["SYMBOL", "PBR_SCORE", "PER_SCORE", "SCORE", "CLOSE"]
+        ]
+        return score_df.reset_index(drop=True)
+
+    def get_panel_score_df(
+        self, fundamental_df: pd.DataFrame, CFG: dict
+    ) -> pd.DataFrame:
+        """
+        SECTOR를 가진 fundamental_df를 한번에 score_df로 변환하는 메서드
+
+        :param pd.DataFrame fundamental_df: SECTOR를 가진 기본적 분석 관련 데이터
+        :param dict CFG: pbr, per의 weight 파라미터를 위한 딕셔너리
+        :return: 총합(pbr,per) 데이터
+        :rtype: pd.DataFrame
+        """
+        fundamental_df = self.append_ratio(fundamental_df)
+        fundamental_df = self.append_sector_score(fundamental_df, "PBR", "PBR_SCORE")
+        fundamental_df = self.append_sector_score(fundamental_df, "PER", "PER_SCORE")
+        fundamental_df = self.filter_negative_score(fundamental_df)
+        fundamental_df = self.scale_sector_score(fundamental_df)
+        score_df = self.format_score_df(fundamental_df, CFG)
+        return score_df
+
+    def __call__(self) -> pd.DataFrame:
+        """
+        PANEL_SCORE_PROCESSOR의 파이프라인을 제공하는 메서드
+
+        :return: 총합(pbr,per) 데이터
+        :rtype: pd.DataFrame
+        """
+        symbol_df = self.symbol_df
+        date = self.date
+        CFG = self.CFG
+
+        if self.fundamental_df is None:
+            symbols = sorted(set(symbol_df["SYMBOL"]))
+            fundamental_df, self.failures = self.load_fundamental_df(
+                symbols, date, CFG, self.provider, self.deadline
+            )
+        else:
+            fundamental_df = self.fundamental_df.copy()
+        fundamental_df = self.append_sector(fundamental_df, symbol_df)
+        score_df = self.get_panel_score_df(fundamental_df, CFG)
+        return score_df
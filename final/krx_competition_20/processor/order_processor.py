@@ -2,6 +2,65 @@ import numpy as np
 import pandas as pd
 
 
+class ORDER_BOOK:
+    """
+    ORDER_BOOK : symbol / 주문 수량을 같은 길이의 배열로 가지는 주문 클래스
+    processor들이 만들고 merge_order가 그대로 합치며, trade_func에서만 [(symbol, 수량)]으로 변환합니다.
+    """
+
+    __slots__ = ("symbols", "qtys")
+
+    def __init__(self, symbols=(), qtys=()) -> None:
+        """
+        ORDER_BOOK의 생성자
+
+        :param symbols: 주문 symbol 배열
+        :param qtys: 주문 수량 배열 (매도는 음수)
+        """
+        self.symbols = np.asarray(symbols, dtype=str)
+        self.qtys = np.asarray(qtys, dtype=np.int64)
+
+    @classmethod
+    def from_orders(cls, orders):
+        """
+        [(symbol, 수량)] 주문으로 ORDER_BOOK을 만드는 메서드 (ORDER_BOOK이라면 그대로 반환합니다.)
+
+        :param orders: [(symbol, 수량)] 주문 또는 ORDER_BOOK
+        :return: ORDER_BOOK
+        :rtype: ORDER_BOOK
+        """
+        if isinstance(orders, cls):
+            return orders
+        if not orders:
+            return cls()
+        symbols, qtys = zip(*orders)
+        return cls(symbols, qtys)
+
+    def __len__(self) -> int:
+        return len(self.qtys)
+
+    def net(self):
+        """
+        같은 symbol의 주문 수량을 합치는 메서드 (symbol 순서로 정렬됩니다.)
+
+        :return: symbol별로 합쳐진 ORDER_BOOK
+        :rtype: ORDER_BOOK
+        """
+        symbols, inverse = np.unique(self.symbols, return_inverse=True)
+        qtys = np.zeros(len(symbols), dtype=np.int64)
+        np.add.at(qtys, inverse, self.qtys)
+        return ORDER_BOOK(symbols, qtys)
+
+    def to_list(self) -> list[tuple[str, int]]:
+        """
+        trade_func signiture의 [(symbol, 수량)]으로 변환하는 메서드
+
+        :return: [(symbol, 수량)]
+        :rtype: list[tuple[str, int]]
+        """
+        return list(zip(self.symbols.tolist(), self.qtys.tolist()))
+
+
 class BUYING_ORDER_PROCESSOR:
     """
     BUYING_ORDER_PROCESSOR : 매수주문을 생성하는 클래스
@@ -88,18 +147,18 @@ class BUYING_ORDER_PROCESSOR:
         return high_score_df
 
     @staticmethod
-    def get_order_from_df(df: pd.DataFrame) -> list:
+    def get_order_from_df(df: pd.DataFrame) -> ORDER_BOOK:
         """
-        데이터 프레임에서 signiture에 맞게 주문 list를 추출하는 메서드
+        데이터 프레임에서 주문 ORDER_BOOK을 추출하는 메서드
 
         :param pd.DataFrame df: [SYMBOL,CNT_INVEST]를 가진 데이터프레임
         """
-        orders = list(
-            df.set_index("SYMBOL")["CNT_INVEST"].astype(int).to_dict().items()
+        orders = ORDER_BOOK(
+            df["SYMBOL"].to_numpy(str), df["CNT_INVEST"].to_numpy(np.int64)
         )
         return orders
 
-    def __call__(self) -> list:
+    def __call__(self) -> ORDER_BOOK:
         """
         BUYING_ORDER_PROCESSOR의 pipeline을 진행하는 메서드
 
@@ -121,9 +180,20 @@ class BUYING_ORDER_PROCESSOR:
         return buying_order
 
 
+EXIT_REASONS = (
+    "HOLD",
+    "LOWER_LIMIT",
+    "UPPER_LIMIT",
+    "TRAILING_STOP",
+    "BREAKEVEN",
+    "TIME_EXIT",
+)  # EXIT_REASON code 순서 (여러 규칙에 해당하면 앞의 규칙을 기록합니다)
+
+
 class SELLING_ORDER_PROCESSOR:
     """
     SELLING_ORDER_PROCESSOR : 매도주문을 추출하는 클래스
+    position별 상태를 배열로 만든 뒤 고정 한계선 / trailing stop / 보유 기간 / 수수료 반영 본전 규칙을 한번에 판단합니다.
     """
 
     def __init__(
@@ -132,70 +202,214 @@ class SELLING_ORDER_PROCESSOR:
         CFG: dict = {
             "upper_limit": 9,
             "lower_limit": -3,
+            "trailing_stop": None,
+            "trailing_activation": 0,
+            "max_hold_days": None,
+            "breakeven_trigger": None,
+            "buying_fee": 0.001,
+            "selling_fee": 0.001,
+            "selling_tax": 0.002,
         },
     ) -> None:
         """
         SELLING_ORDER_PROCESSOR의 생성자
 
         :param pd.DataFrame status_df: 현재 position과 관련된 정보를 가진 데이터프레임
+            (MAX_PRICE / HOLD_DAYS가 없다면 CURRENT_PRICE / 0으로 봅니다.)
         :param dict CFG: 매도로직을 위한 한계선 dictionary
+            upper_limit / lower_limit : 익절 / 손절 수익률 한계선 (%)
+            trailing_stop : 진입 후 최고가 대비 하락률 (%), None이면 사용하지 않음
+            trailing_activation : trailing stop이 동작하는 진입 후 최고 수익률 (%)
+            max_hold_days : 최대 보유 거래일 수, None이면 사용하지 않음
+            breakeven_trigger : 진입 후 최고 수익률이 넘으면 수수료 / 세금 반영 순수익이 0 이하일 때 매도 (%), None이면 사용하지 않음
+            buying_fee / selling_fee / selling_tax : 수수료 / 세금 비율
+            (한계선 외의 규칙은 없으면 사용하지 않습니다.)
         """
         self.status_df = status_df
         self.CFG = CFG
 
+    @staticmethod
+    def get_position_arrays(status_df: pd.DataFrame) -> dict:
+        """
+        status_df에서 position별 상태를 배열로 가져오는 메서드
+
+        :param pd.DataFrame status_df: 현재 position과 관련된 정보를 가진 데이터프레임
+        :return: {QTY, TRADE_PRICE, CURRENT_PRICE, MAX_PRICE, HOLD_DAYS : np.ndarray}
+        :rtype: dict
+        """
+        current_price = status_df["CURRENT_PRICE"].to_numpy(np.float64)
+        position_arrays = {
+            "QTY": status_df["CURRENT_QTY"].to_numpy(np.int64),
+            "TRADE_PRICE": status_df["TRADE_PRICE"].to_numpy(np.float64),
+            "CURRENT_PRICE": current_price,
+            "MAX_PRICE": (
+                status_df["MAX_PRICE"].to_numpy(np.float64)
+                if "MAX_PRICE" in status_df.columns
+                else current_price
+            ),
+            "HOLD_DAYS": (
+                status_df["HOLD_DAYS"].to_numpy(np.int32)
+                if "HOLD_DAYS" in status_df.columns
+                else np.zeros(len(status_df), dtype=np.int32)
+            ),
+        }
+        return position_arrays
+
+    @staticmethod
+    def calc_profit_loss(
+        trade_price: np.ndarray, current_price: np.ndarray
+    ) -> np.ndarray:
+        """
+        수익률(%)을 계산하는 메서드
+
+        :param np.ndarray trade_price: 평균 매수가
+        :param np.ndarray current_price: 현재 가격
+        :return: 수익률 (%)
+        :rtype: np.ndarray
+        """
+        profit_loss = ((current_price - trade_price) / trade_price) * 100
+        return profit_loss
+
+    @staticmethod
+    def get_exit_reason(position_arrays: dict, CFG: dict) -> np.ndarray:
+        """
+        모든 매도 규칙을 한번에 판단하여 position별 EXIT_REASONS code를 반환하는 메서드
+
+        :param dict position_arrays: get_position_arrays의 결과
+        :param dict CFG: 매도로직을 위한 한계선 dictionary
+        :return: position별 EXIT_REASONS code (0은 보유)
+        :rtype: np.ndarray
+        """
+        trade_price = position_arrays["TRADE_PRICE"]
+        current_price = position_arrays["CURRENT_PRICE"]
+        max_price = np.maximum(position_arrays["MAX_PRICE"], current_price)
+
+        profit_loss = SELLING_ORDER_PROCESSOR.calc_profit_loss(
+            trade_price, current_price
+        )
+        max_profit_loss = SELLING_ORDER_PROCESSOR.calc_profit_loss(
+            trade_price, max_price
+        )
+        no_exit = np.zeros(len(trade_price), dtype=bool)
+
+        trailing_stop = CFG.get("trailing_stop")
+        if trailing_stop is None:
+            trailing_exit = no_exit
+        else:
+            trailing_exit = (max_profit_loss >= CFG.get("trailing_activation", 0)) & (
+                current_price <= max_price * (1 - trailing_stop / 100)
+            )
+
+        breakeven_trigger = CFG.get("breakeven_trigger")
+        if breakeven_trigger is None:
+            breakeven_exit = no_exit
+        else:
+            cost = trade_price * (1 + CFG.get("buying_fee", 0.001))
+            proceeds = current_price * (
+                1 - CFG.get("selling_fee", 0.001) - CFG.get("selling_tax", 0.002)
+            )
+            breakeven_exit = (max_profit_loss >= breakeven_trigger) & (proceeds <= cost)
+
+        max_hold_days = CFG.get("max_hold_days")
+        if max_hold_days is None:
+            time_exit = no_exit
+        else:
+            time_exit = position_arrays["HOLD_DAYS"] >= max_hold_days
+
+        exit_reason = np.select(
+            [
+                profit_loss < CFG["lower_limit"],
+                profit_loss > CFG["upper_limit"],
+                trailing_exit,
+                breakeven_exit,
+                time_exit,
+            ],
+            [1, 2, 3, 4, 5],
+            default=0,
+        ).astype(np.int8)
+        return exit_reason
+
     @staticmethod
     def append_profit_loss(status_df: pd.DataFrame) -> pd.DataFrame:
-        def calc_profit_loss(trade_price, current_price):
-            profit_loss = ((current_price - trade_price) / trade_price) * 100
-            return profit_loss
+        """
+        수익률(%)을 PROFIT_LOSS column으로 생성하는 메서드
 
-        status_df["PROFIT_LOSS"] = status_df.apply(
-            lambda x: calc_profit_loss(x.TRADE_PRICE, x.CURRENT_PRICE), axis=1
+        :param pd.DataFrame status_df: 현재 position과 관련된 정보를 가진 데이터프레임
+        """
+        status_df["PROFIT_LOSS"] = SELLING_ORDER_PROCESSOR.calc_profit_loss(
+            status_df["TRADE_PRICE"].to_numpy(np.float64),
+            status_df["CURRENT_PRICE"].to_numpy(np.float64),
         )
         return status_df
 
+    @staticmethod
+    def append_exit_reason(
+        status_df: pd.DataFrame, exit_reason: np.ndarray
+    ) -> pd.DataFrame:
+        """
+        매도 사유를 EXIT_REASON column으로 생성하는 메서드
+
+        :param pd.DataFrame status_df: 현재 position과 관련된 정보를 가진 데이터프레임
+        :param np.ndarray exit_reason: position별 EXIT_REASONS code
+        """
+        status_df["EXIT_REASON"] = np.array(EXIT_REASONS)[exit_reason]
+        return status_df
+
     @staticmethod
     def get_filter_status_df(status_df: pd.DataFrame, CFG: dict) -> pd.DataFrame:
-        filter_status_df = status_df[
-            (status_df["PROFIT_LOSS"] > CFG["upper_limit"])
-            | (status_df["PROFIT_LOSS"] < CFG["lower_limit"])
-        ]
+        """
+        매도 규칙에 해당하는 position을 추출하는 메서드
+
+        :param pd.DataFrame status_df: EXIT_REASON을 가진 데이터프레임
+        :param dict CFG: 매도로직을 위한 한계선 dictionary
+        """
+        filter_status_df = status_df[status_df["EXIT_REASON"] != EXIT_REASONS[0]]
         return filter_status_df
 
     @staticmethod
-    def get_order_from_df(df: pd.DataFrame) -> list:
+    def get_order_from_df(df: pd.DataFrame) -> ORDER_BOOK:
         """
-        데이터 프레임에서 signiture에 맞게 주문 list를 추출하는 메서드
+        데이터 프레임에서 매도 주문 ORDER_BOOK을 추출하는 메서드
 
         :param pd.DataFrame df: [SYMBOL,CURRENT_QTY]를 가진 데이터프레임
         """
-        orders = list(
-            df.set_index("SYMBOL")["CURRENT_QTY"]
-            .apply(lambda x: x * -1)
-            .astype(int)
-            .to_dict()
-            .items()
+        orders = ORDER_BOOK(
+            df["SYMBOL"].to_numpy(str), -df["CURRENT_QTY"].to_numpy(np.int64)
         )
         return orders
 
-    def __call__(self) -> list:
+    def __call__(self) -> ORDER_BOOK:
         """
         SELLING_ORDER_PROCESSOR의 pipeline을 진행하는 메서드
         """
         status_df = self.status_df
         CFG = self.CFG
 
+        position_arrays = self.get_position_arrays(status_df)
+        exit_reason = self.get_exit_reason(position_arrays, CFG)
+
         status_df = self.append_profit_loss(status_df)
+        status_df = self.append_exit_reason(status_df, exit_reason)
         filter_status_df = self.get_filter_status_df(status_df, CFG)
         selling_orders = self.get_order_from_df(filter_status_df)
 
         return selling_orders
 
 
-def merge_order(buying_orders: list, selling_orders: list) -> list[tuple[str, int]]:
-    total_order = buying_orders + selling_orders
-    total_order_df = pd.DataFrame(total_order, columns=["SYMBOL", "ORDER"])
-    symbols_and_orders = list(
-        total_order_df.groupby("SYMBOL").sum().squeeze().astype(int).to_dict().items()
+def merge_order(buying_orders, selling_orders) -> ORDER_BOOK:
+    """
+    매수 / 매도 주문을 symbol별로 합치는 함수
+
+    :param buying_orders: 매수 ORDER_BOOK 또는 [(symbol, 수량)]
+    :param selling_orders: 매도 ORDER_BOOK 또는 [(symbol, 수량)]
+    :return: symbol별로 합쳐진 ORDER_BOOK
+    :rtype: ORDER_BOOK
+    """
+    buying_orders = ORDER_BOOK.from_orders(buying_orders)
+    selling_orders = ORDER_BOOK.from_orders(selling_orders)
+    total_order = ORDER_BOOK(
+        np.concatenate([buying_orders.symbols, selling_orders.symbols]),
+        np.concatenate([buying_orders.qtys, selling_orders.qtys]),
     )
+    symbols_and_orders = total_order.net()
     return symbols_and_orders
@@ -1,8 +1,16 @@
 import os
 import json
+import datetime
+from statistics import NormalDist
+
+import numpy as np
 import pandas as pd
 
-from .data.symbol_sector_dict import get_symbol_sector_dict
+from ..loader.data_provider import DATA_PROVIDER, load_default_provider
+from ..loader.concurrent_loader import DEADLINE
+from ..loader.cache_loader import SECTOR_INDEX, load_sector_index
+from .model_processor import SCORE_PROCESSOR
+
 
 class SYMBOL_SECTOR_PROCESSOR:
     """
@@ -16,122 +24,460 @@ class SYMBOL_SECTOR_PROCESSOR:
             "sector_symbol_n": 30,
             "sample_n": 15,
         },
+        provider: DATA_PROVIDER = None,
     ) -> None:
         """
         SYMBOL_SECTOR_PROCESSOR의 생성자
 
         :param list symbols: sector_code를 찾을 symbol들
         :param dict CFG: sector_code를 찾을 symbol들
+        :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
         """
         self.symbols = symbols
         self.CFG = CFG
+        self.provider = provider or load_default_provider()
 
     @staticmethod
-    def load_symbol_sector_dict() -> dict:
+    def load_sector_index(provider: DATA_PROVIDER) -> SECTOR_INDEX:
         """
-        symbol:sector_code 딕셔너리를 읽어오는 메서드
+        symbol -> sector index를 읽어오는 메서드 (처음이라면 provider의 symbol:sector_code 딕셔너리로 build 합니다.)
 
-        :return: symbol-sector_code 딕셔너리
-        :rtype: dict
+        :param DATA_PROVIDER provider: 데이터 provider
+        :return: memory-map으로 읽은 SECTOR_INDEX
+        :rtype: SECTOR_INDEX
         """
-        symbol_sector_dict = get_symbol_sector_dict()
-        return symbol_sector_dict
+        sector_index = load_sector_index(provider)
+        return sector_index
 
     @staticmethod
-    def format_symbol_df(symbols: list) -> pd.DataFrame:
+    def get_filtered_sectors(
+        sector_index: SECTOR_INDEX, member_mask: np.ndarray, n: int
+    ) -> np.ndarray:
         """
-        symbol_df를 생성하는 메서드
+        symbol이 n개를 넘는 sector를 제공하는 메서드
 
-        :param list symbols: sector_code를 찾을 symbol들
-        :return: symbol의 데이터프레임
-        :rtype: pd.DataFrame
+        :param SECTOR_INDEX sector_index: sector index
+        :param np.ndarray member_mask: sector_code를 찾을 symbol들의 index 위치별 mask
+        :param int n: n개 이하의 symbol이 있는 sector 제거
+        :return: 필터링 된 sector code
+        :rtype: np.ndarray
         """
-        symbol_df = pd.DataFrame(symbols, columns=["SYMBOL"])
-        return symbol_df
+        member_counts = sector_index.get_member_counts(member_mask)
+        filtered_sectors = np.flatnonzero(member_counts > n)
+        return filtered_sectors
+
+    @staticmethod
+    def get_filtered_positions(
+        sector_index: SECTOR_INDEX,
+        member_mask: np.ndarray,
+        filtered_sectors: np.ndarray,
+    ) -> np.ndarray:
+        """
+        filtered_sectors에 속하는 symbol의 index 위치를 sector 순 (sector 안에서는 symbol 순)으로 제공하는 메서드
+
+        :param SECTOR_INDEX sector_index: sector index
+        :param np.ndarray member_mask: sector_code를 찾을 symbol들의 index 위치별 mask
+        :param np.ndarray filtered_sectors: filtered된 sector code
+        :return: 필터링 된 symbol의 index 위치
+        :rtype: np.ndarray
+        """
+        sector_mask = np.zeros(len(sector_index.sectors), dtype=bool)
+        sector_mask[filtered_sectors] = True
+        sector_order = sector_index.sector_order
+        keep = member_mask[sector_order] & np.repeat(sector_mask, sector_index.counts)
+        filtered_positions = np.asarray(sector_order[keep])
+        return filtered_positions
 
     @staticmethod
-    def append_sector(
-        symbol_df: pd.DataFrame, symbol_sector_dict: dict
+    def get_sampled_positions(
+        sector_index: SECTOR_INDEX,
+        filtered_positions: np.ndarray,
+        n: int,
+        seed: int = None,
+    ) -> np.ndarray:
+        """
+        각 sector별로 n개를 sampling하는 메서드
+        sector 순으로 정렬된 위치에 난수를 붙여 (sector, 난수) 순으로 정렬한 뒤 sector별 앞의 n개를 가져옵니다.
+
+        :param SECTOR_INDEX sector_index: sector index
+        :param np.ndarray filtered_positions: get_filtered_positions의 결과
+        :param int n: 샘플링 갯수
+        :param int seed: seed, None이면 매번 다른 sampling
+        :return: 샘플링 된 symbol의 index 위치
+        :rtype: np.ndarray
+        """
+        rng = np.random.default_rng(seed)
+        sector_codes = sector_index.sector_codes[filtered_positions]
+        order = np.lexsort((rng.random(len(filtered_positions)), sector_codes))
+        ranks = np.arange(len(order)) - np.searchsorted(sector_codes, sector_codes)
+        sampled_positions = filtered_positions[order][ranks < n]
+        return sampled_positions
+
+    @staticmethod
+    def format_symbol_df(
+        sector_index: SECTOR_INDEX, positions: np.ndarray
     ) -> pd.DataFrame:
         """
-        symbol_df에 sector를 추가하는 메서드
+        symbol_df를 생성하는 메서드
 
-        :param pd.DataFrame symbol_df: symbol의 데이터프레임
-        :param dict symbol_sector_dict: symbol:sector의 딕셔너리
-        :return: sector가 추가된 symbol_df
+        :param SECTOR_INDEX sector_index: sector index
+        :param np.ndarray positions: symbol의 index 위치
+        :return: [SYMBOL, SECTOR] 데이터프레임
         :rtype: pd.DataFrame
         """
-        symbol_df["SECTOR"] = symbol_df["SYMBOL"].map(symbol_sector_dict)
+        symbol_df = pd.DataFrame(
+            {
+                "SYMBOL": sector_index.symbols[positions].tolist(),
+                "SECTOR": sector_index.sectors[
+                    sector_index.sector_codes[positions]
+                ].tolist(),
+            },
+            columns=["SYMBOL", "SECTOR"],
+        )
         return symbol_df
 
+    def __call__(self) -> pd.DataFrame:
+        """
+        SYMBOL_SECTOR_PROCESSOR의 파이프라인을 제공하는 메서드
+
+        :return: 샘플링 된 symbol_df
+        :rtype: pd.DataFrame
+        """
+        symbols = self.symbols
+        CFG = self.CFG
+
+        sector_index = self.load_sector_index(self.provider)
+        member_mask = sector_index.get_member_mask(symbols)
+
+        filtered_sectors = self.get_filtered_sectors(
+            sector_index=sector_index, member_mask=member_mask, n=CFG["sector_symbol_n"]
+        )
+        filtered_positions = self.get_filtered_positions(
+            sector_index=sector_index,
+            member_mask=member_mask,
+            filtered_sectors=filtered_sectors,
+        )
+        sampled_positions = self.get_sampled_positions(
+            sector_index=sector_index,
+            filtered_positions=filtered_positions,
+            n=CFG["sample_n"],
+            seed=CFG.get("seed"),
+        )
+        sampled_symbol_df = self.format_symbol_df(sector_index, sampled_positions)
+        return sampled_symbol_df
+
+
+class ADAPTIVE_SECTOR_SAMPLER(SYMBOL_SECTOR_PROCESSOR):
+    """
+    ADAPTIVE_SECTOR_SAMPLER : sector별로 fundamental을 batch 단위로 호출하며,
+    PBR의 신뢰구간이 목표 폭(평균의 error_ratio)에 도달한 sector는 sampling을 멈추는 클래스
+    """
+
+    def __init__(
+        self,
+        symbols: list,
+        date: datetime.date,
+        CFG: dict = {
+            "sector_symbol_n": 25,
+            "min_n": 10,
+            "batch_n": 5,
+            "max_n": 20,
+            "error_ratio": 0.05,
+            "confidence": 0.9,
+            "max_workers": 8,
+            "timeout": 30,
+            "seed": None,
+        },
+        provider: DATA_PROVIDER = None,
+        deadline: DEADLINE = None,
+    ) -> None:
+        """
+        ADAPTIVE_SECTOR_SAMPLER의 생성자
+
+        :param list symbols: sector_code를 찾을 symbol들
+        :param datetime.date date: 매매일 날짜
+        :param dict CFG: sector 최소 symbol 수(sector_symbol_n) / 첫 batch 크기(min_n) / 이후 batch 크기(batch_n)
+            / sector별 최대 sampling 수(max_n, None이면 신뢰구간이 목표 폭에 도달하거나 sector의 symbol을 모두 호출할 때까지)
+            / 목표 오차 비율(error_ratio) / 신뢰수준(confidence)
+            / 동시 호출 수(max_workers) / symbol별 timeout(초) / seed
+        :param DATA_PROVIDER provider: 데이터 provider, None이면 기본 provider를 사용합니다.
+        :param DEADLINE deadline: 시간 예산, 임박하면 sampling을 멈추고 호출한 symbol까지만 반환합니다.
+
+        :attr pd.DataFrame fundamental_df: sampling하며 호출한 fundamental 데이터 입니다. (PANEL_SCORE_PROCESSOR에 전달)
+        :attr pd.DataFrame sector_stats_df: sector별 [N, FETCHED_N, MEAN, STD, HALF_WIDTH, CONVERGED, CAPPED] 입니다.
+            CAPPED는 수렴하지 못한 채 max_n (또는 sector의 모든 symbol)에서 멈춘 sector 입니다. (목표 오차를 보장하지 않습니다.)
+        :attr list failures: fundamental 호출에 실패한 [(symbol, exception)] 입니다.
+        """
+        super().__init__(symbols, CFG, provider)
+        self.date = date
+        self.deadline = deadline
+        self.fundamental_df = None
+        self.sector_stats_df = None
+        self.failures = list()
+
     @staticmethod
-    def get_filtered_sectors(symbol_df: pd.DataFrame, n: int) -> list:
+    def get_sector_queue_dict(
+        sector_index: SECTOR_INDEX, filtered_positions: np.ndarray, seed: int
+    ) -> dict:
         """
-        symbol_df를 필터링 하여 sector를 제공하는 메서드
+        sector별 symbol을 무작위 순서로 섞어 호출 대기열을 만드는 메서드
 
-        :param pd.DataFrame symbol_df: symbol의 데이터프레임
-        :param int n: n개 이하의 symbol이 있는 sector 제거
-        :return: 필터링 된 symbol_df의 sector
+        :param SECTOR_INDEX sector_index: sector index
+        :param np.ndarray filtered_positions: sector 순으로 정렬된 filter된 symbol의 index 위치
+        :param int seed: seed, None이면 매번 다른 순서
+        :return: {sector : 섞인 symbol list}
+        :rtype: dict
+        """
+        rng = np.random.default_rng(seed)
+        sector_codes = sector_index.sector_codes[filtered_positions]
+        bounds = np.flatnonzero(np.diff(sector_codes)) + 1
+
+        sector_queue_dict = dict()
+        for positions in np.split(filtered_positions, bounds):
+            if len(positions) == 0:
+                continue
+            sector = sector_index.sectors[sector_index.sector_codes[positions[0]]]
+            sector_queue_dict[sector.item()] = list(
+                rng.permutation(sector_index.symbols[positions])
+            )
+        return sector_queue_dict
+
+    @staticmethod
+    def update_running_stats(stats: list, values: list) -> list:
+        """
+        [N, MEAN, M2] running 통계에 values를 추가하는 메서드 (Welford)
+
+        :param list stats: [N, MEAN, M2]
+        :param list values: 추가할 값들
+        :return: 갱신된 [N, MEAN, M2]
         :rtype: list
         """
-        symbol_groupby = symbol_df.groupby("SECTOR")
-        filtered_sectors = symbol_groupby.count()["SYMBOL"][
-            symbol_groupby.count()["SYMBOL"] > n
-        ].index
-        return filtered_sectors
+        n, mean, m2 = stats
+        for value in values:
+            n += 1
+            delta = value - mean
+            mean += delta / n
+            m2 += delta * (value - mean)
+        return [n, mean, m2]
 
     @staticmethod
-    def get_filtered_symbol_df(
-        symbol_df: pd.DataFrame, filtered_sectors: list
-    ) -> pd.DataFrame:
+    def get_half_width(stats: list, z: float) -> float:
         """
-        symbol_df를 필터링 하는 메서드
+        running 통계로 평균의 신뢰구간 반폭을 계산하는 메서드
 
-        :param pd.DataFrame symbol_df: symbol의 데이터프레임
-        :param list filtered_sectors: filtered된 sector들
-        :return: 필터링 된 symbol_df
-        :rtype: pd.DataFrame
+        :param list stats: [N, MEAN, M2]
+        :param float z: 신뢰수준의 z 값
+        :return: z * std / sqrt(N), N < 2라면 inf
+        :rtype: float
         """
-        filtered_symbol_df = symbol_df[symbol_df["SECTOR"].isin(filtered_sectors)]
-        return filtered_symbol_df
+        n, _, m2 = stats
+        if n < 2:
+            return float("inf")
+        half_width = z * np.sqrt(m2 / (n - 1)) / np.sqrt(n)
+        return float(half_width)
 
     @staticmethod
-    def get_sampled_symbol_df(filtered_symbol_df: pd.DataFrame, n: int) -> pd.DataFrame:
+    def get_sample_values(fundamental_df: pd.DataFrame) -> pd.Series:
         """
-        각 sector별로 n개를 sampling하는 메서드
+        fundamental_df에서 양수인 PBR을 추출하는 메서드 (PANEL_SCORE_PROCESSOR와 같은 PBR)
 
-        :param pd.DataFrame filtered_symbol_df: filter된 symbol_df
-        :param int n: 샘플링 갯수
-        :return: 샘플링 된 symbol_df
+        :param pd.DataFrame fundamental_df: [SYMBOL, MARKETCAP, EQUITY]를 가진 데이터프레임
+        :return: SYMBOL index의 PBR series
+        :rtype: pd.Series
+        """
+        pbr = fundamental_df["MARKETCAP"] / fundamental_df["EQUITY"]
+        pbr.index = fundamental_df["SYMBOL"].values
+        return pbr[pbr > 0]
+
+    def get_sector_max_n(self, queue: list) -> int:
+        """
+        sector의 최대 sampling 수를 반환하는 메서드
+
+        :param list queue: sector의 섞인 symbol list
+        :return: min(max_n, sector symbol 수), max_n이 None이면 sector symbol 수
+        :rtype: int
+        """
+        max_n = self.CFG["max_n"]
+        if max_n is None:
+            return len(queue)
+        return min(max_n, len(queue))
+
+    def get_batch_symbols(
+        self, active_sectors: list, sector_queue_dict: dict, fetched_n_dict: dict
+    ) -> list:
+        """
+        sampling 중인 sector들의 다음 batch symbol을 모으는 메서드
+        첫 batch는 min_n개, 이후는 batch_n개 이며 sector별 최대 sampling 수(get_sector_max_n)를 넘지 않습니다.
+
+        :param list active_sectors: sampling 중인 sector들
+        :param dict sector_queue_dict: {sector : 섞인 symbol list}
+        :param dict fetched_n_dict: {sector : 호출한 symbol 수}
+        :return: 이번에 호출할 symbol들
+        :rtype: list
+        """
+        CFG = self.CFG
+        batch_symbols = list()
+        for sector in active_sectors:
+            fetched_n = fetched_n_dict[sector]
+            batch_n = CFG["min_n"] if fetched_n == 0 else CFG["batch_n"]
+            queue = sector_queue_dict[sector]
+            batch_n = min(batch_n, self.get_sector_max_n(queue) - fetched_n)
+            batch_symbols += queue[fetched_n : fetched_n + batch_n]
+            fetched_n_dict[sector] = fetched_n + batch_n
+        return batch_symbols
+
+    def is_converged(self, stats: list, z: float) -> bool:
+        """
+        sector의 신뢰구간 반폭이 |평균| * error_ratio 이하인지 확인하는 메서드
+
+        :param list stats: [N, MEAN, M2]
+        :param float z: 신뢰수준의 z 값
+        :return: 수렴 여부
+        :rtype: bool
+        """
+        n, mean, _ = stats
+        if n < self.CFG["min_n"]:
+            return False
+        return self.get_half_width(stats, z) <= self.CFG["error_ratio"] * abs(mean)
+
+    def format_sector_stats_df(
+        self,
+        stats_dict: dict,
+        fetched_n_dict: dict,
+        sector_queue_dict: dict,
+        z: float,
+    ) -> pd.DataFrame:
+        """
+        sector별 sampling 결과를 데이터프레임으로 만드는 메서드
+
+        :param dict stats_dict: {sector : [N, MEAN, M2]}
+        :param dict fetched_n_dict: {sector : 호출한 symbol 수}
+        :param dict sector_queue_dict: {sector : 섞인 symbol list}
+        :param float z: 신뢰수준의 z 값
+        :return: [SECTOR, N, FETCHED_N, MEAN, STD, HALF_WIDTH, CONVERGED, CAPPED] 데이터프레임
         :rtype: pd.DataFrame
         """
-        sampled_symbol_df = filtered_symbol_df.groupby("SECTOR").sample(n)
-        return sampled_symbol_df
+        sector_stats_df = pd.DataFrame(
+            [
+                {
+                    "SECTOR": sector,
+                    "N": stats[0],
+                    "FETCHED_N": fetched_n_dict[sector],
+                    "MEAN": stats[1],
+                    "STD": np.sqrt(stats[2] / (stats[0] - 1))
+                    if stats[0] > 1
+                    else np.nan,
+                    "HALF_WIDTH": self.get_half_width(stats, z),
+                    "CONVERGED": self.is_converged(stats, z),
+                    "CAPPED": not self.is_converged(stats, z)
+                    and fetched_n_dict[sector]
+                    >= self.get_sector_max_n(sector_queue_dict[sector]),
+                }
+                for sector, stats in stats_dict.items()
+            ],
+            columns=[
+                "SECTOR",
+                "N",
+                "FETCHED_N",
+                "MEAN",
+                "STD",
+                "HALF_WIDTH",
+                "CONVERGED",
+                "CAPPED",
+            ],
+        )
+        return sector_stats_df
 
     def __call__(self) -> pd.DataFrame:
         """
-        SYMBOL_SECTOR_PROCESSOR의 파이프라인을 제공하는 메서드
+        ADAPTIVE_SECTOR_SAMPLER의 파이프라인을 제공하는 메서드
+        sampling 중인 모든 sector의 batch를 한번에 동시 호출하고, 수렴했거나
+        symbol을 모두 호출한 sector는 다음 batch에서 제외합니다.
 
-        :return: 샘플링 된 symbol_df
+        :return: 호출한 [SYMBOL, SECTOR] symbol_df
         :rtype: pd.DataFrame
         """
         symbols = self.symbols
+        date = self.date
         CFG = self.CFG
+        z = NormalDist().inv_cdf((1 + CFG["confidence"]) / 2)
 
-        symbol_sector_dict = self.load_symbol_sector_dict()
-
-        symbol_df = self.format_symbol_df(symbols=symbols)
-        symbol_df = self.append_sector(
-            symbol_df=symbol_df, symbol_sector_dict=symbol_sector_dict
-        )
+        sector_index = self.load_sector_index(self.provider)
+        member_mask = sector_index.get_member_mask(symbols)
 
         filtered_sectors = self.get_filtered_sectors(
-            symbol_df=symbol_df, n=CFG["sector_symbol_n"]
+            sector_index=sector_index, member_mask=member_mask, n=CFG["sector_symbol_n"]
+        )
+        filtered_positions = self.get_filtered_positions(
+            sector_index=sector_index,
+            member_mask=member_mask,
+            filtered_sectors=filtered_sectors,
         )
-        filtered_symbol_df = self.get_filtered_symbol_df(
-            symbol_df=symbol_df, filtered_sectors=filtered_sectors
+        sector_queue_dict = self.get_sector_queue_dict(
+            sector_index, filtered_positions, CFG["seed"]
         )
-        sampled_symbol_df = self.get_sampled_symbol_df(
-            filtered_symbol_df=filtered_symbol_df, n=CFG["sample_n"]
+
+        stats_dict = {sector: [0, 0.0, 0.0] for sector in sector_queue_dict}
+        fetched_n_dict = {sector: 0 for sector in sector_queue_dict}
+        fundamental_df_list = list()
+        self.failures = list()
+
+        active_sectors = sorted(sector_queue_dict)
+        while active_sectors:
+            batch_symbols = self.get_batch_symbols(
+                active_sectors, sector_queue_dict, fetched_n_dict
+            )
+            fundamental_df, failures = SCORE_PROCESSOR.load_fundamental_df(
+                batch_symbols, date, CFG, self.provider, self.deadline
+            )
+            fundamental_df_list.append(fundamental_df)
+            self.failures += failures
+
+            sample_values = self.get_sample_values(fundamental_df)
+            sample_sectors = sector_index.sectors[
+                sector_index.sector_codes[
+                    sector_index.get_positions(sample_values.index)
+                ]
+            ]
+            for sector in np.unique(sample_sectors).tolist():
+                stats_dict[sector] = self.update_running_stats(
+                    stats_dict[sector],
+                    sample_values.values[sample_sectors == sector].tolist(),
+                )
+
+            if self.deadline is not None and self.deadline.is_near():
+                break
+            active_sectors = [
+                sector
+                for sector in active_sectors
+                if not self.is_converged(stats_dict[sector], z)
+                and fetched_n_dict[sector]
+                < self.get_sector_max_n(sector_queue_dict[sector])
+            ]
+
+        fundamental_df_list = [df for df in fundamental_df_list if not df.empty]
+        if fundamental_df_list:
+            self.fundamental_df = pd.concat(fundamental_df_list, ignore_index=True)
+        else:
+            self.fundamental_df = pd.DataFrame(
+                columns=[
+                    "SYMBOL",
+                    "CLOSE",
+                    "MARKETCAP",
+                    "NETPROFIT",
+                    "ASSETS",
+                    "EQUITY",
+                ]
+            )
+        self.sector_stats_df = self.format_sector_stats_df(
+            stats_dict, fetched_n_dict, sector_queue_dict, z
         )
+
+        sampled_symbols = [
+            symbol
+            for sector, queue in sector_queue_dict.items()
+            for symbol in queue[: fetched_n_dict[sector]]
+        ]
+        sampled_positions = np.sort(sector_index.get_positions(sampled_symbols))
+        sampled_symbol_df = self.format_symbol_df(sector_index, sampled_positions)
         return sampled_symbol_df
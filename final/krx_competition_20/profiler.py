@@ -0,0 +1,298 @@
+# PIPELINE_PROFILER
+import os
+import io
+import json
+import time
+import pstats
+import logging
+import cProfile
+import inspect
+import functools
+import contextlib
+import tracemalloc
+import datetime as dt
+
+DEFAULT_PROFILE_DIR = os.environ.get("KRX20_PROFILE_DIR")
+
+
+class PIPELINE_PROFILER:
+    """
+    PIPELINE_PROFILER : loader / processor의 __call__ pipeline과 각 단계 메서드를 감싸
+    wall time / row 수 (입력, 출력) / 메모리 할당 변화량을 기록하는 클래스
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger = logging.getLogger("profiler"),
+        CFG: dict = {
+            "trace_memory": False,
+            "capture_dir": DEFAULT_PROFILE_DIR,
+            "capture_top_n": 50,
+        },
+    ) -> None:
+        """
+        PIPELINE_PROFILER의 생성자
+
+        :param logging.Logger logger: 기록을 남길 logger (stage는 INFO, 단계는 DEBUG)
+        :param dict CFG: trace_memory (tracemalloc으로 할당 변화량 측정)
+            / capture_dir (일별 cProfile / tracemalloc 결과 저장 경로, None이면 저장하지 않음, 기본값은 KRX20_PROFILE_DIR)
+            / capture_top_n (tracemalloc 결과 저장 줄 수)
+
+        :attr list records: [{STAGE, STEP, SECONDS, ROWS_IN, ROWS_OUT, ALLOC_KB}] 기록 입니다.
+        """
+        self.logger = logger
+        self.CFG = CFG
+        self.records = list()
+        self.date = None
+        self.profile = None
+        self.started_tracemalloc = False
+        self.started_at = None
+
+    @staticmethod
+    def count_rows(value) -> int:
+        """
+        데이터프레임 / list / 딕셔너리 등의 row 수를 세는 메서드
+        tuple은 첫번째 값의 row 수를 사용합니다. (ex. (fundamental_df, failures))
+
+        :param value: row 수를 셀 값
+        :return: row 수, 셀 수 없다면 None
+        :rtype: int
+        """
+        if isinstance(value, tuple) and value:
+            value = value[0]
+        if isinstance(value, (str, bytes)) or not hasattr(value, "__len__"):
+            return None
+        try:
+            return len(value)
+        except TypeError:
+            return None
+
+    def get_rows_in(self, args: tuple, kwargs: dict) -> int:
+        """
+        호출 인자 중 row 수를 셀 수 있는 첫번째 값의 row 수를 반환하는 메서드
+
+        :param tuple args: 위치 인자
+        :param dict kwargs: keyword 인자
+        :return: 입력 row 수, 없다면 None
+        :rtype: int
+        """
+        for value in list(args) + list(kwargs.values()):
+            rows = self.count_rows(value)
+            if rows is not None:
+                return rows
+        return None
+
+    @staticmethod
+    def get_traced_kb() -> float:
+        """
+        tracemalloc이 추적 중인 현재 할당량(KB)을 반환하는 메서드
+
+        :return: 현재 할당량 (KB), 추적 중이 아니라면 None
+        :rtype: float
+        """
+        if not tracemalloc.is_tracing():
+            return None
+        return tracemalloc.get_traced_memory()[0] / 1024
+
+    def record(self, stage: str, step: str, func, args: tuple, kwargs: dict) -> object:
+        """
+        func를 실행하며 wall time / row 수 / 할당 변화량을 기록하는 메서드
+
+        :param str stage: stage 이름
+        :param str step: 단계 메서드 이름, stage 전체라면 None
+        :param callable func: 실행할 함수
+        :param tuple args: 위치 인자
+        :param dict kwargs: keyword 인자
+        :return: func의 결과
+        """
+        rows_in = self.get_rows_in(args, kwargs)
+        before_kb = self.get_traced_kb()
+        started_at = time.perf_counter()
+
+        result = func(*args, **kwargs)
+
+        seconds = time.perf_counter() - started_at
+        after_kb = self.get_traced_kb()
+        record = {
+            "STAGE": stage,
+            "STEP": step,
+            "SECONDS": seconds,
+            "ROWS_IN": rows_in,
+            "ROWS_OUT": self.count_rows(result),
+            "ALLOC_KB": (
+                None if before_kb is None or after_kb is None else after_kb - before_kb
+            ),
+        }
+        self.records.append(record)
+
+        message = (
+            f"[profile] {stage}{'.' + step if step else ''} : {seconds:.3f}s"
+            f" / rows {record['ROWS_IN']} -> {record['ROWS_OUT']}"
+        )
+        if record["ALLOC_KB"] is not None:
+            message += f" / alloc {record['ALLOC_KB']:+,.0f}KB"
+        if step:
+            self.logger.debug(message)
+        else:
+            self.logger.info(message)
+        return result
+
+    def wrap(self, stage: str, obj: object) -> object:
+        """
+        obj의 단계 메서드들 (public method / staticmethod)을 기록하는 함수로 감싸는 메서드
+        pipeline이 self.step(...)으로 단계를 호출하므로 instance 속성으로 덮어씁니다.
+
+        :param str stage: stage 이름
+        :param object obj: loader / processor instance
+        :return: 단계 메서드가 감싸진 obj
+        :rtype: object
+        """
+        for cls in type(obj).__mro__:
+            if cls is object:
+                continue
+            for name in cls.__dict__:
+                if name.startswith("_") or name in obj.__dict__:
+                    continue
+                attr = getattr(obj, name)
+                if not (inspect.isfunction(attr) or inspect.ismethod(attr)):
+                    continue
+
+                @functools.wraps(attr)
+                def step(*args, _name=name, _attr=attr, **kwargs):
+                    return self.record(stage, _name, _attr, args, kwargs)
+
+                setattr(obj, name, step)
+        return obj
+
+    def run(self, stage: str, func, *args, **kwargs) -> object:
+        """
+        stage 하나를 실행하며 기록하는 메서드
+        func가 loader / processor instance라면 단계 메서드도 함께 기록합니다.
+
+        :param str stage: stage 이름
+        :param callable func: loader / processor instance 또는 함수
+        :return: func의 결과
+        """
+        if not inspect.isroutine(func):
+            func = self.wrap(stage, func)
+        return self.record(stage, None, func, args, kwargs)
+
+    def start(self, date: dt.date) -> None:
+        """
+        하루치 기록을 시작하는 메서드
+        capture_dir이 있다면 cProfile / tracemalloc 수집을 시작합니다.
+
+        :param datetime.date date: 현재 날짜
+        """
+        CFG = self.CFG
+        self.date = date
+        self.records = list()
+        self.started_at = time.perf_counter()
+
+        if (CFG["trace_memory"] or CFG["capture_dir"]) and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracemalloc = True
+
+        if CFG["capture_dir"]:
+            if self.profile is not None:
+                self.profile.disable()
+            self.profile = cProfile.Profile()
+            try:
+                self.profile.enable()
+            except ValueError as e:
+                self.logger.warning(f"[profile] cProfile is not available : {e!r}")
+                self.profile = None
+
+    def get_summary(self) -> dict:
+        """
+        stage별 wall time 합계를 반환하는 메서드
+
+        :return: {stage : 초}
+        :rtype: dict
+        """
+        summary = dict()
+        for record in self.records:
+            if record["STEP"] is None:
+                summary[record["STAGE"]] = (
+                    summary.get(record["STAGE"], 0.0) + record["SECONDS"]
+                )
+        return summary
+
+    def dump_capture(self, capture_dir: str) -> None:
+        """
+        하루치 cProfile / tracemalloc / 단계 기록을 capture_dir에 저장하는 메서드
+        {date}.prof (pstats), {date}.tracemalloc.txt, {date}.records.json
+
+        :param str capture_dir: 저장 경로
+        """
+        os.makedirs(capture_dir, exist_ok=True)
+        prefix = os.path.join(capture_dir, str(self.date))
+
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile.dump_stats(f"{prefix}.prof")
+            self.profile = None
+
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            top_stats = snapshot.statistics("lineno")[: self.CFG["capture_top_n"]]
+            with open(f"{prefix}.tracemalloc.txt", "w") as f:
+                f.write("\n".join(str(stat) for stat in top_stats))
+
+        with open(f"{prefix}.records.json", "w") as f:
+            json.dump(self.records, f, indent=2, ensure_ascii=False)
+
+    def stop(self) -> dict:
+        """
+        하루치 기록을 마치고 stage별 요약을 logger로 남기는 메서드
+
+        :return: {stage : 초}
+        :rtype: dict
+        """
+        CFG = self.CFG
+        total_seconds = time.perf_counter() - self.started_at
+
+        if CFG["capture_dir"]:
+            self.dump_capture(CFG["capture_dir"])
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+            self.started_tracemalloc = False
+
+        summary = self.get_summary()
+        self.logger.info(
+            f"[profile] {self.date} : total {total_seconds:.3f}s | "
+            + " | ".join(
+                f"{stage} {seconds:.3f}s" for stage, seconds in summary.items()
+            )
+        )
+        return summary
+
+    @contextlib.contextmanager
+    def profile_day(self, date: dt.date):
+        """
+        하루치 기록을 start / stop으로 감싸는 context manager 메서드
+        stage에서 예외가 나도 stop을 호출하므로 cProfile / tracemalloc이 켜진 채로 남지 않습니다. (다음 날 start 실패 방지)
+
+        :param datetime.date date: 현재 날짜
+        :return: PIPELINE_PROFILER
+        :rtype: PIPELINE_PROFILER
+        """
+        self.start(date)
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    @staticmethod
+    def format_profile(path: str, top_n: int = 30) -> str:
+        """
+        저장된 cProfile 결과를 cumulative time 순으로 출력 문자열로 만드는 메서드
+
+        :param str path: .prof 경로
+        :param int top_n: 출력할 함수 수
+        :return: pstats 출력 문자열
+        :rtype: str
+        """
+        stream = io.StringIO()
+        pstats.Stats(path, stream=stream).sort_stats("cumulative").print_stats(top_n)
+        return stream.getvalue()
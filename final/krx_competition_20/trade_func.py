@@ -4,18 +4,49 @@ import logging
 import datetime as dt
 
 import pandas as pd
-import kquant as kq
 from sklearn.preprocessing import MinMaxScaler
 
-from .loader.static_loader import STATUS_LOADER
+from .profiler import PIPELINE_PROFILER
+from .loader.data_provider import DATA_PROVIDER
+from .loader.concurrent_loader import DEADLINE, DEADLINE_EXCEEDED
+from .loader.static_loader import PORTFOLIO_LEDGER, load_portfolio_ledger
 from .loader.api_loader import SYMBOL_LOADER, FUNDAMENTAL_LOADER
 
-from .processor.sector_processor import SYMBOL_SECTOR_PROCESSOR
-from .processor.model_processor import PBR_PROCESSOR, PER_PROCESSOR
-from .processor.model_processor import SCORE_PROCESSOR
+from .processor.sector_processor import SYMBOL_SECTOR_PROCESSOR, ADAPTIVE_SECTOR_SAMPLER
+from .processor.model_processor import PANEL_SCORE_PROCESSOR
 
 from .processor.order_processor import BUYING_ORDER_PROCESSOR, SELLING_ORDER_PROCESSOR
-from .processor.order_processor import merge_order
+from .processor.order_processor import ORDER_BOOK, merge_order
+
+TRADE_FUNC_CFG = {
+    "cash_percentage": 0.75,  # 1일 투자 금액 (보유 현금 * 0.75)
+    "buying_order_n": None,  # 1일 구매 stock 종류수
+    "adaptive_sampling": False,  # sector별 PBR 신뢰구간이 수렴하면 sampling 중단 (sample_n에서 멈춘 sector는 CAPPED)
+    "time_budget": 25 * 60,  # 30분 러닝타임 제한 안의 시간 예산 (초)
+    "upper_limit": 8,  # 익절 수익률 (%)
+    "lower_limit": -3,  # 손절 수익률 (%)
+    "pbr_ratio": 1,  # SCORE의 PBR weight
+    "per_ratio": 0.3,  # SCORE의 PER weight
+    "sector_symbol_n": 25,  # sector 최소 symbol 수
+    "sample_n": 20,  # sector별 sampling 수 (adaptive_sampling이면 최대 sampling 수, None이면 수렴할 때까지)
+    "seed": None,  # sampling seed, None이면 매번 다른 sampling (날짜별 seed는 seed와 날짜로 만듭니다)
+    "point_in_time": False,  # 공시 데이터를 POINT_IN_TIME_PANEL에서 as-of로 찾음 (backtest용, 처음 사용할 때 build)
+}
+
+
+def get_day_seed(seed: int, date: dt.date) -> int:
+    """
+    seed와 날짜로 그 날의 sampling seed를 만드는 함수
+    seed가 이웃한 run끼리 날짜만 밀린 같은 sampling을 하지 않도록 문자열로 섞습니다.
+
+    :param int seed: run의 seed, None이면 None
+    :param datetime.date date: 현재 날짜
+    :return: 날짜별 seed
+    :rtype: int
+    """
+    if seed is None:
+        return None
+    return random.Random(f"{seed}-{date.isoformat()}").getrandbits(32)
 
 
 def trade_func(
@@ -23,68 +54,161 @@ def trade_func(
     dict_df_result: dict[str, pd.DataFrame],
     dict_df_position: dict[str, pd.DataFrame],
     logger: logging.Logger,
+    provider: DATA_PROVIDER = None,
+    profiler: PIPELINE_PROFILER = None,
+    deadline: DEADLINE = None,
+    ledger: PORTFOLIO_LEDGER = None,
+    CFG: dict = None,
 ) -> list[tuple[str, int]]:
     """
-    CFG : trade_fun의 파라미터 조정
-    """
-    CFG = {
-        "cash_percentage": 0.75,  # 1일 투자 금액 (보유 현금 * 0.75)
-        "buying_order_n": None,  # 1일 구매 stock 종류수
-    }
-    """
-    STATUS_LOADER
+    CFG : trade_fun의 파라미터 조정, 주어진 key만 TRADE_FUNC_CFG를 덮어씁니다. (parameter_search용)
+    provider : 데이터 provider, None이면 kquant를 사용합니다. (benchmark / backtest용)
+    profiler : stage별 기록용 profiler, None이면 logger로 기록하는 기본 profiler를 사용합니다.
+    deadline : 시간 예산, None이면 CFG["time_budget"]으로 만듭니다. 임박하면 fundamental 호출을 취소하고 준비된 symbol로 매수 주문을 만듭니다.
+    ledger : 호출 사이에 유지되는 portfolio 상태, None이면 process 단위로 공유하는 기본 ledger를 사용합니다.
     """
-    status_loader = STATUS_LOADER(dict_df_result, dict_df_position)
+    CFG = {**TRADE_FUNC_CFG, **(CFG or {})}
+    seed = get_day_seed(CFG["seed"], date)
+    deadline = deadline or DEADLINE(CFG["time_budget"])
+    profiler = profiler or PIPELINE_PROFILER(logger)
+    with profiler.profile_day(date):
+        """
+        PORTFOLIO_LEDGER
+        당일 추가된 결과 row / 체결만 반영합니다. 입력이 맞지 않으면 STATUS_LOADER 방식으로 다시 만듭니다.
+        """
+        ledger = ledger or load_portfolio_ledger()
+        profiler.run(
+            "PORTFOLIO_LEDGER", ledger.update, dict_df_result, dict_df_position
+        )
 
-    current_cash = status_loader.get_current_cash()
-    invest_money = current_cash * CFG["cash_percentage"]
+        current_cash = ledger.get_current_cash()
+        invest_money = current_cash * CFG["cash_percentage"]
 
-    status_df = status_loader.get_status_df()
-    """
-    SYMBOL_LOADER
-    """
-    symbol_loader = SYMBOL_LOADER()
-    total_symbols = symbol_loader()
+        status_df = ledger.get_status_df()
+        """
+        SELLING_ORDER_PROCESSOR
+        status_df만 사용하므로 fundamental 호출이 늦어져도 익절 / 손절 주문은 잃지 않도록 먼저 진행합니다.
+        """
+        selling_order_processor = SELLING_ORDER_PROCESSOR(
+            status_df,
+            {
+                "upper_limit": CFG["upper_limit"],
+                "lower_limit": CFG["lower_limit"],
+                "trailing_stop": None,  # 진입 후 최고가 대비 하락률 (%)
+                "trailing_activation": 0,
+                "max_hold_days": None,  # 최대 보유 거래일 수
+                "breakeven_trigger": None,  # 최고 수익률이 넘으면 본전 이하에서 매도 (%)
+                "buying_fee": 0.001,
+                "selling_fee": 0.001,
+                "selling_tax": 0.002,
+            },
+        )
+        selling_orders = profiler.run(
+            "SELLING_ORDER_PROCESSOR", selling_order_processor
+        )
+        """
+        SYMBOL_LOADER
+        """
+        symbol_loader = SYMBOL_LOADER(provider)
+        total_symbols = profiler.run("SYMBOL_LOADER", symbol_loader)
 
-    """
-    SYMBOL_SECTOR_PROCESSOR
-    """
-    symbol_sector_processor = SYMBOL_SECTOR_PROCESSOR(
-        total_symbols,
-        {
-            "sector_symbol_n": 25,
-            "sample_n": 20,
-        },
-    )
-    sampled_symbol_df = symbol_sector_processor()
+        """
+        SYMBOL_SECTOR_PROCESSOR / ADAPTIVE_SECTOR_SAMPLER
+        """
+        if CFG["adaptive_sampling"]:
+            symbol_sector_processor = ADAPTIVE_SECTOR_SAMPLER(
+                total_symbols,
+                date,
+                {
+                    "sector_symbol_n": CFG["sector_symbol_n"],
+                    "min_n": min(10, CFG["sample_n"] or 10),
+                    "batch_n": 5,
+                    "max_n": CFG["sample_n"],
+                    "error_ratio": 0.05,
+                    "confidence": 0.9,
+                    "max_workers": 8,
+                    "timeout": 30,
+                    "seed": seed,
+                    "point_in_time": CFG["point_in_time"],
+                },
+                provider,
+                deadline,
+            )
+            sampled_symbol_df = profiler.run(
+                "ADAPTIVE_SECTOR_SAMPLER", symbol_sector_processor
+            )
+            fundamental_df = symbol_sector_processor.fundamental_df
+            failures = symbol_sector_processor.failures
 
-    """
-    SCORE_PROCESSOR
-    """
-    sectors = sorted(set(sampled_symbol_df["SECTOR"]))
+            sector_stats_df = symbol_sector_processor.sector_stats_df
+            logger.info(
+                f"adaptive sampling : {sector_stats_df['FETCHED_N'].sum()} symbols"
+                f" / {sector_stats_df['CONVERGED'].sum()} of {len(sector_stats_df)} sectors converged"
+                f" / {sector_stats_df['CAPPED'].sum()} capped at sample_n without converging"
+            )
+        else:
+            symbol_sector_processor = SYMBOL_SECTOR_PROCESSOR(
+                total_symbols,
+                {
+                    "sector_symbol_n": CFG["sector_symbol_n"],
+                    "sample_n": CFG["sample_n"],
+                    "seed": seed,
+                },
+                provider,
+            )
+            sampled_symbol_df = profiler.run(
+                "SYMBOL_SECTOR_PROCESSOR", symbol_sector_processor
+            )
+            fundamental_df = None
+            failures = list()
 
-    score_df_list = list()
-    for sector in sectors:
-        _sector_symbol_df = sampled_symbol_df[sampled_symbol_df["SECTOR"] == sector]
-        _symbols = sorted(set(_sector_symbol_df["SYMBOL"]))
+        """
+        PANEL_SCORE_PROCESSOR
+        """
+        panel_score_processor = PANEL_SCORE_PROCESSOR(
+            sampled_symbol_df,
+            date,
+            {
+                "pbr_ratio": CFG["pbr_ratio"],
+                "per_ratio": CFG["per_ratio"],
+                "max_workers": 8,
+                "timeout": 30,
+                "point_in_time": CFG["point_in_time"],
+            },
+            provider=provider,
+            fundamental_df=fundamental_df,
+            deadline=deadline,
+        )
+        score_df = profiler.run("PANEL_SCORE_PROCESSOR", panel_score_processor)
 
-        score_processor = SCORE_PROCESSOR(_symbols, date)
-        _score_df = score_processor()
-        score_df_list.append(_score_df)
+        failures = failures + panel_score_processor.failures
+        deadline_symbols = [
+            _symbol
+            for _symbol, _error in failures
+            if isinstance(_error, DEADLINE_EXCEEDED)
+        ]
+        for _symbol, _error in failures:
+            if not isinstance(_error, DEADLINE_EXCEEDED):
+                logger.warning(f"fundamental fetch failed : {_symbol} : {_error!r}")
+        if deadline_symbols:
+            logger.warning(
+                f"deadline : {len(deadline_symbols)} fetches cancelled"
+                f" / {len(score_df)} scored symbols / {deadline.get_remaining():.1f}s left"
+            )
+        """
+        BUYING_ORDER_PROCESSOR
+        """
+        if score_df.empty:
+            buying_orders = ORDER_BOOK()
+        else:
+            buying_order_processor = BUYING_ORDER_PROCESSOR(
+                score_df, invest_money, status_df, CFG["buying_order_n"]
+            )
+            buying_orders = profiler.run(
+                "BUYING_ORDER_PROCESSOR", buying_order_processor
+            )
 
-    score_df = pd.concat(score_df_list)
-    """
-    BUYING_ORDER_PROCESSOR
-    """
-    buying_order_processor = BUYING_ORDER_PROCESSOR(
-        score_df, invest_money, status_df, CFG["buying_order_n"]
-    )
-    buying_orders = buying_order_processor()
-
-    selling_order_processor = SELLING_ORDER_PROCESSOR(
-        status_df, {"upper_limit": 8, "lower_limit": -3}
-    )
-    selling_orders = selling_order_processor()
-
-    symbols_and_orders = merge_order(buying_orders, selling_orders)
-    return symbols_and_orders
+        order_book = profiler.run(
+            "merge_order", merge_order, buying_orders, selling_orders
+        )
+    return order_book.to_list()
@@ -0,0 +1,52 @@
+import os
+import datetime as dt
+
+from krx_competition_20.backtester import BACKTESTER
+from krx_competition_20.loader.data_provider import LOCAL_PROVIDER
+from krx_competition_20.loader.data_provider import SYNTHETIC_DATA_GENERATOR
+from krx_competition_20.loader.cache_loader import POINT_IN_TIME_PANEL, clear_caches
+
+
+def test_backtest_uses_quarter_from_available_date(tmp_path, monkeypatch):
+    data_dir = os.path.join(tmp_path, "data")
+    SYNTHETIC_DATA_GENERATOR(
+        dt.date(2023, 1, 2),
+        dt.date(2023, 5, 31),
+        {"symbol_n": 60, "sector_n": 2, "no_fundamental_ratio": 0.0, "seed": 0},
+    )(data_dir)
+    provider = LOCAL_PROVIDER(data_dir)
+
+    # trade_func가 날짜별로 사용한 공시 분기를 기록
+    yearmonth_dict = dict()
+    as_of = POINT_IN_TIME_PANEL.as_of
+
+    def record_as_of(self, symbols, account_codes, date):
+        yearmonths, values = as_of(self, symbols, account_codes, date)
+        yearmonth_dict[date] = max(yearmonth_dict.get(date, 0), yearmonths.max())
+        return yearmonths, values
+
+    monkeypatch.setattr(POINT_IN_TIME_PANEL, "as_of", record_as_of)
+
+    # 202303 (1분기)는 마감 5/15 다음 날인 5/16부터 사용 가능 (전체 이력에는 처음부터 있음)
+    backtester = BACKTESTER(
+        dt.date(2023, 5, 12),
+        dt.date(2023, 5, 17),
+        {
+            "initial_cash": 1_000_000_000.0,
+            "calendar_symbol": provider.symbols_df["SYMBOL"].iloc[0],
+            "fast_path": True,
+        },
+        provider=provider,
+    )
+    try:
+        total_df = backtester()
+    finally:
+        clear_caches()
+
+    assert len(total_df) == 5
+    assert yearmonth_dict == {
+        dt.date(2023, 5, 12): 202212,
+        dt.date(2023, 5, 15): 202212,
+        dt.date(2023, 5, 16): 202303,
+        dt.date(2023, 5, 17): 202303,
+    }
@@ -0,0 +1,159 @@
+import os
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from krx_competition_20.loader.data_provider import DATA_PROVIDER
+from krx_competition_20.loader.cache_loader import ACCOUNT_HISTORY_CACHE
+from krx_competition_20.loader.cache_loader import DAILY_PRICE_STORE
+from krx_competition_20.loader.cache_loader import POINT_IN_TIME_PANEL
+
+
+class FAKE_PROVIDER(DATA_PROVIDER):
+    """
+    account_history 호출 수를 세고, 공시 이력을 바꿀 수 있는 provider
+    """
+
+    def __init__(self, cache_dir: str, account_df: pd.DataFrame) -> None:
+        self.cache_dir = cache_dir
+        self.account_df = account_df
+        self.call_n = 0
+
+    def account_history(
+        self, symbol: str, account_code: str, period: str = "q"
+    ) -> pd.DataFrame:
+        self.call_n += 1
+        return self.account_df.copy()
+
+
+class FAKE_PRICE_PROVIDER(DATA_PROVIDER):
+    """
+    평일마다 CLOSE = 1970-01-01부터의 일수 인 주가를 주고, daily_stock 호출 수를 세는 provider
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        self.call_n = 0
+
+    def daily_stock(
+        self, symbol: str, start_date: dt.date, end_date: dt.date
+    ) -> pd.DataFrame:
+        self.call_n += 1
+        dates = pd.bdate_range(start_date, end_date)
+        closes = (dates - pd.Timestamp(1970, 1, 1)).days.astype(float)
+        return pd.DataFrame({"DATE": dates, "CLOSE": closes, "MARKETCAP": closes * 10})
+
+
+def test_account_history_cache_refreshes_on_new_disclosure_season(tmp_path):
+    provider = FAKE_PROVIDER(
+        str(tmp_path),
+        pd.DataFrame({"YEARMONTH": [202209, 202212], "VALUE": [1.0, 2.0]}),
+    )
+    account_cache = ACCOUNT_HISTORY_CACHE(provider=provider)
+
+    # 사업보고서 시즌에 202212까지 호출
+    account_df = account_cache.load_account_history(
+        "000001", "111000", dt.date(2023, 3, 20)
+    )
+    assert provider.call_n == 1
+    assert account_df["YEARMONTH"].max() == 202212
+
+    # 같은 시즌 안에서는 공시 대상 분기(202212)를 이미 가지고 있으므로 cache를 사용
+    account_cache.load_account_history("000001", "111000", dt.date(2023, 3, 28))
+    assert provider.call_n == 1
+
+    # 1분기 시즌이 시작되면 (공시 대상 202303) 다시 호출
+    provider.account_df = pd.DataFrame(
+        {"YEARMONTH": [202209, 202212, 202303], "VALUE": [1.0, 2.0, 3.0]}
+    )
+    account_df = account_cache.load_account_history(
+        "000001", "111000", dt.date(2023, 4, 20)
+    )
+    assert provider.call_n == 2
+    assert account_df["YEARMONTH"].max() == 202303
+
+    # 새 분기를 받은 뒤에는 시즌 밖 / 다음 시즌 전까지 cache를 사용
+    account_cache.load_account_history("000001", "111000", dt.date(2023, 4, 21))
+    account_cache.load_account_history("000001", "111000", dt.date(2023, 6, 20))
+    assert provider.call_n == 2
+
+
+def test_account_history_cache_refetches_until_disclosed(tmp_path):
+    provider = FAKE_PROVIDER(
+        str(tmp_path), pd.DataFrame({"YEARMONTH": [202212], "VALUE": [2.0]})
+    )
+    account_cache = ACCOUNT_HISTORY_CACHE(provider=provider)
+
+    # 1분기 시즌 중 아직 202303이 공시되지 않았다면 refresh_days(1일)마다 다시 호출
+    account_cache.load_account_history("000001", "111000", dt.date(2023, 4, 20))
+    account_cache.load_account_history("000001", "111000", dt.date(2023, 4, 20))
+    assert provider.call_n == 1
+    account_cache.load_account_history("000001", "111000", dt.date(2023, 4, 21))
+    assert provider.call_n == 2
+
+
+def test_point_in_time_panel_as_of_around_deadlines(tmp_path):
+    account_history_df = pd.DataFrame(
+        {
+            "SYMBOL": ["000001", "000001", "000002"],
+            "ACCOUNT_CODE": ["111000", "111000", "111000"],
+            "YEARMONTH": [202212, 202303, 202212],
+            "VALUE": [1.0, 2.0, 10.0],
+        }
+    )
+    path = os.path.join(tmp_path, "point_in_time_panel")
+    POINT_IN_TIME_PANEL.build(
+        account_history_df, path, ["111000", "122700"], dt.date(2023, 6, 1)
+    )
+    panel = POINT_IN_TIME_PANEL(path)
+    symbols = ["000001", "000002", "000003"]
+
+    def as_of(date):
+        yearmonths, values = panel.as_of(symbols, ["111000"], date)
+        return yearmonths[0].tolist(), values[0].tolist()
+
+    # 202212 (사업보고서) 마감 3/31, 202303 (1분기) 마감 5/15 : 마감 다음 날부터 사용 가능
+    yearmonths, values = as_of(dt.date(2023, 3, 31))
+    assert yearmonths == [0, 0, 0] and np.isnan(values).all()
+    assert as_of(dt.date(2023, 4, 1))[0] == [202212, 202212, 0]
+    assert as_of(dt.date(2023, 5, 15))[0] == [202212, 202212, 0]
+    yearmonths, values = as_of(dt.date(2023, 5, 16))
+    assert yearmonths == [202303, 202212, 0]
+    assert values[:2] == [2.0, 10.0] and np.isnan(values[2])
+
+    # 공시가 없는 account_code도 meta에 남아 있어 다시 build하지 않습니다.
+    assert POINT_IN_TIME_PANEL.is_fresh(path, ["122700"], dt.date(2023, 6, 20))
+    assert not POINT_IN_TIME_PANEL.is_fresh(path, ["115000"], dt.date(2023, 6, 20))
+    assert not POINT_IN_TIME_PANEL.is_fresh(path, ["111000"], dt.date(2023, 7, 2))
+
+
+def test_daily_price_store_replays_past_dates_after_later_fetch(tmp_path):
+    provider = FAKE_PRICE_PROVIDER(str(tmp_path))
+    price_store = DAILY_PRICE_STORE(provider=provider)
+
+    def get_close(date):
+        return float((pd.Timestamp(date) - pd.Timestamp(1970, 1, 1)).days)
+
+    # 나중 날짜(live / 다른 backtest)로 store를 채운 뒤 과거 날짜를 차례로 재생
+    price_store.load_recent("000001", dt.date(2023, 10, 31))
+    for date in [dt.date(2023, 2, 1), dt.date(2023, 2, 2), dt.date(2023, 2, 3)]:
+        recent = price_store.load_recent("000001", date)
+        assert recent["DATE"] == date.isoformat()
+        assert recent["CLOSE"] == get_close(date)
+
+    # 주말은 직전 거래일, 이미 호출한 구간은 다시 호출하지 않습니다.
+    recent = price_store.load_recent("000001", dt.date(2023, 2, 5))
+    assert recent["DATE"] == "2023-02-03"
+    call_n = provider.call_n
+    assert (
+        price_store.load_recent("000001", dt.date(2023, 2, 4))["DATE"] == "2023-02-03"
+    )
+    assert provider.call_n == call_n
+
+    # 호출 구간은 sqlite에 남아 새 store에서도 사용합니다.
+    price_store = DAILY_PRICE_STORE(provider=provider)
+    assert price_store.load_recent("000001", dt.date(2023, 2, 2))["CLOSE"] == get_close(
+        dt.date(2023, 2, 2)
+    )
+    assert provider.call_n == call_n
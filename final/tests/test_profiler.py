@@ -0,0 +1,46 @@
+import os
+import logging
+import datetime as dt
+import tracemalloc
+
+import pytest
+
+from krx_competition_20.profiler import PIPELINE_PROFILER
+from krx_competition_20.trade_func import trade_func
+
+
+class FAILING_LEDGER:
+    """
+    update에서 예외를 내는 ledger (stage 실패)
+    """
+
+    def update(self, dict_df_result: dict, dict_df_position: dict) -> None:
+        raise RuntimeError("ledger update failed")
+
+
+def test_profiler_stops_after_stage_exception(tmp_path):
+    logger = logging.getLogger("test_profiler")
+    profiler = PIPELINE_PROFILER(
+        logger,
+        {"trace_memory": False, "capture_dir": str(tmp_path), "capture_top_n": 5},
+    )
+
+    with pytest.raises(RuntimeError):
+        trade_func(
+            dt.date(2023, 5, 15),
+            dict(),
+            dict(),
+            logger,
+            profiler=profiler,
+            ledger=FAILING_LEDGER(),
+        )
+    assert not tracemalloc.is_tracing()
+    assert profiler.profile is None
+    assert os.path.exists(os.path.join(tmp_path, "2023-05-15.records.json"))
+
+    # 다음 날은 다시 cProfile / tracemalloc 수집을 시작합니다.
+    with profiler.profile_day(dt.date(2023, 5, 16)):
+        assert tracemalloc.is_tracing()
+        assert profiler.profile is not None
+    assert not tracemalloc.is_tracing()
+    assert os.path.exists(os.path.join(tmp_path, "2023-05-16.prof"))
@@ -0,0 +1,85 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from krx_competition_20.loader.static_loader import PORTFOLIO_LEDGER
+
+
+def simulate_days(day_n: int = 40, symbol_n: int = 6, seed: int = 0):
+    """
+    매일 전체 dict_df_result / dict_df_position을 새로 만들어 주는 간단한 체결 시뮬레이션 (대회 환경과 같은 입력)
+    """
+    rng = np.random.default_rng(seed)
+    symbols = [f"{idx:06d}" for idx in range(symbol_n)]
+    start_date = dt.date(2023, 1, 2)
+
+    cash = 1_000_000.0
+    position_dict = dict()
+    rows_dict = {"TOTAL": [(start_date - dt.timedelta(days=1), cash)]}
+    for day in range(day_n):
+        date = start_date + dt.timedelta(days=day)
+        price_dict = {symbol: float(rng.integers(900, 1100)) for symbol in symbols}
+
+        fill_dict = dict()
+        for symbol in symbols:
+            held_qty, trade_price = position_dict.get(symbol, [0, 0.0])
+            draw = rng.random()
+            if draw < 0.25:
+                qty = int(rng.integers(1, 10))
+                position_dict[symbol] = [
+                    held_qty + qty,
+                    (held_qty * trade_price + qty * price_dict[symbol])
+                    / (held_qty + qty),
+                ]
+                cash -= qty * price_dict[symbol]
+                fill_dict[symbol] = qty
+            elif draw < 0.45 and held_qty > 0:
+                qty = int(rng.integers(1, held_qty + 1))
+                if qty == held_qty:
+                    del position_dict[symbol]
+                else:
+                    position_dict[symbol][0] -= qty
+                cash += qty * price_dict[symbol]
+                fill_dict[symbol] = -qty
+
+        for symbol in sorted(set(position_dict) | set(fill_dict)):
+            rows_dict.setdefault(symbol, list()).append(
+                (
+                    date,
+                    price_dict[symbol],
+                    position_dict.get(symbol, [0])[0],
+                    fill_dict.get(symbol, 0),
+                )
+            )
+        rows_dict["TOTAL"].append((date, cash))
+
+        dict_df_result = {
+            key: pd.DataFrame(
+                rows,
+                columns=["DATE", "CASH"]
+                if key == "TOTAL"
+                else ["DATE", "PRICE", "QTY", "ORDER"],
+            )
+            for key, rows in rows_dict.items()
+        }
+        dict_df_position = {
+            symbol: pd.DataFrame({"QTY": [qty], "TRADE_PRICE": [trade_price]})
+            for symbol, (qty, trade_price) in position_dict.items()
+        }
+        yield dict_df_result, dict_df_position
+
+
+def test_ledger_delta_matches_rebuild():
+    ledger = PORTFOLIO_LEDGER()
+    for dict_df_result, dict_df_position in simulate_days():
+        ledger.update(dict_df_result, dict_df_position)
+
+        rebuilt_ledger = PORTFOLIO_LEDGER()
+        rebuilt_ledger.rebuild(dict_df_result, dict_df_position)
+
+        assert ledger.get_current_cash() == rebuilt_ledger.get_current_cash()
+        pd.testing.assert_frame_equal(
+            ledger.get_status_df(), rebuilt_ledger.get_status_df(), check_dtype=False
+        )
+    assert ledger.rebuild_n == 0
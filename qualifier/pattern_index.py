@@ -0,0 +1,261 @@
+# Pattern index
+# Random projection LSH (SimHash) over the normalized price_diff windows of every ticker's full history.
+# Windows are stored with their actual_y (sum of the next output_window values), so only windows
+# whose future is already known are inserted. New trading days are inserted incrementally.
+import os
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class PATTERN_INDEX:
+    FILE_NAMES = ["vectors", "actual_y", "ticker_idx", "window_idx", "codes", "planes"]
+
+    def __init__(
+        self,
+        CFG={
+            "input_window": 20,
+            "output_window": 15,
+            "n_tables": 8,  # hash table 수, 많을수록 recall이 오르고 후보가 늘어남
+            "n_bits": 16,  # table별 hyperplane 수 (bucket 수 = 2 ** n_bits)
+            "multi_probe": True,  # 1 bit만 다른 bucket도 후보로 사용
+            "seed": 0,
+        },
+    ) -> None:
+        self.CFG = CFG
+        i_window = CFG["input_window"]
+        n_tables = CFG["n_tables"]
+        n_bits = CFG["n_bits"]
+        assert n_bits <= 32
+
+        rng = np.random.default_rng(CFG["seed"])
+        self.planes = rng.standard_normal((n_tables * n_bits, i_window))
+
+        self.vectors = np.empty((0, i_window), dtype=np.float32)
+        self.actual_y = np.empty(0, dtype=np.float64)
+        self.ticker_idx = np.empty(0, dtype=np.int32)
+        self.window_idx = np.empty(0, dtype=np.int32)
+        self.codes = np.empty((0, n_tables), dtype=np.uint32)
+
+        self.ticker_codes = list()
+        self.ticker_idx_dict = dict()
+        self.inserted_n_dict = dict()
+
+        self.sorted_codes = [np.empty(0, dtype=np.uint32) for _ in range(n_tables)]
+        self.sorted_idx = [np.empty(0, dtype=np.int64) for _ in range(n_tables)]
+
+    def __len__(self):
+        return len(self.vectors)
+
+    # Hash
+    # 1. Unit vectors, zero norm windows are dropped (cosine similarity is not defined)
+    @staticmethod
+    def get_normalized(x_dataset):
+        norms = np.linalg.norm(x_dataset, axis=-1)
+        mask = norms > 0
+        normalized = x_dataset[mask] / norms[mask, np.newaxis]
+        return normalized, mask
+
+    # 2. Sign of the projection on every hyperplane, packed into one code per table
+    def get_codes(self, normalized):
+        n_tables = self.CFG["n_tables"]
+        n_bits = self.CFG["n_bits"]
+
+        bits = (normalized @ self.planes.T > 0).reshape(-1, n_tables, n_bits)
+        weights = np.left_shift(np.uint32(1), np.arange(n_bits, dtype=np.uint32))
+        codes = (bits * weights).sum(axis=-1, dtype=np.uint32)
+        return codes
+
+    # Insert
+    # 1. Windows of one ticker that are not inserted yet (actual_y must be complete)
+    def get_new_windows(self, ticker_code, arraylist):
+        i_window = self.CFG["input_window"]
+        o_window = self.CFG["output_window"]
+
+        if ticker_code not in self.ticker_idx_dict:
+            self.ticker_idx_dict[ticker_code] = len(self.ticker_codes)
+            self.ticker_codes.append(ticker_code)
+
+        arraylist = np.asarray(arraylist, dtype=np.float64)
+        window_n = len(arraylist) - i_window - o_window + 1
+        inserted_n = self.inserted_n_dict.get(ticker_code, 0)
+        if window_n <= inserted_n:
+            return None
+
+        x_dataset = sliding_window_view(arraylist[: window_n + i_window - 1], i_window)
+        y_dataset = sliding_window_view(arraylist[i_window:], o_window)[:window_n]
+        x_dataset = x_dataset[inserted_n:]
+        y_dataset = y_dataset[inserted_n:].sum(axis=-1)
+        window_idx = np.arange(inserted_n, window_n, dtype=np.int32)
+
+        self.inserted_n_dict[ticker_code] = window_n
+        return x_dataset, y_dataset, window_idx
+
+    # 2. Merge new codes into the sorted codes of every table
+    # old codes are already sorted, so a stable sort only has to place the new ones
+    def merge_sorted_codes(self, new_codes, start):
+        new_idx = np.arange(start, start + len(new_codes), dtype=np.int64)
+        for table in range(self.CFG["n_tables"]):
+            sorted_codes = np.concatenate(
+                [self.sorted_codes[table], new_codes[:, table]]
+            )
+            sorted_idx = np.concatenate([self.sorted_idx[table], new_idx])
+            order = np.argsort(sorted_codes, kind="stable")
+            self.sorted_codes[table] = sorted_codes[order]
+            self.sorted_idx[table] = sorted_idx[order]
+
+    # 3. Insert every ticker at once, arraylist_dict is {ticker_code : full price_diff history}
+    # histories that only grew since the last insert add their new windows only
+    def insert(self, arraylist_dict):
+        vectors = list()
+        actual_y = list()
+        ticker_idx = list()
+        window_idx = list()
+
+        for ticker_code, arraylist in arraylist_dict.items():
+            new_windows = self.get_new_windows(ticker_code, arraylist)
+            if new_windows is None:
+                continue
+            x_dataset, y_dataset, _window_idx = new_windows
+            normalized, mask = self.get_normalized(x_dataset)
+
+            vectors.append(normalized.astype(np.float32))
+            actual_y.append(y_dataset[mask])
+            ticker_idx.append(
+                np.full(mask.sum(), self.ticker_idx_dict[ticker_code], dtype=np.int32)
+            )
+            window_idx.append(_window_idx[mask])
+
+        if not vectors:
+            return 0
+        vectors = np.concatenate(vectors)
+        codes = self.get_codes(vectors)
+        start = len(self)
+
+        self.vectors = np.concatenate([self.vectors, vectors])
+        self.actual_y = np.concatenate([self.actual_y, np.concatenate(actual_y)])
+        self.ticker_idx = np.concatenate([self.ticker_idx, np.concatenate(ticker_idx)])
+        self.window_idx = np.concatenate([self.window_idx, np.concatenate(window_idx)])
+        self.codes = np.concatenate([self.codes, codes])
+        self.merge_sorted_codes(codes, start)
+        return len(vectors)
+
+    # Query
+    # 1. Codes to look up, the code itself and (multi_probe) every code 1 bit away
+    def get_probe_codes(self, codes):
+        if not self.CFG["multi_probe"]:
+            return codes[:, np.newaxis]
+        flips = np.left_shift(
+            np.uint32(1), np.arange(self.CFG["n_bits"], dtype=np.uint32)
+        )
+        probe_codes = np.concatenate(
+            [codes[:, np.newaxis], codes[:, np.newaxis] ^ flips], axis=1
+        )
+        return probe_codes
+
+    # 2. Candidate windows, union of the probed buckets of every table
+    def get_candidates(self, codes):
+        probe_codes = self.get_probe_codes(codes)
+        candidates = list()
+        for table in range(self.CFG["n_tables"]):
+            sorted_codes = self.sorted_codes[table]
+            lefts = np.searchsorted(sorted_codes, probe_codes[table], side="left")
+            rights = np.searchsorted(sorted_codes, probe_codes[table], side="right")
+            for left, right in zip(lefts, rights):
+                if left < right:
+                    candidates.append(self.sorted_idx[table][left:right])
+        if not candidates:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(candidates))
+
+    # 3. Exact cosine similarity of the candidates, top n by argpartition
+    def query(self, final_x, n):
+        final_x = np.asarray(final_x, dtype=np.float64)
+        normalized, mask = self.get_normalized(final_x[np.newaxis])
+        if not mask[0]:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        codes = self.get_codes(normalized)[0]
+        candidates = self.get_candidates(codes)
+        similarity = self.vectors[candidates] @ normalized[0].astype(np.float32)
+
+        n = min(n, len(candidates))
+        if n == 0:
+            return candidates, similarity.astype(np.float64)
+        top_n = np.argpartition(-similarity, n - 1)[:n]
+        top_n = top_n[np.argsort(-similarity[top_n], kind="stable")]
+        return candidates[top_n], similarity[top_n].astype(np.float64)
+
+    # 4. Query result as a DataFrame like get_similarity_main_df (ticker_code, window_idx, score, actual_y)
+    def get_similarity_main_df(self, final_x, n):
+        idx, similarity = self.query(final_x, n)
+        similarity_main_df = pd.DataFrame(
+            {
+                "ticker_code": [self.ticker_codes[i] for i in self.ticker_idx[idx]],
+                "window_idx": self.window_idx[idx],
+                "similarity_score": similarity,
+                "actual_y": self.actual_y[idx],
+            }
+        )
+        return similarity_main_df
+
+    # Persist
+    # 1. Save as .npy files, written to a temporary directory then swapped in
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        for file_name in self.FILE_NAMES:
+            np.save(
+                os.path.join(tmp_path, f"{file_name}.npy"), getattr(self, file_name)
+            )
+        np.save(os.path.join(tmp_path, "sorted_codes.npy"), np.stack(self.sorted_codes))
+        np.save(os.path.join(tmp_path, "sorted_idx.npy"), np.stack(self.sorted_idx))
+        with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+            json.dump(
+                {
+                    "CFG": self.CFG,
+                    "ticker_codes": self.ticker_codes,
+                    "inserted_ns": [
+                        self.inserted_n_dict.get(ticker_code, 0)
+                        for ticker_code in self.ticker_codes
+                    ],
+                },
+                f,
+            )
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+
+    # 2. Load with memory mapping, inserts after loading make in-memory copies
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+
+        pattern_index = cls(meta["CFG"])
+        for file_name in cls.FILE_NAMES:
+            setattr(
+                pattern_index,
+                file_name,
+                np.load(os.path.join(path, f"{file_name}.npy"), mmap_mode=mmap_mode),
+            )
+        sorted_codes = np.load(
+            os.path.join(path, "sorted_codes.npy"), mmap_mode=mmap_mode
+        )
+        sorted_idx = np.load(os.path.join(path, "sorted_idx.npy"), mmap_mode=mmap_mode)
+        pattern_index.sorted_codes = list(sorted_codes)
+        pattern_index.sorted_idx = list(sorted_idx)
+
+        pattern_index.ticker_codes = meta["ticker_codes"]
+        pattern_index.ticker_idx_dict = {
+            ticker_code: idx for idx, ticker_code in enumerate(meta["ticker_codes"])
+        }
+        pattern_index.inserted_n_dict = dict(
+            zip(meta["ticker_codes"], meta["inserted_ns"])
+        )
+        return pattern_index
@@ -0,0 +1,153 @@
+# Streaming preprocessing
+# Same preprocessing as similiarity_based_trading.ipynb (map_column_names / drop_zero / DROP_LACK_DATA / sort by date)
+# CSVs are read in chunks, every chunk is reduced to column arrays, rows are sorted by (ticker_code, date) once
+# and every ticker is a [start, end) slice of the sorted arrays.
+import numpy as np
+import pandas as pd
+
+COLUMN_DICT = {
+    "일자": "date",
+    "종목코드": "ticker_code",
+    "종목명": "ticker_name",
+    "거래량": "volume",
+    "시가": "open",
+    "고가": "high",
+    "저가": "low",
+    "종가": "close",
+}
+
+DTYPE_DICT = {
+    "date": str,
+    "ticker_code": str,
+    "ticker_name": str,
+    "volume": np.float64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+}
+
+
+# General preprocessing
+# 1. Column name mapping
+def map_column_names(datasets_df, column_dict):
+    datasets_df.columns = [column_dict[column] for column in datasets_df.columns]
+    return datasets_df
+
+
+# 2. Drop outliers, one mask over every column
+def drop_zero(datasets_df):
+    columns = ["volume", "open", "low", "high", "close"]
+    mask = (datasets_df[columns].to_numpy() != 0).all(axis=1)
+    return datasets_df[mask]
+
+
+class TICKER_DATASETS:
+    def __init__(
+        self,
+        paths,
+        column_dict=COLUMN_DICT,
+        CFG={
+            "chunksize": 500_000,
+            "percentage": 0.8,  # DROP_LACK_DATA, 최대 row 수 * percentage 보다 많은 ticker만 사용
+            "columns": [
+                "date",
+                "ticker_code",
+                "volume",
+                "open",
+                "high",
+                "low",
+                "close",
+            ],
+        },
+    ) -> None:
+        self.paths = paths
+        self.column_dict = column_dict
+        self.CFG = CFG
+
+        self.arrays = None  # {column : array}, sorted by (ticker_code, date)
+        self.ticker_codes = None
+        self.starts = None
+        self.ends = None
+
+    # 1. Read one CSV in chunks with explicit dtypes
+    def read_chunks(self, path):
+        inverse_column_dict = {value: key for key, value in self.column_dict.items()}
+        columns = self.CFG["columns"]
+        dtype = {inverse_column_dict[column]: DTYPE_DICT[column] for column in columns}
+
+        for chunk in pd.read_csv(
+            path,
+            usecols=list(dtype),
+            dtype=dtype,
+            chunksize=self.CFG["chunksize"],
+        ):
+            yield chunk
+
+    # 2. map_column_names / drop_zero per chunk, only the column arrays are kept
+    def load_arrays(self):
+        columns = self.CFG["columns"]
+        array_lists = {column: list() for column in columns}
+
+        for path in self.paths:
+            for chunk in self.read_chunks(path):
+                chunk = map_column_names(chunk, self.column_dict)
+                chunk = drop_zero(chunk)
+                for column in columns:
+                    array = chunk[column].to_numpy()
+                    if array.dtype == object:
+                        array = array.astype(str)
+                    array_lists[column].append(array)
+
+        arrays = {
+            column: np.concatenate(array_list)
+            for column, array_list in array_lists.items()
+        }
+        return arrays
+
+    # 3. One sort by (ticker_code, date), offsets of every ticker
+    @staticmethod
+    def sort_arrays(arrays):
+        order = np.lexsort((arrays["date"], arrays["ticker_code"]))
+        arrays = {column: array[order] for column, array in arrays.items()}
+
+        ticker_codes, starts, counts = np.unique(
+            arrays["ticker_code"], return_index=True, return_counts=True
+        )
+        return arrays, ticker_codes, starts, starts + counts
+
+    # 4. Drop lack data on the offsets, rows are not filtered
+    @staticmethod
+    def drop_lack_data(ticker_codes, starts, ends, percentage):
+        counts = ends - starts
+        if len(counts) == 0:
+            return ticker_codes, starts, ends
+        mask = counts > counts.max() * percentage
+        return ticker_codes[mask], starts[mask], ends[mask]
+
+    def __call__(self):
+        arrays = self.load_arrays()
+        arrays, ticker_codes, starts, ends = self.sort_arrays(arrays)
+        ticker_codes, starts, ends = self.drop_lack_data(
+            ticker_codes, starts, ends, self.CFG["percentage"]
+        )
+
+        self.arrays = arrays
+        self.ticker_codes = ticker_codes
+        self.starts = starts
+        self.ends = ends
+        return self
+
+    def __len__(self):
+        return len(self.ticker_codes)
+
+    # Utils
+    # 1. One ticker, {column : array view} sorted by date
+    def get_ticker_arrays(self, idx):
+        start, end = self.starts[idx], self.ends[idx]
+        return {column: array[start:end] for column, array in self.arrays.items()}
+
+    # 2. Every ticker as (ticker_code, {column : array view})
+    def iter_ticker_arrays(self):
+        for idx, ticker_code in enumerate(self.ticker_codes):
+            yield ticker_code, self.get_ticker_arrays(idx)
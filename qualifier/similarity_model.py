@@ -0,0 +1,220 @@
+# Similarity model (vectorized)
+# Same model as similiarity_based_trading.ipynb : cosine similarity between the last input window
+# and every past window, prediction = mean(similarity * actual_y) of the top n windows.
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Model format dataset
+# 1. Windows as zero-copy views
+def get_x_y_dataset(arraylist, CFG):
+    i_window = CFG["input_window"]
+    o_window = CFG["output_window"]
+    window_n = len(arraylist) - i_window - o_window + 1
+
+    x_dataset = sliding_window_view(arraylist[: window_n + i_window - 1], i_window)
+    y_dataset = sliding_window_view(arraylist[i_window:], o_window)[:window_n]
+    return x_dataset, y_dataset
+
+
+# 2. Batched windows, (ticker, window, input_window) views of a (ticker, length) array
+def get_x_y_batch(array_batch, CFG):
+    i_window = CFG["input_window"]
+    o_window = CFG["output_window"]
+    window_n = array_batch.shape[1] - i_window - o_window + 1
+
+    x_batch = sliding_window_view(
+        array_batch[:, : window_n + i_window - 1], i_window, axis=1
+    )
+    y_batch = sliding_window_view(array_batch[:, i_window:], o_window, axis=1)[
+        :, :window_n
+    ]
+    return x_batch, y_batch
+
+
+# Model
+# 1. Cosine similarity of every window as one matrix-vector product divided by the norms
+def get_cosine_similarity(x_dataset, final_x):
+    x_norm = np.sqrt(np.einsum("...ni,...ni->...n", x_dataset, x_dataset))
+    final_norm = np.sqrt(np.einsum("...i,...i->...", final_x, final_x))
+    dot = np.einsum("...ni,...i->...n", x_dataset, final_x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosine_similarity = dot / (x_norm * final_norm[..., np.newaxis])
+    return cosine_similarity
+
+
+# 2. Top n windows without a full sort (nan similarity is ranked last)
+def get_top_n_idx(similarity, n):
+    score = np.where(np.isnan(similarity), -np.inf, similarity)
+    n = min(n, score.shape[-1])
+    top_n_idx = np.argpartition(-score, n - 1, axis=-1)[..., :n]
+    return top_n_idx
+
+
+# 3. Prediction, mean(similarity * actual_y) of the top n windows
+# nan similarities are dropped like nlargest, the mean is over the remaining windows (nan if none)
+def get_pred_y(similarity, actual_y, n):
+    top_n_idx = get_top_n_idx(similarity, n)
+    top_similarity = np.take_along_axis(similarity, top_n_idx, axis=-1)
+    top_actual_y = np.take_along_axis(actual_y, top_n_idx, axis=-1)
+    selected = ~np.isnan(top_similarity)
+    weighted_y = np.where(selected, top_similarity * top_actual_y, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pred_y = weighted_y.sum(axis=-1) / selected.sum(axis=-1)
+    return pred_y
+
+
+# 4. Prefix sum of price_diff, actual_y of any output_window is prefix_sum[end] - prefix_sum[start]
+def get_prefix_sum(array_batch):
+    prefix_sum = np.zeros(array_batch.shape[:-1] + (array_batch.shape[-1] + 1,))
+    np.cumsum(array_batch, axis=-1, out=prefix_sum[..., 1:])
+    return prefix_sum
+
+
+# 5. Prediction of every output_window from one ranking of the windows
+# a window is used for an output_window only if its actual_y is complete (window_idx < window_n)
+def get_pred_y_horizons(similarity, prefix_sum, i_window, output_windows, n):
+    length = prefix_sum.shape[-1] - 1
+    score = np.where(np.isnan(similarity), -np.inf, similarity)
+    order = np.argsort(-score, axis=-1, kind="stable")
+    sorted_similarity = np.take_along_axis(similarity, order, axis=-1)
+    available = ~np.isnan(sorted_similarity)
+
+    start = order + i_window
+    start_sum = np.take_along_axis(prefix_sum, start, axis=-1)
+
+    pred_y_list = list()
+    for o_window in output_windows:
+        window_n = length - i_window - o_window + 1
+        valid = available & (order < window_n)
+        selected = valid & (np.cumsum(valid, axis=-1) <= n)
+
+        end = np.minimum(start + o_window, length)
+        actual_y = np.take_along_axis(prefix_sum, end, axis=-1) - start_sum
+        weighted_y = np.where(selected, sorted_similarity * actual_y, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pred_y_list.append(weighted_y.sum(axis=-1) / selected.sum(axis=-1))
+    return np.stack(pred_y_list, axis=-1)
+
+
+# Main
+# 1. One ticker
+def predict_ticker(arraylist, CFG, n=3):
+    arraylist = np.asarray(arraylist, dtype=np.float64)
+    arraylist = arraylist[-(CFG["dataset_window"] + CFG["input_window"]) :]
+
+    x_dataset, y_dataset = get_x_y_dataset(arraylist, CFG)
+    y_dataset = y_dataset.sum(axis=-1)
+    final_x = arraylist[-CFG["input_window"] :]
+
+    similarity = get_cosine_similarity(x_dataset, final_x)
+    pred_y = get_pred_y(similarity, y_dataset, n)
+    return float(pred_y)
+
+
+# 2. Tickers with the same length (at most `length`) stacked as (ticker, length) batches
+def get_array_batches(arraylist_dict, length, min_length):
+    length_ticker_dict = dict()
+    for ticker_code, arraylist in arraylist_dict.items():
+        _length = min(len(arraylist), length)
+        if _length >= min_length:
+            length_ticker_dict.setdefault(_length, list()).append(ticker_code)
+
+    for _length, ticker_codes in length_ticker_dict.items():
+        array_batch = np.stack(
+            [
+                np.asarray(arraylist_dict[ticker_code][-_length:], dtype=np.float64)
+                for ticker_code in ticker_codes
+            ]
+        )
+        yield ticker_codes, array_batch
+
+
+# 3. Every ticker, tickers with the same length are stacked and predicted as one 3-D batch
+def predict_tickers(arraylist_dict, CFG, n=3):
+    i_window = CFG["input_window"]
+    o_window = CFG["output_window"]
+    length = CFG["dataset_window"] + i_window
+
+    ticker_pred_dict = dict()
+    for ticker_codes, array_batch in get_array_batches(
+        arraylist_dict, length, i_window + o_window
+    ):
+        x_batch, y_batch = get_x_y_batch(array_batch, CFG)
+        y_batch = y_batch.sum(axis=-1)
+        final_x = array_batch[:, -i_window:]
+
+        similarity = get_cosine_similarity(x_batch, final_x)
+        pred_y = get_pred_y(similarity, y_batch, n)
+        ticker_pred_dict.update(zip(ticker_codes, pred_y.tolist()))
+    return ticker_pred_dict
+
+
+# 4. Every ticker against the pattern index (pattern_index.py), top n analogues of every ticker's history
+def predict_tickers_from_index(pattern_index, arraylist_dict, CFG, n=3):
+    i_window = CFG["input_window"]
+
+    ticker_pred_dict = dict()
+    for ticker_code, arraylist in arraylist_dict.items():
+        if len(arraylist) < i_window:
+            continue
+        final_x = np.asarray(arraylist[-i_window:], dtype=np.float64)
+        idx, similarity = pattern_index.query(final_x, n)
+        if len(idx) == 0:
+            ticker_pred_dict[ticker_code] = np.nan
+            continue
+        ticker_pred_dict[ticker_code] = float(
+            (similarity * pattern_index.actual_y[idx]).mean()
+        )
+    return ticker_pred_dict
+
+
+# 5. Every ticker and every output_window, similarity is computed once per ticker
+# returns a ticker x output_window DataFrame (nan if the history is too short for the output_window)
+def predict_tickers_horizons(arraylist_dict, CFG, output_windows, n=3):
+    i_window = CFG["input_window"]
+    length = CFG["dataset_window"] + i_window
+    output_windows = list(output_windows)
+    min_o_window = min(output_windows)
+
+    ticker_codes_list = list()
+    pred_y_list = list()
+    for ticker_codes, array_batch in get_array_batches(
+        arraylist_dict, length, i_window + min_o_window
+    ):
+        x_batch, _ = get_x_y_batch(
+            array_batch, {"input_window": i_window, "output_window": min_o_window}
+        )
+        final_x = array_batch[:, -i_window:]
+
+        similarity = get_cosine_similarity(x_batch, final_x)
+        prefix_sum = get_prefix_sum(array_batch)
+        pred_y = get_pred_y_horizons(
+            similarity, prefix_sum, i_window, output_windows, n
+        )
+        ticker_codes_list.extend(ticker_codes)
+        pred_y_list.append(pred_y)
+
+    pred_y = (
+        np.concatenate(pred_y_list)
+        if pred_y_list
+        else np.empty((0, len(output_windows)))
+    )
+    pred_df = pd.DataFrame(pred_y, index=ticker_codes_list, columns=output_windows)
+    pred_df.index.name = "ticker_code"
+    pred_df.columns.name = "output_window"
+    return pred_df
+
+
+# 6. Every input_window x output_window, columns are (input_window, output_window)
+def predict_tickers_windows(arraylist_dict, CFG, input_windows, output_windows, n=3):
+    pred_dfs = [
+        predict_tickers_horizons(
+            arraylist_dict, {**CFG, "input_window": i_window}, output_windows, n
+        )
+        for i_window in input_windows
+    ]
+    pred_df = pd.concat(pred_dfs, axis=1, keys=list(input_windows))
+    pred_df.columns.names = ["input_window", "output_window"]
+    return pred_df
@@ -0,0 +1,230 @@
+# Similarity model sweep
+# Every ticker's full price_diff history is copied once into one shared memory block ([start, end) offsets per ticker).
+# Workers of a process pool attach to it by name (no per-worker copy) and score one CFG each with walk-forward
+# evaluation : at every cutoff the model only sees price_diff[:cutoff] and is compared with sum(price_diff[cutoff : cutoff + output_window]).
+# Cutoffs are days of one date axis shared by every ticker (every date of dates_dict), so every cross-section compares
+# the same calendar days. A ticker is used at a cutoff only if it trades on every day of the realized window.
+import os
+import time
+import itertools
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from similarity_model import predict_tickers_horizons
+
+SHARED = dict()  # worker state, set by init_worker
+
+
+# Shared memory
+# 1. Shared date axis, every date of every ticker sorted once
+def get_date_axis(dates_dict):
+    return np.unique(np.concatenate([np.asarray(d) for d in dates_dict.values()]))
+
+
+# 2. Concatenate every ticker into one shared block, price_diff and the position of each row's date on the date axis
+def create_shared_price_diff(price_diff_dict, dates_dict):
+    ticker_codes = list(price_diff_dict)
+    lengths = np.array([len(price_diff_dict[t]) for t in ticker_codes], dtype=np.int64)
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    date_axis = get_date_axis(dates_dict)
+
+    total_n = int(ends[-1])
+    shm = shared_memory.SharedMemory(create=True, size=max(total_n * 16, 16))
+    price_diff = np.ndarray(total_n, dtype=np.float64, buffer=shm.buf)
+    date_pos = np.ndarray(total_n, dtype=np.int64, buffer=shm.buf, offset=total_n * 8)
+    for ticker_code, start, end in zip(ticker_codes, starts, ends):
+        price_diff[start:end] = price_diff_dict[ticker_code]
+        date_pos[start:end] = np.searchsorted(date_axis, dates_dict[ticker_code])
+    return shm, ticker_codes, starts, ends, len(date_axis)
+
+
+# 3. Attach the shared block in a worker
+def init_worker(shm_name, ticker_codes, starts, ends, date_n):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    total_n = int(ends[-1])
+    SHARED["shm"] = shm
+    SHARED["price_diff"] = np.ndarray(total_n, dtype=np.float64, buffer=shm.buf)
+    SHARED["date_pos"] = np.ndarray(
+        total_n, dtype=np.int64, buffer=shm.buf, offset=total_n * 8
+    )
+    SHARED["ticker_codes"] = ticker_codes
+    SHARED["starts"] = starts
+    SHARED["ends"] = ends
+    SHARED["date_n"] = date_n
+
+
+# Walk-forward evaluation
+# 1. Rank correlation (spearman) of prediction and realized y across tickers
+def get_rank_correlation(pred_y, actual_y):
+    if len(pred_y) < 2:
+        return np.nan
+    pred_rank = pred_y.argsort().argsort()
+    actual_rank = actual_y.argsort().argsort()
+    return float(np.corrcoef(pred_rank, actual_rank)[0, 1])
+
+
+# 2. One cutoff, the cutoff day is `cutoff_back` days before the end of the shared date axis, history before it is
+# visible and the next output_window values are realized, tickers that miss a day of the realized window are skipped
+# every output_window shares one similarity computation (predict_tickers_horizons)
+def evaluate_cutoff(CFG, output_windows, cutoff_back):
+    price_diff = SHARED["price_diff"]
+    date_pos = SHARED["date_pos"]
+    cutoff_pos = SHARED["date_n"] - cutoff_back
+    max_o_window = max(output_windows)
+
+    arraylist_dict = dict()
+    actual_y_dict = dict()
+    for ticker_code, start, end in zip(
+        SHARED["ticker_codes"], SHARED["starts"], SHARED["ends"]
+    ):
+        cutoff = start + int(np.searchsorted(date_pos[start:end], cutoff_pos))
+        if (
+            cutoff + max_o_window > end
+            or cutoff <= start
+            or date_pos[cutoff + max_o_window - 1] != cutoff_pos + max_o_window - 1
+        ):
+            continue
+        arraylist_dict[ticker_code] = price_diff[start:cutoff]
+        prefix_sum = np.cumsum(price_diff[cutoff : cutoff + max_o_window])
+        actual_y_dict[ticker_code] = [
+            prefix_sum[o_window - 1] for o_window in output_windows
+        ]
+
+    pred_df = predict_tickers_horizons(
+        arraylist_dict, CFG, output_windows, CFG.get("n", 3)
+    )
+    actual_df = pd.DataFrame.from_dict(
+        actual_y_dict, orient="index", columns=output_windows
+    ).loc[pred_df.index]
+
+    pred_y_dict = dict()
+    for o_window in output_windows:
+        mask = pred_df[o_window].notna().to_numpy()
+        pred_y_dict[o_window] = (
+            pred_df[o_window].to_numpy()[mask],
+            actual_df[o_window].to_numpy()[mask],
+        )
+    return pred_y_dict
+
+
+# 3. One CFG group (every output_window of the same dataset_window / input_window / n), every cutoff
+def evaluate_CFG_group(CFG, output_windows, cutoff_backs):
+    started_at = time.perf_counter()
+
+    hits_dict = {o_window: list() for o_window in output_windows}
+    rank_correlations_dict = {o_window: list() for o_window in output_windows}
+    for cutoff_back in cutoff_backs:
+        pred_y_dict = evaluate_cutoff(CFG, output_windows, cutoff_back)
+        for o_window, (pred_y, actual_y) in pred_y_dict.items():
+            hits_dict[o_window].append(np.sign(pred_y) == np.sign(actual_y))
+            rank_correlations_dict[o_window].append(
+                get_rank_correlation(pred_y, actual_y)
+            )
+
+    seconds = time.perf_counter() - started_at
+    results = list()
+    for o_window in output_windows:
+        hits = np.concatenate(hits_dict[o_window])
+        rank_correlations = np.array(rank_correlations_dict[o_window], dtype=np.float64)
+        results.append(
+            {
+                **CFG,
+                "output_window": o_window,
+                "hit_rate": float(hits.mean()) if len(hits) else np.nan,
+                "rank_corr": float(np.nanmean(rank_correlations)),
+                "rank_corr_std": float(np.nanstd(rank_correlations)),
+                "obs_n": len(hits),
+                "seconds": seconds,  # group 전체 (output_window끼리 공유)
+            }
+        )
+    return results
+
+
+# Main
+# 1. Every combination of param_grid ({key : [values]}) as a CFG
+def get_CFG_grid(param_grid):
+    keys = list(param_grid)
+    return [
+        dict(zip(keys, values)) for values in itertools.product(*param_grid.values())
+    ]
+
+
+# 2. CFGs that differ only in output_window are evaluated together
+def get_CFG_groups(CFG_grid):
+    CFG_group_dict = dict()
+    for CFG in CFG_grid:
+        CFG = dict(CFG)
+        o_window = CFG.pop("output_window")
+        key = tuple(sorted(CFG.items()))
+        CFG_group_dict.setdefault(key, (CFG, list()))[1].append(o_window)
+    return list(CFG_group_dict.values())
+
+
+# price_diff_dict : {ticker_code : price_diff array sorted by date}
+# dates_dict : {ticker_code : date array of the same length}, cutoffs are aligned on the dates
+class SIMILARITY_SWEEP:
+    def __init__(
+        self,
+        price_diff_dict,
+        dates_dict,
+        CFG={
+            "eval_n": 10,  # walk-forward cutoff 수
+            "eval_step": 15,  # cutoff 간격 (일)
+            "max_workers": None,  # None이면 os.cpu_count()
+        },
+    ) -> None:
+        self.price_diff_dict = price_diff_dict
+        self.dates_dict = dates_dict
+        self.CFG = CFG
+
+    # 3. Cutoffs counted back from the last day of the shared date axis, shared by every CFG
+    # the latest cutoff leaves room for the longest output_window of the grid
+    def get_cutoff_backs(self, CFG_grid):
+        max_o_window = max(CFG["output_window"] for CFG in CFG_grid)
+        return [
+            max_o_window + idx * self.CFG["eval_step"]
+            for idx in range(self.CFG["eval_n"])
+        ]
+
+    def __call__(self, param_grid):
+        CFG_grid = get_CFG_grid(param_grid)
+        cutoff_backs = self.get_cutoff_backs(CFG_grid)
+
+        shm, ticker_codes, starts, ends, date_n = create_shared_price_diff(
+            self.price_diff_dict, self.dates_dict
+        )
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.CFG["max_workers"] or os.cpu_count(),
+                initializer=init_worker,
+                initargs=(shm.name, ticker_codes, starts, ends, date_n),
+            ) as executor:
+                CFGs, output_windows_list = zip(*get_CFG_groups(CFG_grid))
+                results = list(
+                    itertools.chain.from_iterable(
+                        executor.map(
+                            evaluate_CFG_group,
+                            CFGs,
+                            output_windows_list,
+                            itertools.repeat(cutoff_backs),
+                        )
+                    )
+                )
+        finally:
+            shm.close()
+            shm.unlink()
+
+        results_df = pd.DataFrame(results)
+        results_df = results_df.sort_values("rank_corr", ascending=False)
+        results_df = results_df.reset_index(drop=True)
+        return results_df
+
+
+# 4. One consolidated results table
+def save_results_df(results_df, path):
+    results_df.to_csv(path, index=False)
+    return path
@@ -0,0 +1,233 @@
+# Walk-forward evaluation
+# The similarity model (similarity_model.py) is evaluated at every day, one day at a time, for every ticker.
+# When the day advances by one, every window and final_x move by one value, so the dot products and the squared
+# norms are updated in place (remove the oldest value, add the newest value) instead of rebuilding x_dataset :
+#   dot(x[s + 1], final_x[c + 1]) = dot(x[s], final_x[c]) - a[s] * a[c - i] + a[s + i] * a[c]
+# Tickers are right-aligned and zero-padded on the left, windows over the padding are not used. Rows of different tickers
+# in one column can be different days (a ticker that stops earlier or has a halt), so every value keeps the position of
+# its date on one date axis shared by every ticker and cutoffs are recorded on that axis.
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from similarity_model import get_pred_y
+from sweep import get_rank_correlation, get_date_axis
+
+
+# arraylist_dict : {ticker_code : price_diff array sorted by date}
+# dates_dict : {ticker_code : date array of the same length}, cutoffs are aligned on the dates
+class WALK_FORWARD_EVALUATOR:
+    def __init__(
+        self,
+        arraylist_dict,
+        dates_dict,
+        CFG={
+            "dataset_window": 300,
+            "input_window": 20,
+            "output_window": 15,
+            "n": 3,
+            "eval_n": 250,  # 평가할 일 수 (마지막 날부터 거꾸로), None이면 가능한 모든 날
+            "refresh_n": 250,  # 누적 오차를 없애기 위해 dot / norm을 다시 계산하는 간격 (일)
+        },
+    ) -> None:
+        self.arraylist_dict = arraylist_dict
+        self.CFG = CFG
+        self.dates_dict = dates_dict
+
+    # Dataset
+    # 1. (ticker, length) batch, right-aligned and zero-padded (dataset_window + input_window zeros in front)
+    # with the position of every value's date on the shared date axis (-1 over the padding)
+    def get_padded_batch(self):
+        length = self.CFG["dataset_window"] + self.CFG["input_window"]
+        ticker_codes = list(self.arraylist_dict)
+        lengths = np.array([len(self.arraylist_dict[t]) for t in ticker_codes])
+        width = length + lengths.max()
+        date_axis = get_date_axis(self.dates_dict)
+
+        array_batch = np.zeros((len(ticker_codes), width))
+        date_pos_batch = np.full((len(ticker_codes), width), -1, dtype=np.int64)
+        for idx, ticker_code in enumerate(ticker_codes):
+            array_batch[idx, width - lengths[idx] :] = self.arraylist_dict[ticker_code]
+            date_pos_batch[idx, width - lengths[idx] :] = np.searchsorted(
+                date_axis, self.dates_dict[ticker_code]
+            )
+        first_idx = width - lengths
+
+        prefix_sum = np.zeros((len(ticker_codes), width + 1))
+        np.cumsum(array_batch, axis=1, out=prefix_sum[:, 1:])
+        return (
+            ticker_codes,
+            array_batch,
+            first_idx,
+            prefix_sum,
+            date_pos_batch,
+            len(date_axis),
+        )
+
+    # State
+    # 1. Dot products with final_x and squared norms of every window, computed from scratch at cutoff c
+    def init_state(self, array_batch, c):
+        i_window = self.CFG["input_window"]
+        window_n = self.get_window_n()
+        window_start = c - self.CFG["dataset_window"] - i_window
+
+        x_batch = sliding_window_view(
+            array_batch[:, window_start : window_start + window_n + i_window - 1],
+            i_window,
+            axis=1,
+        )
+        final_x = array_batch[:, c - i_window : c]
+        dot = np.einsum("tni,ti->tn", x_batch, final_x)
+        norm2 = np.einsum("tni,tni->tn", x_batch, x_batch)
+        return dot, norm2
+
+    # 2. Advance the state from cutoff c to c + 1, O(window_n) per ticker
+    def update_state(self, array_batch, c, dot, norm2):
+        i_window = self.CFG["input_window"]
+        window_n = self.get_window_n()
+        window_start = c - self.CFG["dataset_window"] - i_window
+
+        removed = array_batch[:, window_start : window_start + window_n]
+        added = array_batch[
+            :, window_start + i_window : window_start + i_window + window_n
+        ]
+        dot -= removed * array_batch[:, c - i_window, np.newaxis]
+        dot += added * array_batch[:, c, np.newaxis]
+        norm2 -= removed * removed
+        norm2 += added * added
+        return dot, norm2
+
+    def get_window_n(self):
+        CFG = self.CFG
+        return CFG["dataset_window"] - CFG["output_window"] + 1
+
+    # Prediction
+    # 1. Prediction of every ticker at cutoff c, windows over the padding get a nan similarity and are dropped from
+    # the top n (mean of the remaining windows), nan if the ticker has no window yet
+    def get_pred_y(self, array_batch, first_idx, prefix_sum, c, dot, norm2):
+        i_window = self.CFG["input_window"]
+        o_window = self.CFG["output_window"]
+        window_start = c - self.CFG["dataset_window"] - i_window
+        window_n = self.get_window_n()
+
+        final_x = array_batch[:, c - i_window : c]
+        final_norm = np.sqrt(np.einsum("ti,ti->t", final_x, final_x))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarity = dot / (
+                np.sqrt(np.maximum(norm2, 0.0)) * final_norm[:, np.newaxis]
+            )
+        padded = first_idx > window_start
+        if padded.any():
+            window_starts = window_start + np.arange(window_n)
+            similarity[padded] = np.where(
+                window_starts < first_idx[padded, np.newaxis],
+                np.nan,
+                similarity[padded],
+            )
+
+        y_start = window_start + i_window
+        actual_y = (
+            prefix_sum[:, y_start + o_window : y_start + o_window + window_n]
+            - prefix_sum[:, y_start : y_start + window_n]
+        )
+        pred_y = get_pred_y(similarity, actual_y, self.CFG["n"])
+        return pred_y
+
+    # 2. Realized sum(price_diff[c : c + output_window])
+    def get_actual_y(self, prefix_sum, c):
+        return prefix_sum[:, c + self.CFG["output_window"]] - prefix_sum[:, c]
+
+    # 3. Tickers whose realized window is output_window consecutive days of the shared date axis
+    def get_aligned(self, date_pos_batch, c):
+        o_window = self.CFG["output_window"]
+        cutoff_pos = date_pos_batch[:, c]
+        return (cutoff_pos >= 0) & (
+            date_pos_batch[:, c + o_window - 1] - cutoff_pos == o_window - 1
+        )
+
+    # Main
+    # 1. Cutoffs, c is the first value that is not visible
+    def get_cutoffs(self, width):
+        CFG = self.CFG
+        last_c = width - CFG["output_window"]
+        first_c = CFG["dataset_window"] + CFG["input_window"]
+        if CFG["eval_n"] is not None:
+            first_c = max(first_c, last_c - CFG["eval_n"] + 1)
+        return range(first_c, last_c + 1)
+
+    # 2. Records of every ticker and cutoff (ticker_code, days_back, cutoff_idx, date, pred_y, actual_y)
+    # days_back counts the first unseen day back from the last day of the shared date axis (the same calendar day for
+    # every ticker), cutoff_idx is the index of the first unseen value in the ticker's own array and date is the last
+    # visible day, a ticker is recorded only if its realized window has no missing day
+    def __call__(self):
+        (
+            ticker_codes,
+            array_batch,
+            first_idx,
+            prefix_sum,
+            date_pos_batch,
+            date_n,
+        ) = self.get_padded_batch()
+        cutoffs = self.get_cutoffs(array_batch.shape[1])
+
+        records = list()
+        dot, norm2 = None, None
+        for step, c in enumerate(cutoffs):
+            if step % self.CFG["refresh_n"] == 0:
+                dot, norm2 = self.init_state(array_batch, c)
+            else:
+                dot, norm2 = self.update_state(array_batch, c - 1, dot, norm2)
+
+            pred_y = self.get_pred_y(array_batch, first_idx, prefix_sum, c, dot, norm2)
+            actual_y = self.get_actual_y(prefix_sum, c)
+            mask = ~np.isnan(pred_y) & self.get_aligned(date_pos_batch, c)
+            records.append(
+                (
+                    np.flatnonzero(mask),
+                    date_n - date_pos_batch[mask, c],
+                    c - first_idx[mask],
+                    pred_y[mask],
+                    actual_y[mask],
+                )
+            )
+
+        ticker_idx, days_back, cutoff_idx, pred_y, actual_y = (
+            np.concatenate(values) for values in zip(*records)
+        )
+        records_df = pd.DataFrame(
+            {
+                "ticker_code": np.array(ticker_codes, dtype=object)[ticker_idx],
+                "days_back": days_back,
+                "cutoff_idx": cutoff_idx,
+                "pred_y": pred_y,
+                "actual_y": actual_y,
+            }
+        )
+        records_df.insert(
+            3,
+            "date",
+            [
+                self.dates_dict[ticker_code][idx - 1]
+                for ticker_code, idx in zip(
+                    records_df["ticker_code"], records_df["cutoff_idx"]
+                )
+            ],
+        )
+        return records_df
+
+
+# Summary
+# 1. hit rate and mean cross-sectional rank correlation per cutoff (days_back, the same first unseen day for every ticker)
+def get_summary(records_df, by="days_back"):
+    hits = np.sign(records_df["pred_y"]) == np.sign(records_df["actual_y"])
+    rank_correlations = records_df.groupby(by).apply(
+        lambda df: get_rank_correlation(
+            df["pred_y"].to_numpy(), df["actual_y"].to_numpy()
+        )
+    )
+    return {
+        "hit_rate": float(hits.mean()),
+        "rank_corr": float(rank_correlations.mean()),
+        "rank_corr_std": float(rank_correlations.std()),
+        "obs_n": len(records_df),
+    }